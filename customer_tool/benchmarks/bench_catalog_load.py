@@ -0,0 +1,73 @@
+import os
+import sys
+import csv
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from utils.catalog_snapshot import compile_snapshot
+
+TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each run is a fresh interpreter, so the timing is a real cold load
+LOAD_CODE = """
+import sys, time
+sys.path.insert(0, {tool_dir!r})
+from utils.catalog import VehicleCatalog
+from utils.catalog_snapshot import read_catalog
+started = time.perf_counter()
+catalog = {call}(sys.argv[1])
+catalog.freeze()
+print(time.perf_counter() - started)
+"""
+
+def write_catalog(path, models, seed=0):
+    """Write a random car dataset with roughly 20 models per brand."""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['brand', 'model', 'year_start', 'year_end'])
+        for i in range(models):
+            brand = f"Brand{i // 20}"
+            model = ''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))).title() + str(i)
+            start = rng.randint(1990, 2020)
+            writer.writerow([brand, model, start, rng.randint(start, 2026)])
+
+def cold_load(call, csv_path, repeat):
+    code = LOAD_CODE.format(tool_dir=TOOL_DIR, call=call)
+    timings = [float(subprocess.run([sys.executable, '-c', code, csv_path], capture_output=True,
+                                    text=True, check=True).stdout) for _ in range(repeat)]
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold catalog load: CSV versus compiled snapshot')
+    parser.add_argument('--sizes', default='1000,10000,100000', help='Comma-separated catalog sizes (models)')
+    parser.add_argument('--repeat', type=int, default=5, help='Cold loads per measurement (median is reported)')
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print(f"{'models':>8} {'csv_ms':>10} {'snapshot_ms':>12} {'speedup':>8}")
+        for size in (int(s) for s in args.sizes.split(',')):
+            csv_path = os.path.join(temp_dir, f'car_dataset_{size}.csv')
+            write_catalog(csv_path, size)
+            compile_snapshot(csv_path)
+            from_csv = cold_load('VehicleCatalog.from_csv', csv_path, args.repeat)
+            from_snapshot = cold_load('read_catalog', csv_path, args.repeat)
+            print(f"{size:>8} {from_csv:>10.1f} {from_snapshot:>12.1f} {from_csv / from_snapshot:>7.1f}x")
+    finally:
+        shutil.rmtree(temp_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import random
+import argparse
+import timeit
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from utils.fuzzy_matcher import levenshtein_distance, bounded_levenshtein, max_edit_distance
+from config.settings import FUZZY_MATCH_THRESHOLD
+
+def make_pairs(count, min_len, max_len, seed=0):
+    """Build random lowercase string pairs; half are near-duplicates."""
+    rng = random.Random(seed)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz0123456789'
+    pairs = []
+    for i in range(count):
+        s1 = ''.join(rng.choice(alphabet) for _ in range(rng.randint(min_len, max_len)))
+        if i % 2:
+            s2 = list(s1)
+            s2[rng.randrange(len(s2))] = rng.choice(alphabet)
+            s2 = ''.join(s2)
+        else:
+            s2 = ''.join(rng.choice(alphabet) for _ in range(rng.randint(min_len, max_len)))
+        pairs.append((s1, s2))
+    return pairs
+
+def run(pairs, repeat):
+    """Time each kernel over the same pairs; returns microseconds per pair."""
+    reference = levenshtein_distance.__wrapped__  # bypass the lru_cache
+    limits = [max_edit_distance(max(len(a), len(b)), FUZZY_MATCH_THRESHOLD) for a, b in pairs]
+    
+    kernels = {
+        'reference_dp': lambda: [reference(a, b) for a, b in pairs],
+        'bit_parallel': lambda: [bounded_levenshtein(a, b) for a, b in pairs],
+        'bit_parallel_cutoff': lambda: [bounded_levenshtein(a, b, k) for (a, b), k in zip(pairs, limits)],
+    }
+    
+    timings = {}
+    for name, kernel in kernels.items():
+        best = min(timeit.repeat(kernel, number=1, repeat=repeat))
+        timings[name] = best / len(pairs) * 1e6
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description='Levenshtein kernel micro-benchmark')
+    parser.add_argument('--pairs', type=int, default=2000, help='String pairs per size class')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+    
+    print(f"{'lengths':>10} {'reference_dp':>14} {'bit_parallel':>14} {'cutoff':>14}  (us/pair)")
+    for min_len, max_len in ((3, 8), (8, 20), (20, 64), (65, 120)):
+        timings = run(make_pairs(args.pairs, min_len, max_len), args.repeat)
+        print(f"{f'{min_len}-{max_len}':>10} {timings['reference_dp']:>14.2f} "
+              f"{timings['bit_parallel']:>14.2f} {timings['bit_parallel_cutoff']:>14.2f}")
+
+if __name__ == "__main__":
+    main()
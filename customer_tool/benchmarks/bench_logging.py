@@ -0,0 +1,77 @@
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from benchmarks.generate_data import generate_dataset
+
+TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Logging is configured once per process, so each mode runs in a fresh interpreter
+RUN_CODE = """
+import sys, time
+sys.path.insert(0, {tool_dir!r})
+from utils.logging_setup import configure_logging
+configure_logging(level={level!r}, log_file=sys.argv[3], async_writer={async_writer}, sample_every={sample_every})
+from core.validator import load_catalog
+from processing.batch_processor import validate_batch, iter_entries_from_csv
+load_catalog(sys.argv[1])
+entries = list(iter_entries_from_csv(sys.argv[2]))
+started = time.perf_counter()
+validate_batch(entries)
+print(len(entries) / (time.perf_counter() - started))
+"""
+
+MODES = {
+    'sync': dict(level='INFO', async_writer=False, sample_every=1),
+    'async': dict(level='INFO', async_writer=True, sample_every=1),
+    'sync_sampled': dict(level='INFO', async_writer=False, sample_every=100),
+    'async_sampled': dict(level='INFO', async_writer=True, sample_every=100),
+    'warnings_only': dict(level='WARNING', async_writer=False, sample_every=1),
+}
+
+def run_mode(mode, car_data_path, validation_path, log_file, repeat):
+    code = RUN_CODE.format(tool_dir=TOOL_DIR, **MODES[mode])
+    rates = []
+    for _ in range(repeat):
+        # Console output goes to /dev/null, so terminal rendering is not counted
+        output = subprocess.run([sys.executable, '-c', code, car_data_path, validation_path, log_file],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True).stdout
+        rates.append(float(output))
+        if os.path.exists(log_file):
+            os.remove(log_file)
+    return statistics.median(rates)
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch validation throughput under each logging mode')
+    parser.add_argument('--rows', type=int, default=50000, help='Validation rows to generate')
+    parser.add_argument('--brands', type=int, default=200, help='Brands to generate')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode (median is reported)')
+    parser.add_argument('--modes', default=','.join(MODES), help='Comma-separated modes to run')
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        car_data_path, validation_path = generate_dataset(temp_dir, args.brands, 10, args.rows)
+        log_file = os.path.join(temp_dir, 'bench.log')
+        print(f"{'mode':<16} {'rows/s':>10} {'vs sync':>8}")
+        baseline = None
+        for mode in args.modes.split(','):
+            rate = run_mode(mode, car_data_path, validation_path, log_file, args.repeat)
+            baseline = baseline or rate
+            print(f"{mode:<16} {rate:>10.0f} {rate / baseline:>7.2f}x")
+    finally:
+        shutil.rmtree(temp_dir)
+
+if __name__ == "__main__":
+    main()
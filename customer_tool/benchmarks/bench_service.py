@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from core.validator import warm_up, get_catalog, validation_cache
+from service.validation_service import ValidationService, create_executor
+
+def make_payloads(count, hot=0.0, seed=0):
+    """
+    Build validateCar payloads from the catalog; about half carry a typo.
+
+    A `hot` fraction of payloads repeat a handful of popular queries, as when
+    many sessions type the same brand at the same time.
+    """
+    rng = random.Random(seed)
+    catalog = get_catalog()
+    vehicles = [(brand, model, catalog.year_range(brand, model))
+                for brand in catalog.brands() for model in catalog.models(brand)]
+    popular = []
+    payloads = []
+    for _ in range(count):
+        if popular and rng.random() < hot:
+            payloads.append(dict(rng.choice(popular)))
+            continue
+        brand, model, (start, end) = rng.choice(vehicles)
+        if rng.random() < 0.5 and len(model) > 3:
+            i = rng.randrange(len(model))
+            model = model[:i] + rng.choice('aeiou') + model[i + 1:]
+        payloads.append({'brand': brand, 'model': model, 'year': rng.randint(start - 2, end + 2)})
+        if len(popular) < 8:
+            popular.append(payloads[-1])
+    rng.shuffle(payloads)
+    return payloads
+
+async def request(reader, writer, body):
+    """Send one keep-alive POST /api/validate-car and read the response."""
+    data = json.dumps(body).encode('utf-8')
+    writer.write(b"POST /api/validate-car HTTP/1.1\r\nHost: bench\r\n"
+                 b"Content-Type: application/json\r\n"
+                 + f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = 0
+    for line in head.decode('latin-1').split('\r\n'):
+        if line.lower().startswith('content-length:'):
+            length = int(line.split(':', 1)[1])
+    return json.loads(await reader.readexactly(length))
+
+async def client(port, payloads, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for body in payloads:
+        started = time.perf_counter()
+        await request(reader, writer, body)
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+
+async def run(service, clients, requests_per_client, payloads):
+    ready = asyncio.get_running_loop().create_future()
+    server = asyncio.create_task(service.serve('127.0.0.1', 0, ready=ready))
+    port = await ready
+
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, payloads[i * requests_per_client:(i + 1) * requests_per_client], latencies)
+        for i in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    server.cancel()
+    return latencies, elapsed
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description='Local load test for the validation service')
+    parser.add_argument('--clients', type=int, default=32, help='Concurrent keep-alive connections')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per client')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread',
+                        help='Executor for brand/model matching')
+    parser.add_argument('--workers', type=int, default=4, help='Executor workers')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the validation result cache')
+    parser.add_argument('--windows', default='0,1,2,5',
+                        help='Comma-separated batching windows in ms to compare; 0 means no batching')
+    parser.add_argument('--max-batch', type=int, default=64, help='Distinct queries that flush a batch early')
+    parser.add_argument('--hot', type=float, default=0.5,
+                        help='Fraction of requests repeating a few popular queries')
+    args = parser.parse_args()
+
+    warm_up()
+    if args.no_cache:
+        validation_cache.maxsize = 0
+    payloads = make_payloads(args.clients * args.requests, hot=args.hot)
+
+    print(f"{len(payloads)} requests over {args.clients} connections ({args.executor} x{args.workers}), "
+          f"hot={args.hot}, cache={'off' if args.no_cache else 'on'}")
+    print(f"{'window_ms':>9} {'req/s':>8} {'p50_ms':>8} {'p99_ms':>8} {'mean_ms':>8} {'batches':>8} {'avg_batch':>9} {'deduped':>8}")
+    for window in (float(w) for w in args.windows.split(',')):
+        validation_cache.clear()
+        executor = create_executor(args.executor, args.workers)
+        service = ValidationService(registry={}, executor=executor,
+                                    batch_window_ms=window, batch_max_size=args.max_batch)
+        try:
+            latencies, elapsed = asyncio.run(run(service, args.clients, args.requests, payloads))
+        finally:
+            executor.shutdown()
+
+        stats = service.batcher.stats() if service.batcher else {'batches': 0, 'mean_batch_size': 0.0, 'deduplicated': 0}
+        print(f"{window:>9g} {len(latencies) / elapsed:>8.0f} {percentile(latencies, 0.50) * 1000:>8.2f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.2f} {statistics.mean(latencies) * 1000:>8.2f} "
+              f"{stats['batches']:>8} {stats['mean_batch_size']:>9.1f} {stats['deduplicated']:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import re
+import argparse
+import subprocess
+import statistics
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+CUSTOMER_TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules main.py imports for each --mode, before any work starts
+MODE_MODULES = {
+    'validate': 'core.validator',
+    'batch': 'processing.batch_processor',
+    'correct': 'processing.data_corrector',
+    'workflow': 'workflows.full_workflow',
+    'test': 'tests.test_validator',
+}
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def measure_import(module, warm_up=False):
+    """
+    Import the entry module of a mode in a fresh interpreter under
+    -X importtime.
+    
+    Returns:
+        tuple: (total import microseconds, {module: cumulative microseconds})
+    """
+    code = (
+        "import sys, os; sys.path.insert(0, os.getcwd()); "
+        "import main; "
+        f"import {module}"
+    )
+    if warm_up:
+        code += "; from core.validator import warm_up; warm_up()"
+    
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=CUSTOMER_TOOL_DIR, capture_output=True, text=True, check=True
+    )
+    
+    total = 0
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            total += int(self_us)
+            cumulative[name] = int(cumulative_us)
+    return total, cumulative
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup (import time) benchmark for customer_tool/main.py modes')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per mode (median is reported)')
+    parser.add_argument('--warm-up', action='store_true', help='Also load the car catalog after importing')
+    args = parser.parse_args()
+    
+    print(f"{'mode':<10} {'module':<28} {'total import ms':>16} {'entry module ms':>16}")
+    for mode, module in MODE_MODULES.items():
+        totals = []
+        entry = []
+        for _ in range(args.repeat):
+            total, cumulative = measure_import(module, warm_up=args.warm_up)
+            totals.append(total)
+            entry.append(cumulative.get(module, 0))
+        print(f"{mode:<10} {module:<28} {statistics.median(totals) / 1000:>16.2f} {statistics.median(entry) / 1000:>16.2f}")
+
+if __name__ == "__main__":
+    main()
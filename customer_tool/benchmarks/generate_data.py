@@ -0,0 +1,231 @@
+import os
+import sys
+import csv
+import random
+import string
+import argparse
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+CAR_FIELDS = ['brand', 'model', 'year_start', 'year_end']
+VALIDATION_FIELDS = ['user_input_plate', 'user_input_brand', 'user_input_model', 'user_input_year',
+                     'expected_brand', 'expected_model', 'expected_year', 'error_type']
+
+# Independent per-row probabilities of each kind of bad input. A row can
+# carry several; rows with none are "correct".
+DEFAULT_ERROR_RATES = {
+    'typo_brand': 0.12,
+    'reversed_brand': 0.02,   # e.g. "notorP"; labelled typo_brand like the sample data
+    'typo_model': 0.12,
+    'invalid_year': 0.08,
+    'plate_format_error': 0.05,
+}
+
+SYLLABLES = ['ka', 'to', 'yo', 'ta', 'ho', 'n', 'da', 'pe', 'ro', 'du', 'a', 'pro', 'ton', 'ni',
+             'ssan', 'ma', 'z', 'hy', 'un', 'dai', 'ki', 'su', 'bi', 'shi', 'vo', 'lvo', 're',
+             'nau', 'lt', 'che', 'ry', 'ge', 'ely', 'tes', 'la', 'vi', 'os', 'sa', 'ga', 'mi']
+
+# Letters next to each other on a QWERTY keyboard, for substitution typos
+KEYBOARD_NEIGHBOURS = {
+    'q': 'wa', 'w': 'qes', 'e': 'wrd', 'r': 'etf', 't': 'ryg', 'y': 'tuh', 'u': 'yij', 'i': 'uok',
+    'o': 'ipl', 'p': 'ol', 'a': 'qsz', 's': 'awdz', 'd': 'sefx', 'f': 'drgc', 'g': 'fthv',
+    'h': 'gyjb', 'j': 'hukn', 'k': 'jilm', 'l': 'kop', 'z': 'asx', 'x': 'zsdc', 'c': 'xdfv',
+    'v': 'cfgb', 'b': 'vghn', 'n': 'bhjm', 'm': 'njk',
+}
+
+def _unique_name(rng, seen, build):
+    while True:
+        name = build(rng)
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            return name
+
+def _brand_name(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+def _model_name(rng):
+    style = rng.random()
+    if style < 0.5:
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))).capitalize()
+    if style < 0.8:
+        # Alphanumeric models like X70 or CX5
+        return ''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 2))) + str(rng.randint(1, 99))
+    # Hyphenated models like CR-V
+    return f"{''.join(rng.choice(string.ascii_uppercase) for _ in range(2))}-{rng.choice(string.ascii_uppercase)}"
+
+def generate_catalog(brands, models_per_brand, seed=0):
+    """
+    Generate a car dataset.
+
+    Args:
+        brands (int): Number of brands
+        models_per_brand (int): Average models per brand (actual counts vary by +/-50%)
+        seed (int): Random seed; the same arguments always give the same rows
+
+    Returns:
+        list: Rows shaped like load_car_data output
+    """
+    rng = random.Random(seed)
+    brand_names = set()
+    rows = []
+    for _ in range(brands):
+        brand = _unique_name(rng, brand_names, _brand_name)
+        model_names = set()
+        low = max(1, models_per_brand // 2)
+        for _ in range(rng.randint(low, max(low, models_per_brand * 3 // 2))):
+            model = _unique_name(rng, model_names, _model_name)
+            year_start = rng.randint(1985, 2022)
+            year_end = rng.randint(year_start, 2026)
+            rows.append({'brand': brand, 'model': model, 'year_start': year_start, 'year_end': year_end})
+    return rows
+
+def make_typo(rng, text):
+    """Apply one realistic keyboard typo: drop, double, swap or mistype a character."""
+    if len(text) < 2:
+        return text + rng.choice(string.ascii_lowercase)
+    i = rng.randrange(len(text))
+    kind = rng.random()
+    if kind < 0.3:
+        return text[:i] + text[i + 1:]
+    if kind < 0.5:
+        return text[:i] + text[i] + text[i:]
+    if kind < 0.7 and i < len(text) - 1:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    neighbours = KEYBOARD_NEIGHBOURS.get(text[i].lower())
+    if not neighbours:
+        return text[:i] + text[i + 1:]
+    replacement = rng.choice(neighbours)
+    if text[i].isupper():
+        replacement = replacement.upper()
+    return text[:i] + replacement + text[i + 1:]
+
+def make_plate(rng):
+    letters = ''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 3)))
+    digits = str(rng.randint(1, 9999))
+    suffix = rng.choice(string.ascii_uppercase) if rng.random() < 0.1 else ''
+    separator = ' ' if rng.random() < 0.8 else ''
+    return f"{letters}{separator}{digits}{suffix}"
+
+def make_bad_plate(rng):
+    kind = rng.randrange(5)
+    if kind == 0:
+        return ''.join(rng.choice(string.ascii_uppercase) for _ in range(4)) + f" {rng.randint(1, 999)}"
+    if kind == 1:
+        return f"{rng.randint(1, 999)} {''.join(rng.choice(string.ascii_uppercase) for _ in range(3))}"
+    if kind == 2:
+        return f"{''.join(rng.choice(string.ascii_uppercase) for _ in range(3))} {rng.randint(10000, 99999)}"
+    if kind == 3:
+        return f"{''.join(rng.choice(string.ascii_uppercase) for _ in range(3))}-{rng.randint(1, 9999)}"
+    return ''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(5, 8)))
+
+def make_bad_year(rng, year_start, year_end):
+    kind = rng.random()
+    if kind < 0.4:
+        return year_start - rng.randint(1, 15)
+    if kind < 0.8:
+        return year_end + rng.randint(1, 10)
+    return rng.choice([1800, 1900, 2099, 3000])
+
+def iter_validation_rows(catalog_rows, count, seed=0, error_rates=None):
+    """
+    Yield validation dataset rows drawn from a catalog.
+
+    Args:
+        catalog_rows (list): Car dataset rows
+        count (int): Number of rows to yield
+        seed (int): Random seed; the same arguments always give the same rows
+        error_rates (dict): Per-row probability of each error kind, see DEFAULT_ERROR_RATES
+
+    Yields:
+        dict: Rows with VALIDATION_FIELDS keys
+    """
+    rates = dict(DEFAULT_ERROR_RATES, **(error_rates or {}))
+    rng = random.Random(seed)
+    for _ in range(count):
+        car = rng.choice(catalog_rows)
+        brand, model = car['brand'], car['model']
+        year = rng.randint(car['year_start'], car['year_end'])
+        plate = make_plate(rng)
+        errors = []
+
+        input_brand = brand
+        if rng.random() < rates['reversed_brand']:
+            input_brand = brand[::-1]
+        elif rng.random() < rates['typo_brand']:
+            input_brand = make_typo(rng, brand)
+        if input_brand != brand:
+            errors.append('typo_brand')
+
+        input_model = model
+        if rng.random() < rates['typo_model']:
+            input_model = make_typo(rng, model)
+            if input_model != model:
+                errors.append('typo_model')
+
+        input_year = year
+        if rng.random() < rates['invalid_year']:
+            input_year = make_bad_year(rng, car['year_start'], car['year_end'])
+            errors.append('invalid_year')
+
+        if rng.random() < rates['plate_format_error']:
+            plate = make_bad_plate(rng)
+            errors.append('plate_format_error')
+
+        yield {
+            'user_input_plate': plate,
+            'user_input_brand': input_brand,
+            'user_input_model': input_model,
+            'user_input_year': str(input_year),
+            'expected_brand': brand,
+            'expected_model': model,
+            'expected_year': str(year),
+            'error_type': ', '.join(errors) if errors else 'correct',
+        }
+
+def write_csv(rows, path, fieldnames):
+    """Write rows to CSV one at a time; returns the row count."""
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+def generate_dataset(out_dir, brands, models_per_brand, rows, seed=0):
+    """
+    Write car_dataset.csv and validation_dataset.csv into out_dir.
+
+    Returns:
+        tuple: (car dataset path, validation dataset path)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    catalog_rows = generate_catalog(brands, models_per_brand, seed)
+    car_data_path = os.path.join(out_dir, 'car_dataset.csv')
+    validation_path = os.path.join(out_dir, 'validation_dataset.csv')
+    write_csv(catalog_rows, car_data_path, CAR_FIELDS)
+    write_csv(iter_validation_rows(catalog_rows, rows, seed + 1), validation_path, VALIDATION_FIELDS)
+    return car_data_path, validation_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic car catalog and validation dataset')
+    parser.add_argument('--out-dir', required=True, help='Directory to write the CSV files to')
+    parser.add_argument('--brands', type=int, default=1000, help='Number of brands')
+    parser.add_argument('--models-per-brand', type=int, default=10, help='Average models per brand')
+    parser.add_argument('--rows', type=int, default=1000000, help='Validation rows')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    car_data_path, validation_path = generate_dataset(args.out_dir, args.brands, args.models_per_brand,
+                                                      args.rows, args.seed)
+    print(f"Car catalog:        {car_data_path}")
+    print(f"Validation dataset: {validation_path}")
+
+if __name__ == "__main__":
+    main()
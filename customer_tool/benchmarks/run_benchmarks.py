@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from benchmarks.generate_data import generate_dataset
+from utils.fuzzy_matcher import levenshtein_distance, bounded_levenshtein, max_edit_distance, fuzzy_match, FuzzyIndex
+from utils.data_loader import iter_csv_rows
+from core.validator import validate_vehicle, load_catalog, validation_cache
+from processing.batch_processor import validate_batch, iter_entries_from_csv
+from processing.data_corrector import correct_validation_data
+from processing.dataset_updater import analyze_validation_results
+from config.settings import FUZZY_MATCH_THRESHOLD
+
+# Calls of the single-item benchmarks are capped so a run over millions of
+# rows finishes in reasonable time; the batch benchmarks use every row.
+SAMPLE_SIZE = 20000
+FUZZY_SAMPLE_SIZE = 2000
+
+def time_it(func, repeat, setup=None):
+    """Run func `repeat` times (after setup, untimed) and return the timings in seconds."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def summarize(ops, timings):
+    best = min(timings)
+    return {
+        'ops': ops,
+        'best_s': round(best, 6),
+        'median_s': round(statistics.median(timings), 6),
+        'ops_per_s': round(ops / best, 1) if best else None,
+        'us_per_op': round(best / ops * 1e6, 3) if ops else None,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_suite(car_data_path, validation_path, workers):
+    """
+    Return the benchmarks as name -> (ops, func, setup).
+
+    Inputs are loaded here, outside the timed functions.
+    """
+    catalog = load_catalog(car_data_path)
+    rows = list(iter_csv_rows(validation_path))
+    entries = list(iter_entries_from_csv(validation_path))
+    sample = rows[:SAMPLE_SIZE]
+    reference = levenshtein_distance.__wrapped__  # bypass the lru_cache
+
+    pairs = [(row['user_input_model'].lower(), row['expected_model'].lower()) for row in sample]
+    limits = [max_edit_distance(max(len(a), len(b)), FUZZY_MATCH_THRESHOLD) for a, b in pairs]
+    brand_queries = [row['user_input_brand'] for row in rows[:FUZZY_SAMPLE_SIZE]]
+    brand_list = catalog.brands()
+    brand_index = FuzzyIndex(brand_list)
+    sample_entries = entries[:SAMPLE_SIZE]
+
+    # validate_batch output feeds the correction and analysis benchmarks
+    results = validate_batch(entries)
+
+    return {
+        'levenshtein_distance': (len(pairs), lambda: [reference(a, b) for a, b in pairs], None),
+        'bounded_levenshtein': (len(pairs), lambda: [bounded_levenshtein(a, b, k) for (a, b), k in zip(pairs, limits)], None),
+        'fuzzy_match_list': (len(brand_queries), lambda: [fuzzy_match(q, brand_list) for q in brand_queries], None),
+        'fuzzy_match_index': (len(brand_queries), lambda: [fuzzy_match(q, brand_index) for q in brand_queries], None),
+        'validate_vehicle_cold': (len(sample_entries), lambda: [
+            validate_vehicle(e['plate'], e['brand'], e['model'], int(e['year']), catalog) for e in sample_entries
+        ], validation_cache.clear),
+        'validate_vehicle_warm': (len(sample_entries), lambda: [
+            validate_vehicle(e['plate'], e['brand'], e['model'], int(e['year']), catalog) for e in sample_entries
+        ], None),
+        'validate_batch': (len(entries), lambda: validate_batch(entries), validation_cache.clear),
+        'validate_batch_parallel': (len(entries), lambda: validate_batch(
+            entries, workers=workers, car_data_path=car_data_path
+        ), validation_cache.clear),
+        'correct_validation_data': (len(rows), lambda: correct_validation_data(rows, (r['result'] for r in results)), None),
+        'analyze_validation_results': (len(results), lambda: analyze_validation_results(results, catalog), None),
+    }
+
+def compare(previous_path, current):
+    """Print per-benchmark time ratios against an earlier results file."""
+    with open(previous_path, 'r', encoding='utf-8') as file:
+        previous = json.load(file)
+
+    print(f"\nCompared with {previous['meta'].get('commit') or previous_path}:")
+    print(f"{'benchmark':<28} {'before_us':>12} {'after_us':>12} {'change':>8}")
+    for name, result in current['results'].items():
+        before = previous['results'].get(name)
+        if not before or not before.get('us_per_op') or not result.get('us_per_op'):
+            continue
+        ratio = result['us_per_op'] / before['us_per_op']
+        print(f"{name:<28} {before['us_per_op']:>12.3f} {result['us_per_op']:>12.3f} {ratio:>7.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the validation pipeline on generated data')
+    parser.add_argument('--data-dir', help='Reuse car_dataset.csv/validation_dataset.csv from this directory')
+    parser.add_argument('--brands', type=int, default=1000, help='Brands to generate')
+    parser.add_argument('--models-per-brand', type=int, default=10, help='Average models per brand to generate')
+    parser.add_argument('--rows', type=int, default=100000, help='Validation rows to generate')
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (best is reported)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                        help='Worker processes for validate_batch_parallel')
+    parser.add_argument('--only', help='Comma-separated benchmark names to run')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Earlier JSON results to compare against')
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.data_dir:
+        car_data_path = os.path.join(args.data_dir, 'car_dataset.csv')
+        validation_path = os.path.join(args.data_dir, 'validation_dataset.csv')
+    else:
+        temp_dir = tempfile.mkdtemp()
+        car_data_path, validation_path = generate_dataset(temp_dir, args.brands, args.models_per_brand,
+                                                          args.rows, args.seed)
+
+    try:
+        suite = build_suite(car_data_path, validation_path, args.workers)
+        selected = args.only.split(',') if args.only else list(suite)
+
+        report = {
+            'meta': {
+                'commit': git_commit(),
+                'timestamp': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'params': {
+                    'data_dir': args.data_dir,
+                    'brands': args.brands,
+                    'models_per_brand': args.models_per_brand,
+                    'rows': args.rows,
+                    'seed': args.seed,
+                    'repeat': args.repeat,
+                    'workers': args.workers,
+                },
+            },
+            'results': {},
+        }
+
+        print(f"{'benchmark':<28} {'ops':>9} {'best_s':>10} {'us/op':>10} {'ops/s':>12}")
+        for name in selected:
+            ops, func, setup = suite[name]
+            result = report['results'][name] = summarize(ops, time_it(func, args.repeat, setup))
+            print(f"{name:<28} {ops:>9} {result['best_s']:>10.4f} {result['us_per_op']:>10.3f} {result['ops_per_s']:>12.0f}")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(args.compare, report)
+
+if __name__ == "__main__":
+    main()
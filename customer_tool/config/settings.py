@@ -10,11 +10,46 @@ DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
 # File paths
 CAR_DATA_PATH = os.path.join(DATA_DIR, 'car_dataset.csv')
 VALIDATION_DATA_PATH = os.path.join(DATA_DIR, 'validation_dataset.csv')
+# Optional registered vehicles for plate lookups (same shape as smart-onboarding mockData VEHICLES)
+VEHICLE_REGISTRY_PATH = os.path.join(DATA_DIR, 'vehicle_registry.json')
+
+# Long-running processes poll the car dataset this often (seconds) and reload it on change
+CATALOG_POLL_INTERVAL = 2.0
+# Catalog updates are appended to a change journal next to the dataset; once it
+# holds this many changes it is folded into a rewritten CSV
+CATALOG_JOURNAL_COMPACT_THRESHOLD = 500
 
 # Validation thresholds
 FUZZY_MATCH_THRESHOLD = 80
 MAX_LEVENSHTEIN_DISTANCE = 3
 
+# Validation result cache (brand/model matches); size 0 disables it
+VALIDATION_CACHE_SIZE = 10000
+VALIDATION_CACHE_TTL = 3600  # seconds, None for no expiry
+
+# Batch processing
+BATCH_WORKERS = 1
+BATCH_CHUNK_SIZE = 256
+
+# Validation HTTP service
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 5000
+SERVICE_EXECUTOR = 'thread'  # 'thread' or 'process'
+SERVICE_EXECUTOR_WORKERS = 4
+SERVICE_KEEP_ALIVE_TIMEOUT = 15  # seconds an idle connection is kept open
+SERVICE_MAX_BODY_BYTES = 64 * 1024
+# validateCar requests are coalesced for up to this many milliseconds, or until
+# SERVICE_BATCH_MAX_SIZE distinct queries are waiting; 0 disables batching
+SERVICE_BATCH_WINDOW_MS = 2
+SERVICE_BATCH_MAX_SIZE = 64
+
 # Logging settings
 LOG_LEVEL = 'INFO'
-LOG_FILE = os.path.join(PROJECT_ROOT, 'validation.log')
\ No newline at end of file
+LOG_FILE = os.path.join(PROJECT_ROOT, 'validation.log')
+# With LOG_ASYNC, records are handed to a background thread that does the
+# file/console writes. Per-record loggers (see LOG_SAMPLED_LOGGERS) keep one
+# line in LOG_SAMPLE_EVERY and log a summary every LOG_SUMMARY_INTERVAL seconds.
+LOG_ASYNC = False
+LOG_SAMPLE_EVERY = 1  # 1 keeps every line
+LOG_SUMMARY_INTERVAL = 10.0
+LOG_SAMPLED_LOGGERS = ('core.validator.records',)
@@ -2,6 +2,8 @@ import os
 import sys
 import csv
 import logging
+import threading
+from time import perf_counter
 
 # Add the parent directory to sys.path when run directly
 if __name__ == "__main__":
@@ -11,79 +13,234 @@ if __name__ == "__main__":
         sys.path.insert(0, parent_dir)
 
 from utils.fuzzy_matcher import fuzzy_match
-from utils.data_loader import load_car_data, load_csv_data
+from utils.data_loader import load_csv_data
+from utils.catalog import VehicleCatalog
+from utils.catalog_provider import get_provider
+from utils.result_cache import ResultCache
+from utils.instrumentation import metrics
+from utils.error_codes import ERROR_CODES, TYPO_BRAND, INVALID_BRAND, TYPO_MODEL, INVALID_MODEL, INVALID_YEAR
 from core.plate_validator import validate_plate_format
-from config.settings import CAR_DATA_PATH, LOG_LEVEL, LOG_FILE
-
-# Set up logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+from config.settings import CAR_DATA_PATH, VALIDATION_CACHE_SIZE, VALIDATION_CACHE_TTL
+
 logger = logging.getLogger(__name__)
+# Per-validation lines go to a child logger so they can be sampled on their own
+record_logger = logging.getLogger(__name__ + '.records')
+
+# The car catalog is loaded on first use (or by warm_up), not at import time.
+# The provider hands out frozen snapshots and, when watching, swaps in a new
+# one after the dataset file changes.
+_catalog_provider = None
+_catalog_lock = threading.Lock()
+
+# Brand/model match outcomes, keyed on normalized inputs. Plate checks are
+# cheap and input-specific, so they always run outside the cache.
+validation_cache = ResultCache(maxsize=VALIDATION_CACHE_SIZE, ttl=VALIDATION_CACHE_TTL)
 
-# Load car data
-try:
-    car_data = load_car_data(CAR_DATA_PATH)
-    logger.info(f"Car data loaded successfully: {len(car_data)} records")
-except Exception as e:
-    logger.error(f"Error loading car data: {e}")
-    car_data = []
+def load_catalog(car_data_path=CAR_DATA_PATH):
+    """(Re)build the module catalog used by validate_vehicle."""
+    global _catalog_provider
+    provider = get_provider(car_data_path)
+    provider.refresh(force=True)
+    _catalog_provider = provider
+    catalog = provider.current()
+    logger.info(f"Car data loaded successfully: {len(catalog)} records")
+    return catalog
 
-def validate_vehicle(plate: str, brand: str, model: str, year: int):
-    logger.info(f"Validating vehicle: plate={plate}, brand={brand}, model={model}, year={year}")
+def get_catalog():
+    """Return the current catalog snapshot, loading it on first use."""
+    provider = _catalog_provider
+    if provider is None:
+        with _catalog_lock:
+            if _catalog_provider is None:
+                load_catalog()
+            provider = _catalog_provider
+    return provider.current()
+
+def warm_up(car_data_path=CAR_DATA_PATH, watch=False):
+    """
+    Load the car catalog ahead of the first validation.
     
-    result = {
-        "plate": plate,
-        "input_brand": brand,
-        "input_model": model,
-        "input_year": year,
-        "suggested_brand": None,
-        "suggested_model": None,
-        "valid_year_range": None,
-        "errors": []
-    }
-    # --- Plate check ---
-    valid_plate, error = validate_plate_format(plate)
-    if not valid_plate:
-        result["errors"].append(error)
+    Long-running processes (services, batch workers) call this at startup so
+    the first request does not pay the load. A catalog that is already
+    loaded is kept. With watch=True the dataset file is polled in the
+    background and changes are picked up without a restart.
+    """
+    with _catalog_lock:
+        if _catalog_provider is None:
+            load_catalog(car_data_path)
+        provider = _catalog_provider
+    if watch:
+        provider.start()
+    return provider.current()
+
+def normalize_input(text):
+    """
+    Lowercase and collapse whitespace so equivalent inputs share a cache key.
+    lower() rather than casefold(), to match the catalog's lowercased keys.
+    """
+    return ' '.join(text.split()).lower() if text else ''
+
+def match_vehicle(brand: str, model: str, catalog: VehicleCatalog):
+    """
+    Resolve a brand/model pair against the catalog.
+    
+    Returns:
+        tuple: (matched_brand, matched_model, year_range); later items are
+        None when an earlier one could not be matched
+    """
+    timed = metrics.enabled
+    if timed:
+        mark = perf_counter()
+    # Exact, case-insensitive hits skip fuzzy matching
+    matched_brand = catalog.lookup_brand(brand)
+    if matched_brand is None:
+        matched_brand, score = fuzzy_match(brand, catalog.brand_index())
+    if timed:
+        mark = metrics.lap('vehicle.brand_match', mark)
+    if not matched_brand:
+        return None, None, None
+    
+    # Models are only matched within the matched brand
+    matched_model = catalog.lookup_model(matched_brand, model)
+    if matched_model is None:
+        matched_model, score = fuzzy_match(model, catalog.model_index(matched_brand))
+    if timed:
+        mark = metrics.lap('vehicle.model_match', mark)
+    if not matched_model:
+        return matched_brand, None, None
+    
+    year_range = catalog.year_range(matched_brand, matched_model)
+    if timed:
+        metrics.lap('vehicle.year_lookup', mark)
+    return matched_brand, matched_model, year_range
+
+def lookup_vehicle(brand: str, model: str, catalog: VehicleCatalog):
+    """match_vehicle on normalized inputs, memoized per catalog version."""
+    key = (normalize_input(brand), normalize_input(model))
+    validation_cache.check_generation((catalog, catalog.version))
+    match = validation_cache.get(key)
+    if match is None:
+        match = match_vehicle(key[0], key[1], catalog)
+        validation_cache.put(key, match)
+    return match
+
+def lookup_vehicles(keys, catalog: VehicleCatalog = None):
+    """
+    Batch form of lookup_vehicle over already-normalized (brand, model) keys.
+
+    The catalog generation is checked once for the whole batch and repeated
+    keys are matched once.
+
+    Returns:
+        dict: key -> (matched_brand, matched_model, year_range)
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    validation_cache.check_generation((catalog, catalog.version))
+    matches = {}
+    for key in keys:
+        if key in matches:
+            continue
+        match = validation_cache.get(key)
+        if match is None:
+            match = match_vehicle(key[0], key[1], catalog)
+            validation_cache.put(key, match)
+        matches[key] = match
+    return matches
+
+def apply_match(result: dict, match: tuple):
+    """
+    Fill suggestions and brand/model/year errors into a result from a match outcome.
+    Each error is added both to the errors list and as a bit of error_mask.
+    """
+    matched_brand, matched_model, year_range = match
     # --- Brand check ---
-    brands = list(set(car['brand'] for car in car_data))
-    matched_brand, score = fuzzy_match(brand, brands)
     if matched_brand:
         result["suggested_brand"] = matched_brand
-        if matched_brand != brand:
+        if matched_brand != result["input_brand"]:
             result["errors"].append("typo_brand")
+            result["error_mask"] |= TYPO_BRAND
     else:
         result["errors"].append("invalid_brand")
+        result["error_mask"] |= INVALID_BRAND
         return result  # stop early if brand not found
     # --- Model check (for matched brand only) ---
-    models = list(set(car['model'] for car in car_data if car['brand'] == matched_brand))
-    matched_model, score = fuzzy_match(model, models)
     if matched_model:
         result["suggested_model"] = matched_model
-        if matched_model != model:
+        if matched_model != result["input_model"]:
             result["errors"].append("typo_model")
+            result["error_mask"] |= TYPO_MODEL
     else:
         result["errors"].append("invalid_model")
+        result["error_mask"] |= INVALID_MODEL
         return result
     # --- Year check ---
-    for car in car_data:
-        if car['brand'] == matched_brand and car['model'] == matched_model:
-            start, end = car['year_start'], car['year_end']
-            result["valid_year_range"] = (start, end)
-            if year is None:
-                result["errors"].append("invalid_year")
-            elif not (start <= year <= end):
-                result["errors"].append("invalid_year")
-            break
-    logger.info(f"Validation result: {result['errors'] if result['errors'] else 'No errors'}")
+    start, end = year_range
+    year = result["input_year"]
+    result["valid_year_range"] = (start, end)
+    if year is None:
+        result["errors"].append("invalid_year")
+        result["error_mask"] |= INVALID_YEAR
+    elif not (start <= year <= end):
+        result["errors"].append("invalid_year")
+        result["error_mask"] |= INVALID_YEAR
     return result
 
+def new_result(plate, brand, model, year):
+    """Return an empty validation result for the given inputs."""
+    return {
+        "plate": plate,
+        "input_brand": brand,
+        "input_model": model,
+        "input_year": year,
+        "suggested_brand": None,
+        "suggested_model": None,
+        "valid_year_range": None,
+        "errors": [],
+        "error_mask": 0
+    }
+
+def validate_vehicle(plate: str, brand: str, model: str, year: int, catalog: VehicleCatalog = None):
+    if catalog is None:
+        catalog = get_catalog()
+    # Stage timings are only taken while instrumentation is enabled
+    timed = metrics.enabled
+    if timed:
+        started = mark = perf_counter()
+    record_logger.info("Validating vehicle: plate=%s, brand=%s, model=%s, year=%s", plate, brand, model, year)
+    if timed:
+        # Both log calls count towards one vehicle.logging sample
+        mark = perf_counter()
+        logging_time = mark - started
+    
+    result = new_result(plate, brand, model, year)
+    # --- Plate check ---
+    valid_plate, error = validate_plate_format(plate)
+    if not valid_plate:
+        result["errors"].append(error)
+        result["error_mask"] |= ERROR_CODES[error]
+    if timed:
+        mark = metrics.lap('vehicle.plate', mark)
+    # --- Brand/model/year checks (brand/model lookup is cached) ---
+    match = lookup_vehicle(brand, model, catalog)
+    if timed:
+        mark = metrics.lap('vehicle.lookup', mark)
+    apply_match(result, match)
+    if timed:
+        mark = metrics.lap('vehicle.year_check', mark)
+    record_logger.info("Validation result: %s", result['errors'] or 'No errors')
+    if timed:
+        now = perf_counter()
+        metrics.record('vehicle.logging', logging_time + now - mark)
+        metrics.record('vehicle.total', now - started)
+    return result
+
+def validate_car(brand: str, model: str, year: int, catalog: VehicleCatalog = None):
+    """Validate brand, model and year only, without a plate check."""
+    if catalog is None:
+        catalog = get_catalog()
+    return apply_match(new_result(None, brand, model, year), lookup_vehicle(brand, model, catalog))
+
 def main():
     # Get the absolute path to the data directory
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -130,4 +287,6 @@ def main():
             print(f"Row data: {row}")
 
 if __name__ == "__main__":
+    from utils.logging_setup import configure_logging
+    configure_logging()
     main()
\ No newline at end of file
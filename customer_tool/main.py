@@ -9,32 +9,84 @@ import argparse
 
 def main():
     """Main entry point for the application."""
+    # Add src directory to path
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    if current_dir not in sys.path:
+        sys.path.insert(0, current_dir)
+    
+    from config.settings import BATCH_WORKERS, BATCH_CHUNK_SIZE
+    
     parser = argparse.ArgumentParser(description='Smart Vehicle Data Validation & Error Detection')
-    parser.add_argument('--mode', choices=['validate', 'batch', 'correct', 'workflow', 'test'], 
+    parser.add_argument('--mode', choices=['validate', 'batch', 'correct', 'workflow', 'export', 'serve', 'compile', 'test'], 
                        default='validate', help='Mode of operation')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS,
+                       help='Worker processes for batch and workflow modes')
+    parser.add_argument('--chunk-size', type=int, default=BATCH_CHUNK_SIZE,
+                       help='Entries sent to a batch worker at a time')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream batch/correct modes through NDJSON results with constant memory')
+    parser.add_argument('--binary', action='store_true',
+                       help='Use binary results files (.bin) in batch/correct/workflow modes')
+    parser.add_argument('--input', default=None, help='Results file to convert in export mode')
+    parser.add_argument('--output', default=None, help='JSON or NDJSON file written by export mode')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print a per-stage timing breakdown after a batch/validate run (runs in-process)')
+    parser.add_argument('--log-async', action='store_true',
+                       help='Write log records from a background thread')
+    parser.add_argument('--log-sample', type=int, default=None, metavar='N',
+                       help='Keep one in N per-record validation log lines, with a periodic summary')
+    parser.add_argument('--host', default=None, help='Interface for serve mode')
+    parser.add_argument('--port', type=int, default=None, help='Port for serve mode')
     
     args = parser.parse_args()
     
-    # Add src directory to path
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    if current_dir not in sys.path:
-        sys.path.insert(0, current_dir)
+    # Logging is configured here, not as a side effect of importing modules
+    from utils.logging_setup import configure_logging
+    from config.settings import LOG_ASYNC, LOG_SAMPLE_EVERY
+    configure_logging(async_writer=args.log_async or LOG_ASYNC,
+                      sample_every=args.log_sample or LOG_SAMPLE_EVERY)
+    
+    if args.profile:
+        # Stages are recorded in this process only, so batch work stays in it
+        from utils.instrumentation import metrics
+        metrics.enable()
+        args.workers = 1
     
     if args.mode == 'validate':
         from core.validator import main as validate_main
         validate_main()
     elif args.mode == 'batch':
         from processing.batch_processor import main as batch_main
-        batch_main()
+        batch_main(workers=args.workers, chunk_size=args.chunk_size, stream=args.stream, binary=args.binary)
     elif args.mode == 'correct':
         from processing.data_corrector import main as correct_main
-        correct_main()
+        correct_main(stream=args.stream, binary=args.binary)
     elif args.mode == 'workflow':
         from workflows.full_workflow import main as workflow_main
-        workflow_main()
+        workflow_main(workers=args.workers, chunk_size=args.chunk_size, binary=args.binary)
+    elif args.mode == 'export':
+        from processing.batch_processor import export_results
+        from config.settings import DATA_DIR
+        input_path = args.input or os.path.join(DATA_DIR, 'validation_results.bin')
+        output_path = args.output or os.path.splitext(input_path)[0] + '.json'
+        total_entries, errors_count = export_results(input_path, output_path)
+        print(f"Exported {total_entries} results ({errors_count} with errors)")
+    elif args.mode == 'serve':
+        from service.validation_service import main as serve_main
+        from config.settings import SERVICE_HOST, SERVICE_PORT
+        serve_main(host=args.host or SERVICE_HOST, port=args.port or SERVICE_PORT)
+    elif args.mode == 'compile':
+        from utils.catalog_snapshot import compile_snapshot
+        from config.settings import CAR_DATA_PATH
+        print(f"Catalog snapshot written to {compile_snapshot(CAR_DATA_PATH)}")
     elif args.mode == 'test':
         from tests.test_validator import main as test_main
         test_main()
+    
+    if args.profile:
+        from utils.instrumentation import format_report
+        print()
+        print(format_report(metrics.snapshot()))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,8 +1,10 @@
 import os
 import sys
 import json
-import csv
 import logging
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the parent directory to sys.path when run directly
 if __name__ == "__main__":
@@ -11,68 +13,136 @@ if __name__ == "__main__":
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
 
-from core.validator import validate_vehicle
-from utils.data_loader import load_csv_data
+from core.validator import validate_vehicle, warm_up
+from utils.data_loader import load_csv_data, iter_csv_rows, iter_results
+from utils.results_file import write_results
+from utils.error_codes import result_mask
+from config.settings import CAR_DATA_PATH, BATCH_WORKERS, BATCH_CHUNK_SIZE
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def validate_batch(entries):
+def validate_entry(entry):
+    """
+    Validate a single vehicle entry.
+    
+    Args:
+        entry (dict): Vehicle data with plate, brand, model and year
+        
+    Returns:
+        dict: The input entry and its validation result
+    """
+    try:
+        year = int(entry.get("year", "")) if entry.get("year") else None
+    except ValueError:
+        year = None
+        
+    result = validate_vehicle(
+        plate=entry.get("plate", ""),
+        brand=entry.get("brand", ""),
+        model=entry.get("model", ""),
+        year=year,
+    )
+    
+    return {
+        "input": entry,
+        "result": result
+    }
+
+def _init_worker(car_data_path):
+    """Load the car catalog once per worker process."""
+    warm_up(car_data_path)
+
+def _validate_chunk(chunk):
+    """Validate a list of entries inside a worker process."""
+    return [validate_entry(entry) for entry in chunk]
+
+def iter_validate(entries, workers=BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE, car_data_path=CAR_DATA_PATH):
+    """
+    Lazily validate vehicle entries.
+    
+    Entries are pulled from the iterable only as results are consumed, so a
+    streaming source stays streaming. With several workers, at most two
+    chunks per worker are in flight at a time.
+    
+    Args:
+        entries (iterable): Dictionaries with vehicle data
+        workers (int): Number of worker processes; 1 validates in-process
+        chunk_size (int): Entries sent to a worker at a time
+        car_data_path (str): Car dataset worker processes load
+        
+    Yields:
+        dict: The input entry and its validation result, in input order
+    """
+    if workers <= 1:
+        for entry in entries:
+            yield validate_entry(entry)
+        return
+    
+    logger.info(f"Validating across {workers} worker processes (chunk size {chunk_size})")
+    entries = iter(entries)
+    chunk_size = max(1, chunk_size)
+    
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(car_data_path,)) as executor:
+        pending = deque()
+        for chunk in iter(lambda: list(islice(entries, chunk_size)), []):
+            pending.append(executor.submit(_validate_chunk, chunk))
+            # Futures are drained in submission order, matching the serial path
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def validate_batch(entries, workers=BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE, car_data_path=CAR_DATA_PATH):
     """
     Validate a batch of vehicle entries.
     
     Args:
         entries (list): List of dictionaries with vehicle data
+        workers (int): Number of worker processes; 1 validates in-process
+        chunk_size (int): Entries sent to a worker at a time
+        car_data_path (str): Car dataset worker processes load
         
     Returns:
-        list: List of validation results
+        list: List of validation results, in input order
     """
-    results = []
-    
-    for entry in entries:
-        try:
-            year = int(entry.get("year", "")) if entry.get("year") else None
-        except ValueError:
-            year = None
-            
-        result = validate_vehicle(
-            plate=entry.get("plate", ""),
-            brand=entry.get("brand", ""),
-            model=entry.get("model", ""),
-            year=year,
-        )
-        
-        results.append({
-            "input": entry,
-            "result": result
-        })
+    return list(iter_validate(entries, workers=workers, chunk_size=chunk_size, car_data_path=car_data_path))
+
+def entry_from_row(row):
+    """Return the vehicle entry for one validation dataset row."""
+    return {
+        "plate": row.get("user_input_plate", ""),
+        "brand": row.get("user_input_brand", ""),
+        "model": row.get("user_input_model", ""),
+        "year": row.get("user_input_year", "")
+    }
+
+def iter_entries_from_csv(csv_path):
+    """
+    Yield vehicle entries from a validation CSV file one row at a time.
     
-    return results
+    Args:
+        csv_path (str): Path to CSV file
+    """
+    for row in iter_csv_rows(csv_path):
+        yield entry_from_row(row)
 
-def validate_batch_from_csv(csv_path):
+def validate_batch_from_csv(csv_path, workers=BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE):
     """
     Validate vehicle entries from a CSV file.
     
     Args:
         csv_path (str): Path to CSV file
+        workers (int): Number of worker processes
+        chunk_size (int): Entries sent to a worker at a time
         
     Returns:
         list: List of validation results
     """
-    entries = []
+    entries = list(iter_entries_from_csv(csv_path))
     
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            entries.append({
-                "plate": row.get("user_input_plate", ""),
-                "brand": row.get("user_input_brand", ""),
-                "model": row.get("user_input_model", ""),
-                "year": row.get("user_input_year", "")
-            })
-    
-    return validate_batch(entries)
+    return validate_batch(entries, workers=workers, chunk_size=chunk_size)
 
 def save_results_to_json(results, output_path):
     """
@@ -87,26 +157,100 @@ def save_results_to_json(results, output_path):
     
     print(f"Results saved to {output_path}")
 
-def main():
+def save_results_to_ndjson(results, output_path):
+    """
+    Stream validation results to an NDJSON file, one compact object per line.
+    
+    Args:
+        results (iterable): Validation results, consumed lazily
+        output_path (str): Path to output NDJSON file
+        
+    Returns:
+        tuple: (total_entries, entries_with_errors)
+    """
+    total_entries = 0
+    errors_count = 0
+    
+    with open(output_path, 'w', encoding='utf-8') as file:
+        for entry in results:
+            file.write(json.dumps(entry, separators=(',', ':')))
+            file.write('\n')
+            total_entries += 1
+            if result_mask(entry["result"]):
+                errors_count += 1
+    
+    print(f"Results saved to {output_path}")
+    return total_entries, errors_count
+
+def save_results_to_binary(results, output_path):
+    """
+    Stream validation results to a binary results file (see utils.results_file).
+    
+    A result takes a fixed 33-byte record plus its share of a table of
+    distinct values, a small fraction of its JSON size.
+    
+    Args:
+        results (iterable): Validation results, consumed lazily
+        output_path (str): Path to output .bin file
+        
+    Returns:
+        tuple: (total_entries, entries_with_errors)
+    """
+    total_entries, errors_count = write_results(results, output_path)
+    print(f"Results saved to {output_path}")
+    return total_entries, errors_count
+
+def export_results(results_path, output_path):
+    """
+    Convert a results file to JSON, or to NDJSON if output_path ends in .ndjson/.jsonl.
+    
+    Any file iter_results reads can be exported, including binary results files.
+    
+    Returns:
+        tuple: (total_entries, entries_with_errors)
+    """
+    results = iter_results(results_path)
+    if output_path.endswith(('.ndjson', '.jsonl')):
+        return save_results_to_ndjson(results, output_path)
+    results = list(results)
+    save_results_to_json(results, output_path)
+    return len(results), sum(1 for r in results if result_mask(r["result"]))
+
+def main(workers=BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE, stream=False, binary=False):
     # Get the absolute path to the data directory
     current_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(current_dir, '..', '..', 'data')
     validation_data_path = os.path.join(data_dir, 'validation_dataset.csv')
-    output_path = os.path.join(data_dir, 'validation_results.json')
     
-    # Validate batch from CSV
-    results = validate_batch_from_csv(validation_data_path)
-    
-    # Save results to JSON
-    save_results_to_json(results, output_path)
+    if binary:
+        # Read, validate and write one row at a time, as fixed-width records
+        output_path = os.path.join(data_dir, 'validation_results.bin')
+        results = iter_validate(iter_entries_from_csv(validation_data_path), workers=workers, chunk_size=chunk_size)
+        total_entries, errors_count = save_results_to_binary(results, output_path)
+    elif stream:
+        # Read, validate and write one row at a time
+        output_path = os.path.join(data_dir, 'validation_results.ndjson')
+        results = iter_validate(iter_entries_from_csv(validation_data_path), workers=workers, chunk_size=chunk_size)
+        total_entries, errors_count = save_results_to_ndjson(results, output_path)
+    else:
+        output_path = os.path.join(data_dir, 'validation_results.json')
+        
+        # Validate batch from CSV
+        results = validate_batch_from_csv(validation_data_path, workers=workers, chunk_size=chunk_size)
+        
+        # Save results to JSON
+        save_results_to_json(results, output_path)
+        
+        total_entries = len(results)
+        errors_count = sum(1 for r in results if r["result"]["error_mask"])
     
     # Print summary
-    total_entries = len(results)
-    errors_count = sum(1 for r in results if r["result"]["errors"])
     print(f"\nBatch Validation Summary:")
     print(f"Total entries processed: {total_entries}")
     print(f"Entries with errors: {errors_count}")
     print(f"Entries without errors: {total_entries - errors_count}")
 
 if __name__ == "__main__":
+    from utils.logging_setup import configure_logging
+    configure_logging()
     main()
\ No newline at end of file
@@ -1,7 +1,6 @@
 import os
 import sys
 import csv
-import json
 import logging
 from datetime import datetime
 
@@ -12,8 +11,9 @@ if __name__ == "__main__":
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+from utils.data_loader import iter_csv_rows, iter_results
+from utils.error_codes import result_mask, PLATE_FORMAT_ERROR, TYPO_BRAND, TYPO_MODEL, INVALID_YEAR
+
 logger = logging.getLogger(__name__)
 
 def load_validation_data(csv_path):
@@ -36,119 +36,134 @@ def save_validation_data(validation_data, csv_path):
             writer.writerow(row)
     logger.info(f"Validation data saved to {csv_path}")
 
-def correct_validation_data(validation_data, corrections):
-    """Apply corrections to validation data."""
-    corrected_data = []
+def correct_row(row, correction):
+    """Apply one validation result to one validation row."""
+    if not correction:
+        return row
+    
+    # Create a new row with corrections applied
+    corrected_row = row.copy()
+    
+    # Error checks are bit tests on the result's error mask
+    mask = result_mask(correction)
     
-    for i, row in enumerate(validation_data):
-        correction = corrections[i] if i < len(corrections) else None
+    # Apply brand correction if available and there was a brand error
+    if correction.get('suggested_brand') and mask & TYPO_BRAND:
+        corrected_row['user_input_brand'] = correction['suggested_brand']
+    
+    # Apply model correction if available and there was a model error
+    if correction.get('suggested_model') and mask & TYPO_MODEL:
+        corrected_row['user_input_model'] = correction['suggested_model']
+    
+    # Apply year correction if available and there was a year error
+    if correction.get('valid_year_range') and mask & INVALID_YEAR:
+        # Use the middle of the valid year range as a reasonable correction
+        valid_start, valid_end = correction['valid_year_range']
+        corrected_year = (valid_start + valid_end) // 2
+        corrected_row['user_input_year'] = str(corrected_year)
+    
+    # Update error type
+    remaining_errors = []
+    if mask & TYPO_BRAND and correction.get('suggested_brand'):
+        pass  # Brand error fixed
+    else:
+        remaining_errors.append('typo_brand')
         
-        if correction:
-            # Create a new row with corrections applied
-            corrected_row = row.copy()
-            
-            # Apply brand correction if available and there was a brand error
-            if correction.get('suggested_brand') and 'typo_brand' in correction.get('errors', []):
-                corrected_row['user_input_brand'] = correction['suggested_brand']
-            
-            # Apply model correction if available and there was a model error
-            if correction.get('suggested_model') and 'typo_model' in correction.get('errors', []):
-                corrected_row['user_input_model'] = correction['suggested_model']
-            
-            # Apply year correction if available and there was a year error
-            if correction.get('valid_year_range') and 'invalid_year' in correction.get('errors', []):
-                # Use the middle of the valid year range as a reasonable correction
-                valid_start, valid_end = correction['valid_year_range']
-                corrected_year = (valid_start + valid_end) // 2
-                corrected_row['user_input_year'] = str(corrected_year)
-            
-            # Update error type
-            remaining_errors = []
-            if 'typo_brand' in correction.get('errors', []) and correction.get('suggested_brand'):
-                pass  # Brand error fixed
-            else:
-                remaining_errors.append('typo_brand')
-                
-            if 'typo_model' in correction.get('errors', []) and correction.get('suggested_model'):
-                pass  # Model error fixed
-            else:
-                remaining_errors.append('typo_model')
-                
-            if 'invalid_year' in correction.get('errors', []) and correction.get('valid_year_range'):
-                pass  # Year error fixed
-            else:
-                remaining_errors.append('invalid_year')
-                
-            if 'plate_format_error' in correction.get('errors', []):
-                remaining_errors.append('plate_format_error')
-            
-            # Update error type field
-            if remaining_errors:
-                corrected_row['error_type'] = ', '.join(remaining_errors)
-            else:
-                corrected_row['error_type'] = 'correct'
-            
-            corrected_data.append(corrected_row)
-        else:
-            corrected_data.append(row)
+    if mask & TYPO_MODEL and correction.get('suggested_model'):
+        pass  # Model error fixed
+    else:
+        remaining_errors.append('typo_model')
+        
+    if mask & INVALID_YEAR and correction.get('valid_year_range'):
+        pass  # Year error fixed
+    else:
+        remaining_errors.append('invalid_year')
+        
+    if mask & PLATE_FORMAT_ERROR:
+        remaining_errors.append('plate_format_error')
+    
+    # Update error type field
+    if remaining_errors:
+        corrected_row['error_type'] = ', '.join(remaining_errors)
+    else:
+        corrected_row['error_type'] = 'correct'
+    
+    return corrected_row
+
+def iter_corrected_data(validation_data, corrections):
+    """
+    Lazily apply corrections to validation data.
     
-    return corrected_data
+    Both arguments may be any iterables (e.g. iter_csv_rows and iter_results
+    generators); rows beyond the end of corrections pass through unchanged.
+    """
+    corrections = iter(corrections)
+    for row in validation_data:
+        yield correct_row(row, next(corrections, None))
 
-def main():
+def correct_validation_data(validation_data, corrections):
+    """Apply corrections to validation data."""
+    return list(iter_corrected_data(validation_data, corrections))
+
+def main(stream=False, binary=False):
     # Paths
     current_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(current_dir, '..', '..', 'data')
     validation_data_path = os.path.join(data_dir, 'validation_dataset.csv')
     corrected_data_path = os.path.join(data_dir, 'validation_dataset_corrected.csv')
-    results_path = os.path.join(data_dir, 'validation_results.json')
-    
-    # Load validation data
-    validation_data = load_validation_data(validation_data_path)
-    logger.info(f"Loaded {len(validation_data)} validation records")
+    if binary:
+        results_name = 'validation_results.bin'
+    else:
+        results_name = 'validation_results.ndjson' if stream else 'validation_results.json'
+    results_path = os.path.join(data_dir, results_name)
     
-    # Load validation results
-    with open(results_path, 'r', encoding='utf-8') as file:
-        corrections = json.load(file)
+    # Rows and results are read lazily and corrected rows are written as they
+    # are produced, so an NDJSON or binary results file is never held in memory
+    validation_data = iter_csv_rows(validation_data_path)
+    corrections = (entry['result'] for entry in iter_results(results_path))
     
-    # Extract just the result part from each entry
-    correction_results = [entry['result'] for entry in corrections]
-    
-    # Apply corrections
-    corrected_data = correct_validation_data(validation_data, correction_results)
+    # Count errors before and after
+    totals = {'records': 0, 'errors_before': 0, 'errors_after': 0}
     
-    # Save corrected data
-    save_validation_data(corrected_data, corrected_data_path)
-    logger.info(f"Corrected validation data saved to {corrected_data_path}")
+    def compare(rows):
+        for i, original in enumerate(rows):
+            corrected = correct_row(original, next(corrections, None))
+            
+            original_errors = original['error_type'].split(', ') if original['error_type'] != 'correct' else []
+            corrected_errors = corrected['error_type'].split(', ') if corrected['error_type'] != 'correct' else []
+            
+            totals['records'] += 1
+            if original_errors and original_errors != ['']:
+                totals['errors_before'] += len(original_errors)
+            
+            if corrected_errors and corrected_errors != ['']:
+                totals['errors_after'] += len(corrected_errors)
+            
+            # Show changes
+            if original != corrected:
+                print(f"\nRecord {i}:")
+                print(f"  Before: {original['user_input_brand']} {original['user_input_model']} {original['user_input_year']} (Errors: {original['error_type']})")
+                print(f"  After:  {corrected['user_input_brand']} {corrected['user_input_model']} {corrected['user_input_year']} (Errors: {corrected['error_type']})")
+            
+            yield corrected
     
-    # Print comparison
     print("\n=== Validation Data Correction Results ===")
-    print(f"Total records: {len(validation_data)}")
     
-    # Count errors before and after
-    errors_before = 0
-    errors_after = 0
+    # Apply corrections and save corrected data
+    save_validation_data(compare(validation_data), corrected_data_path)
+    logger.info(f"Corrected validation data saved to {corrected_data_path}")
     
-    for i, (original, corrected) in enumerate(zip(validation_data, corrected_data)):
-        original_errors = original['error_type'].split(', ') if original['error_type'] != 'correct' else []
-        corrected_errors = corrected['error_type'].split(', ') if corrected['error_type'] != 'correct' else []
-        
-        if original_errors and original_errors != ['']:
-            errors_before += len(original_errors)
-        
-        if corrected_errors and corrected_errors != ['']:
-            errors_after += len(corrected_errors)
-        
-        # Show changes
-        if original != corrected:
-            print(f"\nRecord {i}:")
-            print(f"  Before: {original['user_input_brand']} {original['user_input_model']} {original['user_input_year']} (Errors: {original['error_type']})")
-            print(f"  After:  {corrected['user_input_brand']} {corrected['user_input_model']} {corrected['user_input_year']} (Errors: {corrected['error_type']})")
+    errors_before = totals['errors_before']
+    errors_after = totals['errors_after']
     
     print(f"\nSummary:")
+    print(f"  Total records: {totals['records']}")
     print(f"  Total errors before correction: {errors_before}")
     print(f"  Total errors after correction: {errors_after}")
     print(f"  Errors fixed: {errors_before - errors_after}")
     print(f"  Error reduction: {((errors_before - errors_after) / errors_before * 100):.1f}%")
 
 if __name__ == "__main__":
+    from utils.logging_setup import configure_logging
+    configure_logging()
     main()
\ No newline at end of file
@@ -1,13 +1,22 @@
 import os
+import sys
 import csv
 import json
 import logging
-from collections import defaultdict, Counter
 from datetime import datetime
-from utils.data_loader import load_car_data
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from utils.data_loader import load_car_data, iter_results
+from utils.catalog_snapshot import compile_snapshot, read_catalog
+from utils.catalog_journal import CatalogJournal
+from config.settings import CAR_DATA_PATH, CATALOG_JOURNAL_COMPACT_THRESHOLD
+
 logger = logging.getLogger(__name__)
 
 def load_car_data(car_data_path):
@@ -21,112 +30,120 @@ def load_car_data(car_data_path):
             car_data.append(row)
     return car_data
 
-def save_car_data(car_data, car_data_path):
-    """Save car data to CSV."""
-    with open(car_data_path, 'w', encoding='utf-8', newline='') as file:
-        fieldnames = ['brand', 'model', 'year_start', 'year_end']
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
-        for car in car_data:
-            writer.writerow(car)
-    logger.info(f"Car data saved to {car_data_path}")
-
-def create_backup(car_data, backup_path):
-    """Create a backup of the current car data."""
-    with open(backup_path, 'w', encoding='utf-8', newline='') as file:
-        fieldnames = ['brand', 'model', 'year_start', 'year_end']
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
-        for car in car_data:
-            writer.writerow(car)
-    logger.info(f"Backup created at {backup_path}")
-
-def apply_updates(car_data, approved_updates):
-    """Apply approved updates to car_data."""
+def apply_updates(catalog, approved_updates, journal=None):
+    """
+    Apply approved updates to a VehicleCatalog.
+    
+    Each update is a keyed lookup in the catalog. Updates that change the
+    catalog are appended to the journal as one record when one is given.
+    
+    Args:
+        catalog (VehicleCatalog): Catalog to update in place
+        approved_updates (dict): 'new_entries' and 'year_range_updates' lists
+        journal (CatalogJournal): Change journal of the catalog's dataset
+        
+    Returns:
+        VehicleCatalog: The updated catalog
+    """
+    changes = []
+    
     # Apply new entries
     for new_entry in approved_updates.get('new_entries', []):
-        # Check if the entry already exists
-        exists = any(
-            car['brand'] == new_entry['brand'] and 
-            car['model'] == new_entry['model'] 
-            for car in car_data
+        added = catalog.add(
+            new_entry['brand'],
+            new_entry['model'],
+            new_entry['year_start'],
+            new_entry['year_end']
         )
         
-        if not exists:
-            car_data.append({
-                'brand': new_entry['brand'],
-                'model': new_entry['model'],
-                'year_start': new_entry['year_start'],
-                'year_end': new_entry['year_end']
-            })
+        if added:
+            changes.append({'op': 'add', 'brand': new_entry['brand'], 'model': new_entry['model'],
+                            'years': [new_entry['year_start'], new_entry['year_end']]})
             logger.info(f"Added new entry: {new_entry['brand']} {new_entry['model']} ({new_entry['year_start']}-{new_entry['year_end']})")
     
     # Apply year range updates
     for update in approved_updates.get('year_range_updates', []):
-        for car in car_data:
-            if car['brand'] == update['brand'] and car['model'] == update['model']:
-                old_range = (car['year_start'], car['year_end'])
-                new_range = update['suggested_range']
-                
-                car['year_start'] = new_range[0]
-                car['year_end'] = new_range[1]
-                
-                logger.info(f"Updated year range for {car['brand']} {car['model']}: {old_range} -> {new_range}")
-                break
+        new_range = update['suggested_range']
+        old_range = catalog.set_year_range(update['brand'], update['model'], new_range[0], new_range[1])
+        
+        if old_range is not None:
+            changes.append({'op': 'set_years', 'brand': update['brand'], 'model': update['model'],
+                            'years': list(new_range), 'previous': list(old_range)})
+            logger.info(f"Updated year range for {update['brand']} {update['model']}: {old_range} -> {new_range}")
     
-    return car_data
+    if journal is not None and changes:
+        record = journal.append(changes)
+        logger.info(f"Journaled {len(changes)} catalog changes as record {record['seq']}")
+    
+    return catalog
+
+def _parse_year(value):
+    """Return a result's input year as an int, or None when missing or malformed."""
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
 
-def analyze_validation_results(results, car_data):
-    """Analyze validation results to find potential updates to car_data."""
-    # Track potential new entries and updates
-    potential_new_entries = []
-    potential_year_updates = defaultdict(list)
+def analyze_validation_results(results, catalog):
+    """
+    Analyze validation results to find potential updates to the catalog.
     
-    # Count frequency of suggested corrections
-    brand_model_counts = Counter()
+    Results are consumed in a single pass and may be any iterable, such as
+    iter_results over an NDJSON file or several files chained together.
+    Memory grows with the number of distinct suggested brand/model pairs,
+    not with the number of results.
+    
+    Args:
+        results (iterable): Entries with 'input' and 'result' keys
+        catalog (VehicleCatalog): The current car catalog
+        
+    Returns:
+        dict: Suggested 'new_entries' and 'year_range_updates'
+    """
+    # Per suggested brand/model: how often it was suggested, whether the
+    # catalog has it, and running min/max over the input years of erroneous
+    # results for pairs missing from the catalog
+    pair_stats = {}
+    # Per brand/model: running min/max/count of input years outside its range
+    year_stats = {}
     
     for entry in results:
         result = entry['result']
-        input_data = entry['input']
+        brand = result['suggested_brand']
+        model = result['suggested_model']
+        if not (brand and model):
+            continue
         
-        # If we have a suggested brand and model, count it
-        if result['suggested_brand'] and result['suggested_model']:
-            key = (result['suggested_brand'], result['suggested_model'])
-            brand_model_counts[key] += 1
-            
-            # If the input had errors, this might be a new entry we should consider
-            if result['errors']:
-                # Check if this brand-model combination exists in our dataset
-                exists = any(
-                    car['brand'] == result['suggested_brand'] and 
-                    car['model'] == result['suggested_model'] 
-                    for car in car_data
-                )
-                
-                if not exists:
-                    # This is a potential new entry
-                    potential_new_entries.append({
-                        'brand': result['suggested_brand'],
-                        'model': result['suggested_model'],
-                        'year': input_data.get('year'),
-                        'error_count': len(result['errors'])
-                    })
+        key = (brand, model)
+        stats = pair_stats.get(key)
+        if stats is None:
+            stats = pair_stats[key] = {'count': 0, 'in_catalog': key in catalog,
+                                       'min_year': None, 'max_year': None}
+        stats['count'] += 1
+        
+        year = None
+        if result['errors'] and not stats['in_catalog']:
+            # This is a potential new entry
+            year = _parse_year(entry['input'].get('year'))
+            if year is not None:
+                if stats['min_year'] is None or year < stats['min_year']:
+                    stats['min_year'] = year
+                if stats['max_year'] is None or year > stats['max_year']:
+                    stats['max_year'] = year
         
-        # Check for year range updates
-        if result['suggested_brand'] and result['suggested_model'] and result['valid_year_range']:
-            input_year = input_data.get('year')
-            if input_year:
-                try:
-                    year_int = int(input_year)
-                    valid_start, valid_end = result['valid_year_range']
-                    
-                    # If the year is outside the valid range but was suggested as a correction,
-                    # we might need to expand our year range
-                    if year_int < valid_start or year_int > valid_end:
-                        key = (result['suggested_brand'], result['suggested_model'])
-                        potential_year_updates[key].append(year_int)
-                except ValueError:
-                    pass
+        # An input year outside the valid range may mean the range needs widening
+        if result['valid_year_range']:
+            if year is None:
+                year = _parse_year(entry['input'].get('year'))
+            valid_start, valid_end = result['valid_year_range']
+            if year is not None and (year < valid_start or year > valid_end):
+                span = year_stats.get(key)
+                if span is None:
+                    year_stats[key] = [year, year, 1]
+                else:
+                    span[0] = min(span[0], year)
+                    span[1] = max(span[1], year)
+                    span[2] += 1
     
     # Generate suggestions
     suggestions = {
@@ -135,51 +152,32 @@ def analyze_validation_results(results, car_data):
         'timestamp': datetime.now().isoformat()
     }
     
-    # Filter potential new entries by frequency
-    for (brand, model), count in brand_model_counts.items():
-        if count >= 1:  # Threshold for suggesting new entries
-            # Find the min and max years from potential entries
-            related_entries = [e for e in potential_new_entries 
-                              if e['brand'] == brand and e['model'] == model]
-            
-            if related_entries:
-                years = [int(e['year']) for e in related_entries if e['year']]
-                if years:
-                    min_year = min(years)
-                    max_year = max(years)
-                    
-                    suggestions['new_entries'].append({
-                        'brand': brand,
-                        'model': model,
-                        'year_start': min_year,
-                        'year_end': max_year,
-                        'frequency': count,
-                        'confidence': min(count / 10, 1.0)  # Simple confidence calculation
-                    })
+    for (brand, model), stats in pair_stats.items():
+        count = stats['count']
+        if count >= 1 and stats['min_year'] is not None:  # Threshold for suggesting new entries
+            suggestions['new_entries'].append({
+                'brand': brand,
+                'model': model,
+                'year_start': stats['min_year'],
+                'year_end': stats['max_year'],
+                'frequency': count,
+                'confidence': min(count / 10, 1.0)  # Simple confidence calculation
+            })
     
     # Generate year range update suggestions
-    for (brand, model), years in potential_year_updates.items():
-        if len(years) >= 1:  # Threshold for suggesting year updates
-            min_year = min(years)
-            max_year = max(years)
+    for (brand, model), (min_year, max_year, count) in year_stats.items():
+        if count >= 1:  # Threshold for suggesting year updates
+            current_range = catalog.year_range(brand, model)
             
-            # Find current year range
-            current_range = None
-            for car in car_data:
-                if car['brand'] == brand and car['model'] == model:
-                    current_range = (car['year_start'], car['year_end'])
-                    break
-            
-            if current_range:
-                # Only suggest if the new range is significantly different
-                if min_year < current_range[0] - 1 or max_year > current_range[1] + 1:
-                    suggestions['year_range_updates'].append({
-                        'brand': brand,
-                        'model': model,
-                        'current_range': current_range,
-                        'suggested_range': (min_year, max_year),
-                        'frequency': len(years)
-                    })
+            # Only suggest if the new range is significantly different
+            if current_range and (min_year < current_range[0] - 1 or max_year > current_range[1] + 1):
+                suggestions['year_range_updates'].append({
+                    'brand': brand,
+                    'model': model,
+                    'current_range': current_range,
+                    'suggested_range': (min_year, max_year),
+                    'frequency': count
+                })
     
     return suggestions
 
@@ -189,23 +187,23 @@ def save_suggestions(suggestions, output_path):
         json.dump(suggestions, file, indent=2)
     logger.info(f"Update suggestions saved to {output_path}")
 
-def main():
+def main(stream=False):
     # Paths
     current_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(current_dir, '..', '..', 'data')
     car_data_path = os.path.join(data_dir, 'car_dataset.csv')
-    validation_results_path = os.path.join(data_dir, 'validation_results.json')
+    results_name = 'validation_results.ndjson' if stream else 'validation_results.json'
+    validation_results_path = os.path.join(data_dir, results_name)
     suggestions_path = os.path.join(data_dir, 'dataset_update_suggestions.json')
     
-    # Load car data
-    car_data = load_car_data(car_data_path)
+    # Load the car catalog: the base plus its change journal
+    catalog = read_catalog(car_data_path)
     
-    # Load validation results
-    with open(validation_results_path, 'r', encoding='utf-8') as file:
-        results = json.load(file)
+    # Load validation results (NDJSON is read one entry at a time)
+    results = iter_results(validation_results_path)
     
     # Analyze results
-    suggestions = analyze_validation_results(results, car_data)
+    suggestions = analyze_validation_results(results, catalog)
     
     # Save suggestions
     save_suggestions(suggestions, suggestions_path)
@@ -220,11 +218,6 @@ def main():
     for update in suggestions['year_range_updates']:
         print(f"  - {update['brand']} {update['model']}: {update['current_range']} -> {update['suggested_range']}")
     
-    # Create backup
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = os.path.join(data_dir, f'car_dataset_backup_{timestamp}.csv')
-    create_backup(car_data, backup_path)
-    
     # Load suggestions or create default if it doesn't exist
     if os.path.exists(suggestions_path):
         with open(suggestions_path, 'r', encoding='utf-8') as file:
@@ -245,13 +238,48 @@ def main():
         'year_range_updates': suggestions.get('year_range_updates', [])
     }
     
-    # Apply updates
-    car_data = apply_updates(car_data, approved_updates)
-    
-    # Save updated car data
-    save_car_data(car_data, car_data_path)
+    # Apply updates; only the changes are written, to the journal
+    journal = CatalogJournal(car_data_path)
+    catalog = apply_updates(catalog, approved_updates, journal)
+    compact_if_needed(catalog, journal)
     
     logger.info("Dataset updated successfully")
 
+def compact_if_needed(catalog, journal, threshold=CATALOG_JOURNAL_COMPACT_THRESHOLD):
+    """
+    Fold the journal into a new base once it holds `threshold` changes.
+    
+    The base snapshot is recompiled after a compaction, which rewrites the CSV.
+    
+    Returns:
+        bool: True if the journal was compacted
+    """
+    if journal.pending_changes() < threshold:
+        return False
+    journal.compact(catalog)
+    compile_snapshot(journal.car_data_path)
+    return True
+
+def restore(as_of, car_data_path=CAR_DATA_PATH):
+    """Roll the car dataset back to its state at `as_of` (a datetime) using the journal."""
+    catalog = read_catalog(car_data_path)
+    record = CatalogJournal(car_data_path).revert_to(catalog, as_of)
+    if record is None:
+        print(f"No catalog changes after {as_of.isoformat()}")
+    else:
+        print(f"Reverted {len(record['changes'])} catalog changes made after {as_of.isoformat()}")
+    return catalog
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    from utils.logging_setup import configure_logging
+    parser = argparse.ArgumentParser(description='Suggest and apply car dataset updates')
+    parser.add_argument('--stream', action='store_true', help='Read validation_results.ndjson')
+    parser.add_argument('--restore', metavar='TIME', type=datetime.fromisoformat,
+                        help='Roll the car dataset back to an ISO timestamp instead')
+    args = parser.parse_args()
+    configure_logging()
+    if args.restore:
+        restore(args.restore)
+    else:
+        main(stream=args.stream)
\ No newline at end of file
@@ -0,0 +1,105 @@
+import os
+import sys
+import asyncio
+import logging
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from core.validator import lookup_vehicles, normalize_input
+from config.settings import SERVICE_BATCH_WINDOW_MS, SERVICE_BATCH_MAX_SIZE
+
+logger = logging.getLogger(__name__)
+
+class RequestBatcher:
+    """
+    Coalesces brand/model lookups arriving on the event loop.
+
+    Queries are collected for up to window_ms milliseconds, or until
+    max_size distinct queries are waiting, and then resolved with a single
+    lookup_vehicles call on the executor. A query identical (after
+    normalization) to one that is already waiting or being matched shares
+    its future instead of being matched again; every caller still gets its
+    own awaitable result.
+    """
+
+    def __init__(self, executor, window_ms=SERVICE_BATCH_WINDOW_MS, max_size=SERVICE_BATCH_MAX_SIZE):
+        """
+        Initialize the batcher.
+
+        Args:
+            executor (Executor): Executor lookup_vehicles runs on
+            window_ms (float): Longest time a query waits for others to join its batch
+            max_size (int): Distinct queries that trigger an immediate flush
+        """
+        self.executor = executor
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._pending = {}    # key -> future, waiting for the next flush
+        self._in_flight = {}  # key -> future, being matched
+        self._timer = None
+        self.requests = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.batched_keys = 0
+
+    async def lookup(self, brand, model):
+        """Return the (matched_brand, matched_model, year_range) match for a brand/model."""
+        key = (normalize_input(brand), normalize_input(model))
+        self.requests += 1
+
+        future = self._pending.get(key) or self._in_flight.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = self._pending[key] = loop.create_future()
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+        self.batches += 1
+        self.batched_keys += len(batch)
+        asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            matches = await loop.run_in_executor(self.executor, lookup_vehicles, list(batch))
+        except Exception as e:
+            logger.exception(f"Batch of {len(batch)} lookups failed: {e}")
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(matches[key])
+        finally:
+            for key in batch:
+                self._in_flight.pop(key, None)
+
+    def stats(self):
+        """Return request, deduplication and batch size counters."""
+        return {
+            'requests': self.requests,
+            'deduplicated': self.deduplicated,
+            'batches': self.batches,
+            'mean_batch_size': self.batched_keys / self.batches if self.batches else 0.0
+        }
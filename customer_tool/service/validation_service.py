@@ -0,0 +1,331 @@
+import os
+import sys
+import json
+import asyncio
+import logging
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from core.validator import validate_car, warm_up, get_catalog, new_result, apply_match
+from core.plate_validator import validate_plate_format
+from service.request_batcher import RequestBatcher
+from config.settings import (CAR_DATA_PATH, VEHICLE_REGISTRY_PATH, SERVICE_HOST, SERVICE_PORT,
+                             SERVICE_EXECUTOR, SERVICE_EXECUTOR_WORKERS,
+                             SERVICE_KEEP_ALIVE_TIMEOUT, SERVICE_MAX_BODY_BYTES,
+                             SERVICE_BATCH_WINDOW_MS, SERVICE_BATCH_MAX_SIZE)
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    501: 'Not Implemented'
+}
+
+class HttpError(Exception):
+    """An error that maps directly onto an HTTP error response."""
+
+    def __init__(self, status, message=None):
+        super().__init__(message or REASONS.get(status, ''))
+        self.status = status
+        self.message = message or REASONS.get(status, '')
+
+def normalize_plate(plate):
+    """Uppercase a plate and drop whitespace, as the onboarding frontend does."""
+    return ''.join(str(plate or '').upper().split())
+
+def load_vehicle_registry(registry_path=VEHICLE_REGISTRY_PATH):
+    """
+    Load registered vehicles keyed by normalized plate.
+
+    The file is a JSON list shaped like smart-onboarding's mockData VEHICLES
+    ({plate, ownerLast4, personal, car}); data/vehicle_registry.json ships
+    with those mock vehicles. A missing file means no vehicle is registered
+    yet.
+    """
+    if not os.path.exists(registry_path):
+        logger.info(f"No vehicle registry at {registry_path}; every valid plate is treated as new")
+        return {}
+
+    with open(registry_path, 'r', encoding='utf-8') as file:
+        vehicles = json.load(file)
+
+    logger.info(f"Loaded {len(vehicles)} registered vehicles")
+    return {normalize_plate(vehicle['plate']): vehicle for vehicle in vehicles}
+
+def _parse_year(year):
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return None
+
+def car_response(result):
+    """Turn a validate_car result into the validateCar response shape used by api.js."""
+    errors = result['errors']
+    if not errors:
+        return {'ok': True, 'message': 'Vehicle information is valid'}
+
+    response = {'ok': False, 'errors': errors}
+    if 'invalid_brand' in errors:
+        response['message'] = f"Unknown brand '{result['input_brand']}'"
+        return response
+    if 'invalid_model' in errors:
+        response['message'] = f"Unknown model '{result['input_model']}' for {result['suggested_brand']}"
+        response['corrected'] = {'brand': result['suggested_brand']}
+        return response
+
+    response['corrected'] = {'brand': result['suggested_brand'], 'model': result['suggested_model']}
+    start, end = result['valid_year_range']
+    response['validYearRange'] = [start, end]
+    if 'invalid_year' in errors:
+        response['message'] = f"Year must be between {start} and {end} for {result['suggested_brand']} {result['suggested_model']}"
+    else:
+        response['message'] = f"Did you mean {result['suggested_brand']} {result['suggested_model']}?"
+    return response
+
+class ValidationService:
+    """
+    Asyncio HTTP/1.1 JSON service for the smart-onboarding frontend.
+
+    The car catalog stays resident and is reloaded in the background when
+    the dataset file changes; each request works on one snapshot. Brand/model
+    matching is CPU-bound and runs on an executor so the event loop keeps
+    accepting connections; cheap lookups (brands, models, plates) are served
+    inline. Connections are kept alive between requests, and concurrent
+    validateCar lookups can be coalesced by a RequestBatcher.
+    """
+
+    def __init__(self, registry=None, executor=None, keep_alive_timeout=SERVICE_KEEP_ALIVE_TIMEOUT,
+                 batch_window_ms=SERVICE_BATCH_WINDOW_MS, batch_max_size=SERVICE_BATCH_MAX_SIZE):
+        """
+        Initialize the service.
+
+        Args:
+            registry (dict): Registered vehicles keyed by normalized plate
+            executor (Executor): Executor for brand/model matching
+            keep_alive_timeout (float): Seconds an idle connection is kept open
+            batch_window_ms (float): Coalescing window for validateCar lookups; 0 disables batching
+            batch_max_size (int): Distinct lookups that flush a batch early
+        """
+        self.registry = registry if registry is not None else load_vehicle_registry()
+        self.executor = executor or ThreadPoolExecutor(max_workers=SERVICE_EXECUTOR_WORKERS)
+        self.keep_alive_timeout = keep_alive_timeout
+        self.batcher = RequestBatcher(self.executor, batch_window_ms, batch_max_size) if batch_window_ms > 0 else None
+        self.routes = {
+            ('POST', '/api/verify-plate'): self.verify_plate,
+            ('POST', '/api/validate-car'): self.validate_car,
+            ('GET', '/api/brands'): self.get_brands,
+            ('GET', '/api/models'): self.get_models,
+            ('POST', '/api/confirm-ownership'): self.confirm_ownership,
+            ('GET', '/api/health'): self.health_check,
+        }
+        self.paths = {path for _, path in self.routes}
+
+    # --- Endpoints ---
+
+    async def verify_plate(self, payload, query):
+        plate = normalize_plate(payload.get('plate'))
+        valid_plate, _ = validate_plate_format(plate)
+        if not valid_plate:
+            return {'status': 'invalid', 'message': 'Invalid plate format. Please use format like ABC 1234 or XYZ123'}
+        if plate in self.registry:
+            return {'status': 'existing', 'plate': plate}
+        return {'status': 'new', 'plate': plate, 'message': 'Plate format is valid'}
+
+    async def validate_car(self, payload, query):
+        brand = payload.get('brand')
+        model = payload.get('model')
+        year = payload.get('year')
+        if not brand or not model or not year:
+            return {'ok': False, 'message': 'All fields (brand, model, year) are required'}
+
+        result = await self.match_car(str(brand), str(model), _parse_year(year))
+        return car_response(result)
+
+    async def match_car(self, brand, model, year):
+        """Run validate_car on the executor, through the batcher when enabled."""
+        if self.batcher is not None:
+            match = await self.batcher.lookup(brand, model)
+            return apply_match(new_result(None, brand, model, year), match)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, validate_car, brand, model, year)
+
+    async def get_brands(self, payload, query):
+        return get_catalog().brands()
+
+    async def get_models(self, payload, query):
+        catalog = get_catalog()
+        brand = query.get('brand', [''])[0]
+        return catalog.models(catalog.lookup_brand(brand) or brand)
+
+    async def confirm_ownership(self, payload, query):
+        vehicle = self.registry.get(normalize_plate(payload.get('plate')))
+        if not vehicle:
+            return {'ok': False, 'message': 'Record not found.'}
+        if str(payload.get('last4')) == str(vehicle.get('ownerLast4')):
+            return {'ok': True, 'personal': vehicle.get('personal'), 'car': vehicle.get('car')}
+        return {'ok': False, 'message': 'Last 4 digits do not match.'}
+
+    async def health_check(self, payload, query):
+        health = {'status': 'healthy', 'mode': 'engine', 'catalog_models': len(get_catalog())}
+        if self.batcher is not None:
+            health['batching'] = self.batcher.stats()
+        return health
+
+    # --- HTTP plumbing ---
+
+    async def dispatch(self, method, target, body):
+        """Route a request; returns (status, payload)."""
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            raise HttpError(405 if url.path in self.paths else 404)
+
+        payload = {}
+        if body:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise HttpError(400, 'Request body must be JSON')
+            if not isinstance(payload, dict):
+                raise HttpError(400, 'Request body must be a JSON object')
+
+        return 200, await handler(payload, parse_qs(url.query))
+
+    async def read_request(self, reader):
+        """Read one request; returns (method, target, version, headers, body) or None on a clean close."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keep_alive_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, 'Request headers too large')
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            raise HttpError(400, 'Malformed request line')
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        if 'transfer-encoding' in headers:
+            raise HttpError(501, 'Chunked request bodies are not supported')
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HttpError(400, 'Invalid Content-Length')
+        if length > SERVICE_MAX_BODY_BYTES:
+            raise HttpError(413)
+
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, version, headers, body
+
+    def write_response(self, writer, status, payload, keep_alive):
+        body = b'' if status == 204 else json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        head = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Access-Control-Allow-Origin: *",
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+            "Access-Control-Allow-Headers: Content-Type",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client or an error closes it."""
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except HttpError as e:
+                    self.write_response(writer, e.status, {'error': e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+                try:
+                    if method == 'OPTIONS':
+                        status, payload = 204, None
+                    else:
+                        status, payload = await self.dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {'error': e.message}
+                except Exception as e:
+                    logger.exception(f"Error handling {method} {target}: {e}")
+                    status, payload = 500, {'error': 'Internal server error'}
+
+                self.write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT, ready=None):
+        """
+        Accept connections until cancelled.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind; 0 picks a free port
+            ready (asyncio.Future): Optional future set to the bound port once listening
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        bound_port = server.sockets[0].getsockname()[1]
+        logger.info(f"Validation service listening on http://{host}:{bound_port}/api")
+        if ready is not None:
+            ready.set_result(bound_port)
+        async with server:
+            await server.serve_forever()
+
+def create_executor(kind=SERVICE_EXECUTOR, workers=SERVICE_EXECUTOR_WORKERS, car_data_path=CAR_DATA_PATH):
+    """Create the matching executor; process workers load and watch the catalog themselves."""
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=workers, initializer=warm_up, initargs=(car_data_path, True))
+    return ThreadPoolExecutor(max_workers=workers)
+
+def shutdown_executor(executor):
+    """Shut an executor down without waiting, cancelling calls that have not started where supported."""
+    if sys.version_info >= (3, 9):
+        executor.shutdown(wait=False, cancel_futures=True)
+    else:
+        # cancel_futures is new in Python 3.9; queued calls still run
+        executor.shutdown(wait=False)
+
+def main(host=SERVICE_HOST, port=SERVICE_PORT, executor_kind=SERVICE_EXECUTOR, workers=SERVICE_EXECUTOR_WORKERS):
+    # Keep the catalog resident before accepting traffic, and pick up
+    # dataset changes without a restart
+    warm_up(watch=True)
+    executor = create_executor(executor_kind, workers)
+    service = ValidationService(executor=executor)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        logger.info("Validation service stopped")
+    finally:
+        shutdown_executor(executor)
+
+if __name__ == "__main__":
+    from utils.logging_setup import configure_logging
+    configure_logging()
+    main()
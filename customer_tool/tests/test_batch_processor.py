@@ -0,0 +1,61 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from processing.batch_processor import validate_batch, iter_validate, save_results_to_ndjson
+from utils.data_loader import iter_results
+
+ENTRIES = [
+    {"plate": "ABC 1234", "brand": "Toyot", "model": "Vios", "year": "2021"},
+    {"plate": "INVALID", "brand": "Honda", "model": "Civicy", "year": "2001"},
+    {"plate": "XUP 4254", "brand": "notorP", "model": "X70", "year": "2099"},
+    {"plate": "OUG9690", "brand": "Perodua", "model": "Axia", "year": ""},
+    {"plate": "RYL 5036", "brand": "Nissan", "model": "Almera", "year": "abc"},
+] * 5
+
+class TestBatchProcessor(unittest.TestCase):
+    
+    def test_parallel_matches_serial(self):
+        """Test that the worker pool returns the serial results in input order."""
+        serial = validate_batch(ENTRIES, workers=1)
+        parallel = validate_batch(ENTRIES, workers=2, chunk_size=3)
+        self.assertEqual(parallel, serial)
+        self.assertEqual([r["input"] for r in parallel], ENTRIES)
+
+    def test_iter_validate_is_lazy(self):
+        """Test that entries are only pulled as results are consumed."""
+        pulled = []
+        
+        def source():
+            for entry in ENTRIES:
+                pulled.append(entry)
+                yield entry
+        
+        results = iter_validate(source())
+        next(results)
+        self.assertEqual(len(pulled), 1)
+    
+    def test_ndjson_round_trip(self):
+        """Test streaming results to NDJSON and reading them back."""
+        expected = validate_batch(ENTRIES)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'results.ndjson')
+            total, with_errors = save_results_to_ndjson(iter_validate(iter(ENTRIES), workers=2, chunk_size=4), output_path)
+            self.assertEqual(total, len(ENTRIES))
+            self.assertEqual(with_errors, sum(1 for r in expected if r["result"]["errors"]))
+            
+            with open(output_path, encoding='utf-8') as file:
+                self.assertEqual(sum(1 for _ in file), len(ENTRIES))
+            
+            read_back = list(iter_results(output_path))
+            self.assertEqual([r["input"] for r in read_back], ENTRIES)
+            self.assertEqual([r["result"]["errors"] for r in read_back], [r["result"]["errors"] for r in expected])
+
+if __name__ == "__main__":
+    unittest.main()
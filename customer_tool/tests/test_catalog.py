@@ -0,0 +1,240 @@
+import unittest
+import os
+import sys
+import csv
+import shutil
+import tempfile
+from datetime import datetime
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from utils.catalog import VehicleCatalog
+from utils.catalog_provider import CatalogProvider
+from utils.catalog_snapshot import compile_snapshot, load_snapshot, read_catalog, snapshot_path_for
+from utils.catalog_journal import CatalogJournal, journal_path_for
+from utils.fuzzy_matcher import fuzzy_match
+
+CAR_DATA = [
+    {'brand': 'Toyota', 'model': 'Vios', 'year_start': 2010, 'year_end': 2025},
+    {'brand': 'Toyota', 'model': 'Camry', 'year_start': 2005, 'year_end': 2025},
+    {'brand': 'Honda', 'model': 'Civic', 'year_start': 2000, 'year_end': 2025},
+    {'brand': 'Toyota', 'model': 'Vios', 'year_start': 1990, 'year_end': 1995},
+]
+
+class TestVehicleCatalog(unittest.TestCase):
+    
+    def setUp(self):
+        self.catalog = VehicleCatalog(CAR_DATA)
+    
+    def test_indexes(self):
+        """Test brand, model and year range lookups."""
+        self.assertEqual(self.catalog.brands(), ['Toyota', 'Honda'])
+        self.assertEqual(self.catalog.models('Toyota'), ['Vios', 'Camry'])
+        self.assertEqual(self.catalog.year_range('Honda', 'Civic'), (2000, 2025))
+        self.assertIsNone(self.catalog.year_range('Honda', 'Vios'))
+        self.assertIn(('Toyota', 'Camry'), self.catalog)
+    
+    def test_first_row_wins(self):
+        """Test that duplicate rows keep the first year range."""
+        self.assertEqual(self.catalog.year_range('Toyota', 'Vios'), (2010, 2025))
+        self.assertEqual(len(self.catalog), 3)
+    
+    def test_case_insensitive_lookup(self):
+        """Test exact-match lookups ignore case."""
+        self.assertEqual(self.catalog.lookup_brand('TOYOTA'), 'Toyota')
+        self.assertEqual(self.catalog.lookup_model('Toyota', 'camry'), 'Camry')
+        self.assertIsNone(self.catalog.lookup_brand('Toyot'))
+        self.assertIsNone(self.catalog.lookup_model('Honda', 'vios'))
+    
+    def test_updates(self):
+        """Test adding entries and changing year ranges."""
+        self.assertTrue(self.catalog.add('Proton', 'X70', 2019, 2025))
+        self.assertFalse(self.catalog.add('Proton', 'X70', 2000, 2001))
+        self.assertEqual(self.catalog.set_year_range('Proton', 'X70', 2018, 2026), (2019, 2025))
+        self.assertIsNone(self.catalog.set_year_range('Proton', 'Saga', 2000, 2025))
+        self.assertEqual(self.catalog.lookup_brand('proton'), 'Proton')
+        self.assertEqual(self.catalog.to_rows()[-1],
+                         {'brand': 'Proton', 'model': 'X70', 'year_start': 2018, 'year_end': 2026})
+
+    def test_remove(self):
+        """Test removing entries, including a brand's last model."""
+        self.assertEqual(self.catalog.remove('Toyota', 'Camry'), (2005, 2025))
+        self.assertIsNone(self.catalog.lookup_model('Toyota', 'camry'))
+        self.assertEqual(self.catalog.remove('Honda', 'Civic'), (2000, 2025))
+        self.assertIsNone(self.catalog.remove('Honda', 'Civic'))
+        self.assertEqual(self.catalog.brands(), ['Toyota'])
+        self.assertIsNone(self.catalog.lookup_brand('honda'))
+        self.assertEqual(len(self.catalog), 1)
+
+    def test_remove_keeps_shared_brand_key(self):
+        """Test removing a brand hands its lowercase key to another brand spelled the same way."""
+        self.catalog.add('HONDA', 'City', 2008, 2025)
+        self.assertEqual(self.catalog.lookup_brand('honda'), 'Honda')
+        self.catalog.remove('Honda', 'Civic')
+        self.assertEqual(self.catalog.lookup_brand('honda'), 'HONDA')
+        self.catalog.remove('HONDA', 'City')
+        self.assertIsNone(self.catalog.lookup_brand('honda'))
+
+    def test_unknown_brand_model_index(self):
+        """Test asking for an unknown brand's models leaves a frozen catalog unchanged."""
+        self.catalog.freeze()
+        indexes = dict(self.catalog._model_indexes)
+        self.assertEqual(self.catalog.model_index('Proton').choices, [])
+        self.assertIs(self.catalog.model_index('Perodua'), self.catalog.model_index('Proton'))
+        self.assertEqual(self.catalog._model_indexes, indexes)
+
+    def test_freeze(self):
+        """Test a frozen catalog rejects changes."""
+        self.catalog.freeze()
+        with self.assertRaises(RuntimeError):
+            self.catalog.add('Proton', 'Saga', 2008, 2025)
+        with self.assertRaises(RuntimeError):
+            self.catalog.set_year_range('Honda', 'Civic', 2001, 2025)
+
+class CatalogFileTestCase(unittest.TestCase):
+    """Writes a small car dataset CSV to a temporary directory."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'car_dataset.csv')
+        self.write(CAR_DATA[:3])
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def write(self, rows):
+        with open(self.path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=['brand', 'model', 'year_start', 'year_end'])
+            writer.writeheader()
+            writer.writerows(rows)
+
+class TestCatalogProvider(CatalogFileTestCase):
+    
+    def test_reload_on_change(self):
+        """Test a changed file is swapped in while old snapshots stay intact."""
+        provider = CatalogProvider(self.path)
+        before = provider.current()
+        self.assertFalse(provider.refresh())
+        self.assertIs(provider.current(), before)
+        
+        self.write(CAR_DATA[:3] + [{'brand': 'Proton', 'model': 'Saga', 'year_start': 2008, 'year_end': 2025}])
+        self.assertTrue(provider.refresh())
+        self.assertIn(('Proton', 'Saga'), provider.current())
+        self.assertNotIn(('Proton', 'Saga'), before)
+        self.assertTrue(provider.current().frozen)
+        self.assertEqual(provider.reloads, 1)
+    
+    def test_failed_reload_keeps_snapshot(self):
+        """Test an unreadable file keeps the previous snapshot."""
+        provider = CatalogProvider(self.path)
+        before = provider.current()
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('brand,model,year_start,year_end\nToyota,Vios,soon,2025\n')
+        self.assertFalse(provider.refresh())
+        self.assertIs(provider.current(), before)
+
+class TestCatalogSnapshot(CatalogFileTestCase):
+    
+    def test_round_trip(self):
+        """Test a compiled snapshot loads into an equivalent frozen catalog."""
+        compile_snapshot(self.path)
+        expected = VehicleCatalog.from_csv(self.path)
+        catalog = load_snapshot(self.path)
+        self.assertTrue(catalog.frozen)
+        self.assertEqual(catalog.to_rows(), expected.to_rows())
+        self.assertEqual(catalog.lookup_model('Toyota', 'VIOS'), 'Vios')
+        self.assertEqual(fuzzy_match('Camri', catalog.model_index('Toyota')),
+                         fuzzy_match('Camri', expected.model_index('Toyota')))
+    
+    def test_stale_snapshot_falls_back_to_csv(self):
+        """Test a snapshot is ignored once the CSV changes."""
+        compile_snapshot(self.path)
+        self.write(CAR_DATA[:3] + [{'brand': 'Proton', 'model': 'Saga', 'year_start': 2008, 'year_end': 2025}])
+        self.assertIsNone(load_snapshot(self.path))
+        catalog = read_catalog(self.path)
+        self.assertIn(('Proton', 'Saga'), catalog)
+        self.assertFalse(catalog.frozen)
+    
+    def test_other_format_version_ignored(self):
+        """Test a snapshot with a different format version is ignored."""
+        snapshot_path = compile_snapshot(self.path)
+        with open(snapshot_path, 'r+b') as file:
+            file.seek(4)
+            file.write(b'\xff\xff')
+        self.assertIsNone(load_snapshot(self.path))
+        self.assertEqual(snapshot_path, snapshot_path_for(self.path))
+
+class TestCatalogJournal(CatalogFileTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.journal = CatalogJournal(self.path)
+    
+    def test_replay_over_base(self):
+        """Test journaled changes are applied on load without touching the CSV."""
+        compile_snapshot(self.path)
+        with open(self.path, 'rb') as file:
+            base = file.read()
+        self.journal.append([
+            {'op': 'add', 'brand': 'Proton', 'model': 'Saga', 'years': [2008, 2025]},
+            {'op': 'set_years', 'brand': 'Toyota', 'model': 'Vios', 'years': [2005, 2025], 'previous': [2010, 2025]},
+        ])
+        catalog = read_catalog(self.path)
+        self.assertIn(('Proton', 'Saga'), catalog)
+        self.assertEqual(catalog.year_range('Toyota', 'Vios'), (2005, 2025))
+        with open(self.path, 'rb') as file:
+            self.assertEqual(file.read(), base)
+        # The snapshot is still current; only the journal changed
+        self.assertIsNotNone(load_snapshot(self.path))
+    
+    def test_provider_reloads_on_append(self):
+        """Test a journal append is picked up like a dataset change."""
+        provider = CatalogProvider(self.path)
+        provider.current()
+        self.journal.append([{'op': 'add', 'brand': 'Proton', 'model': 'Saga', 'years': [2008, 2025]}])
+        self.assertTrue(provider.refresh())
+        self.assertIn(('Proton', 'Saga'), provider.current())
+    
+    def test_torn_record_skipped(self):
+        """Test a partly written final record is ignored and later appends still land."""
+        with open(journal_path_for(self.path), 'w', encoding='utf-8') as file:
+            file.write('{"seq": 1, "time": "2025-01-01T00:00:00", "changes": [{"op": "add"')
+        self.assertEqual(read_catalog(self.path).to_rows(), CAR_DATA[:3])
+        record = self.journal.append([{'op': 'add', 'brand': 'Proton', 'model': 'Saga', 'years': [2008, 2025]}])
+        self.assertEqual(record['seq'], 1)
+        self.assertIn(('Proton', 'Saga'), read_catalog(self.path))
+    
+    def test_compact_and_revert(self):
+        """Test compaction folds the journal into the base and reverts reach past it."""
+        self.journal.append([{'op': 'add', 'brand': 'Proton', 'model': 'Saga', 'years': [2008, 2025]}])
+        as_of = datetime.now()
+        self.journal.append([
+            {'op': 'set_years', 'brand': 'Proton', 'model': 'Saga', 'years': [1985, 2025], 'previous': [2008, 2025]},
+            {'op': 'add', 'brand': 'Perodua', 'model': 'Myvi', 'years': [2005, 2025]},
+        ])
+        catalog = read_catalog(self.path)
+        expected = catalog.to_rows()
+        
+        segment = self.journal.compact(catalog)
+        self.assertTrue(os.path.exists(segment))
+        self.assertEqual(self.journal.pending_changes(), 0)
+        self.assertEqual(VehicleCatalog.from_csv(self.path).to_rows(), expected)
+        
+        catalog = read_catalog(self.path)
+        record = self.journal.revert_to(catalog, as_of)
+        self.assertEqual(record['seq'], 3)
+        self.assertEqual(len(record['changes']), 2)
+        restored = read_catalog(self.path)
+        self.assertEqual(restored.to_rows(), catalog.to_rows())
+        self.assertEqual(restored.year_range('Proton', 'Saga'), (2008, 2025))
+        self.assertNotIn(('Perodua', 'Myvi'), restored)
+        
+        # Reverting to before any journaled change gives back the original base
+        self.journal.revert_to(restored, datetime(2000, 1, 1))
+        self.assertEqual(read_catalog(self.path).to_rows(), CAR_DATA[:3])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from processing.dataset_updater import analyze_validation_results
+from utils.catalog import VehicleCatalog
+
+def make_entry(brand, model, year, errors, valid_year_range=None):
+    return {
+        'input': {'plate': 'ABC 1234', 'brand': brand, 'model': model, 'year': year},
+        'result': {'suggested_brand': brand, 'suggested_model': model,
+                   'valid_year_range': valid_year_range, 'errors': errors},
+    }
+
+class TestAnalyzeValidationResults(unittest.TestCase):
+    
+    def setUp(self):
+        self.catalog = VehicleCatalog([
+            {'brand': 'Proton', 'model': 'Saga', 'year_start': 2000, 'year_end': 2020},
+        ])
+    
+    def test_new_entry_year_span(self):
+        """Test pairs missing from the catalog are suggested with the span of their input years."""
+        results = iter([
+            make_entry('Proton', 'X50', '2021', ['typo_model']),
+            make_entry('Proton', 'X50', '2019', ['typo_model']),
+            make_entry('Proton', 'X50', 'abc', ['typo_model']),
+            make_entry('Proton', 'X50', '2030', []),
+        ])
+        suggestions = analyze_validation_results(results, self.catalog)
+        self.assertEqual(len(suggestions['new_entries']), 1)
+        entry = suggestions['new_entries'][0]
+        self.assertEqual((entry['year_start'], entry['year_end']), (2019, 2021))
+        self.assertEqual(entry['frequency'], 4)
+        self.assertEqual(suggestions['year_range_updates'], [])
+    
+    def test_year_range_updates(self):
+        """Test out-of-range years are aggregated per pair and small overshoots ignored."""
+        results = [
+            make_entry('Proton', 'Saga', '1990', ['invalid_year'], (2000, 2020)),
+            make_entry('Proton', 'Saga', '2024', ['invalid_year'], (2000, 2020)),
+            make_entry('Proton', 'Saga', '2010', [], (2000, 2020)),
+        ]
+        suggestions = analyze_validation_results(results, self.catalog)
+        self.assertEqual(suggestions['new_entries'], [])
+        self.assertEqual(suggestions['year_range_updates'], [{
+            'brand': 'Proton', 'model': 'Saga', 'current_range': (2000, 2020),
+            'suggested_range': (1990, 2024), 'frequency': 2,
+        }])
+        
+        small = [make_entry('Proton', 'Saga', '2021', ['invalid_year'], (2000, 2020))]
+        self.assertEqual(analyze_validation_results(small, self.catalog)['year_range_updates'], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import os
+import sys
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from workflows.full_workflow import run_workflow, revalidate_changed
+from processing.batch_processor import entry_from_row, validate_batch
+
+VALIDATION_DATA_PATH = os.path.join(current_dir, '..', '..', 'data', 'validation_dataset.csv')
+
+class TestFullWorkflow(unittest.TestCase):
+    
+    def test_matches_full_revalidation(self):
+        """Test reusing results for unchanged rows gives the same results as validating every row."""
+        validation_data, corrected_data, original_results, corrected_results = run_workflow(VALIDATION_DATA_PATH)
+        expected = validate_batch([entry_from_row(row) for row in corrected_data])
+        self.assertEqual(corrected_results, expected)
+        self.assertEqual(len(corrected_results), len(validation_data))
+    
+    def test_only_changed_entries_revalidated(self):
+        """Test unchanged entries keep their original result objects."""
+        entries = [
+            {"plate": "ABC 1234", "brand": "Toyota", "model": "Vios", "year": "2021"},
+            {"plate": "ABC 1235", "brand": "Toyot", "model": "Vios", "year": "2021"},
+        ]
+        original_results = validate_batch(entries)
+        corrected = [entries[0], dict(entries[1], brand="Toyota")]
+        results, revalidated = revalidate_changed(entries, corrected, original_results)
+        
+        self.assertEqual(revalidated, 1)
+        self.assertIs(results[0], original_results[0])
+        self.assertEqual(results[1]["input"]["brand"], "Toyota")
+        self.assertNotIn("typo_brand", results[1]["result"]["errors"])
+
+if __name__ == "__main__":
+    unittest.main()
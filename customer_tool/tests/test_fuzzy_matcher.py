@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+import random
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from utils.fuzzy_matcher import (fuzzy_match, FuzzyIndex, max_edit_distance,
+                                  levenshtein_distance, bounded_levenshtein)
+
+def random_word(rng, alphabet='abcdeXYZ', min_len=0, max_len=10):
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(min_len, max_len)))
+
+class TestBoundedLevenshtein(unittest.TestCase):
+    
+    def test_matches_reference_dp(self):
+        """Test the bit-parallel and banded kernels against the reference DP."""
+        rng = random.Random(7)
+        for _ in range(2000):
+            max_len = rng.choice((8, 20, 64, 100))
+            s1 = random_word(rng, 'abcd', max_len=max_len)
+            s2 = random_word(rng, 'abcd', max_len=max_len)
+            expected = levenshtein_distance(s1, s2)
+            self.assertEqual(bounded_levenshtein(s1, s2), expected, (s1, s2))
+            
+            limit = rng.randint(0, 10)
+            bounded = bounded_levenshtein(s1, s2, limit)
+            if expected <= limit:
+                self.assertEqual(bounded, expected, (s1, s2, limit))
+            else:
+                self.assertGreater(bounded, limit, (s1, s2, limit))
+    
+    def test_edge_cases(self):
+        """Test empty, equal and length-mismatched inputs."""
+        self.assertEqual(bounded_levenshtein("", ""), 0)
+        self.assertEqual(bounded_levenshtein("", "abc"), 3)
+        self.assertEqual(bounded_levenshtein("vios", "vios", 0), 0)
+        self.assertEqual(bounded_levenshtein("kitten", "sitting"), 3)
+        self.assertGreater(bounded_levenshtein("a", "abcdef", 2), 2)
+        self.assertEqual(bounded_levenshtein("a" * 70, "a" * 69 + "b", 1), 1)
+
+class TestFuzzyIndex(unittest.TestCase):
+    
+    def test_matches_linear_scan(self):
+        """Test the candidate index returns exactly what a linear scan returns."""
+        rng = random.Random(42)
+        for _ in range(200):
+            choices = [random_word(rng) for _ in range(rng.randint(1, 30))]
+            index = FuzzyIndex(choices)
+            for threshold in (50, 70, 80, 90):
+                for _ in range(5):
+                    if rng.random() < 0.5:
+                        query = random_word(rng, min_len=1)
+                    else:
+                        # Perturb an existing choice, sometimes reversed
+                        query = list(rng.choice(choices) or 'a')
+                        query[rng.randrange(len(query))] = rng.choice('abcXY')
+                        query = ''.join(query)[::rng.choice((1, -1))]
+                    self.assertEqual(index.match(query, threshold),
+                                     fuzzy_match(query, choices, threshold),
+                                     (query, choices, threshold))
+    
+    def test_fuzzy_match_accepts_index(self):
+        """Test fuzzy_match dispatches to an index."""
+        index = FuzzyIndex(["Toyota", "Honda", "Proton"])
+        self.assertEqual(fuzzy_match("Toyot", index), ("Toyota", fuzzy_match("Toyot", list(index))[1]))
+        self.assertEqual(fuzzy_match("notorP", index)[0], "Proton")
+        self.assertEqual(fuzzy_match("", index), (None, 0))
+        self.assertEqual(fuzzy_match("Toyota", FuzzyIndex([])), (None, 0))
+    
+    def test_max_edit_distance(self):
+        """Test the threshold to distance conversion."""
+        self.assertEqual(max_edit_distance(5, 80), 1)
+        self.assertEqual(max_edit_distance(6, 80), 1)
+        self.assertEqual(max_edit_distance(10, 80), 2)
+        self.assertEqual(max_edit_distance(3, 100), 0)
+        self.assertEqual(max_edit_distance(3, 101), -1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+from collections import Counter
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from benchmarks.generate_data import generate_catalog, iter_validation_rows
+from core.plate_validator import validate_plate_format
+from utils.catalog import VehicleCatalog
+
+class TestGenerateData(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog_rows = generate_catalog(50, 8, seed=1)
+
+    def test_deterministic(self):
+        """Test the same seed always gives the same data."""
+        self.assertEqual(generate_catalog(50, 8, seed=1), self.catalog_rows)
+        self.assertEqual(list(iter_validation_rows(self.catalog_rows, 200, seed=2)),
+                         list(iter_validation_rows(self.catalog_rows, 200, seed=2)))
+        self.assertNotEqual(generate_catalog(50, 8, seed=2), self.catalog_rows)
+
+    def test_catalog_shape(self):
+        """Test generated brand/model pairs are unique and year ranges are ordered."""
+        catalog = VehicleCatalog(self.catalog_rows)
+        self.assertEqual(len(catalog), len(self.catalog_rows))
+        self.assertEqual(len(catalog.brands()), 50)
+        for row in self.catalog_rows:
+            self.assertLessEqual(row['year_start'], row['year_end'])
+
+    def test_error_labels(self):
+        """Test rows carry labels that match what was done to them."""
+        catalog = VehicleCatalog(self.catalog_rows)
+        counts = Counter()
+        for row in iter_validation_rows(self.catalog_rows, 2000, seed=3):
+            errors = row['error_type'].split(', ')
+            counts.update(errors)
+            self.assertEqual('typo_brand' in errors, row['user_input_brand'] != row['expected_brand'])
+            self.assertEqual('typo_model' in errors, row['user_input_model'] != row['expected_model'])
+            self.assertEqual('plate_format_error' in errors, not validate_plate_format(row['user_input_plate'])[0])
+            start, end = catalog.year_range(row['expected_brand'], row['expected_model'])
+            self.assertEqual('invalid_year' in errors, not start <= int(row['user_input_year']) <= end)
+
+        for label in ('correct', 'typo_brand', 'typo_model', 'invalid_year', 'plate_format_error'):
+            self.assertGreater(counts[label], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from utils.instrumentation import metrics, Instrumentation, format_report
+from utils.fuzzy_matcher import fuzzy_match, FuzzyIndex
+from utils.catalog import VehicleCatalog
+from core.validator import validate_vehicle, validation_cache
+
+CATALOG_ROWS = [
+    {'brand': 'Proton', 'model': 'Saga', 'year_start': 1985, 'year_end': 2025},
+    {'brand': 'Perodua', 'model': 'Myvi', 'year_start': 2005, 'year_end': 2025},
+]
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_snapshot_and_reset(self):
+        """Test stage durations land in histograms and reset clears them."""
+        instrumentation = Instrumentation()
+        instrumentation.record('stage', 0.000003)
+        instrumentation.record('stage', 0.002)
+        instrumentation.count('calls', 2)
+        snapshot = instrumentation.snapshot()
+
+        stats = snapshot['stages']['stage']
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['buckets'], {'<=5': 1, '<=2000': 1})
+        self.assertEqual(stats['max_us'], 2000.0)
+        self.assertEqual(snapshot['counters'], {'calls': 2})
+        self.assertIn('stage', format_report(snapshot))
+
+        instrumentation.reset()
+        self.assertEqual(instrumentation.snapshot(), {'stages': {}, 'counters': {}})
+
+class TestInstrumentedPaths(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = VehicleCatalog(CATALOG_ROWS)
+        validation_cache.clear()
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled_records_nothing(self):
+        """Test nothing is recorded while instrumentation is off."""
+        validate_vehicle("ABC 1234", "Protn", "Saga", 2010, self.catalog)
+        self.assertEqual(metrics.snapshot(), {'stages': {}, 'counters': {}})
+
+    def test_validate_vehicle_stages(self):
+        """Test validate_vehicle records each stage, including matching on a cache miss."""
+        metrics.enable()
+        validate_vehicle("ABC 1234", "Protn", "Saga", 2010, self.catalog)
+        validate_vehicle("ABC 1234", "Protn", "Saga", 2010, self.catalog)
+        stages = metrics.snapshot()['stages']
+
+        for stage in ('vehicle.logging', 'vehicle.plate', 'vehicle.lookup', 'vehicle.year_check', 'vehicle.total'):
+            self.assertEqual(stages[stage]['count'], 2, stage)
+        # The second call is served from the cache
+        for stage in ('vehicle.brand_match', 'vehicle.model_match', 'vehicle.year_lookup'):
+            self.assertEqual(stages[stage]['count'], 1, stage)
+
+    def test_fuzzy_counters(self):
+        """Test fuzzy_match counts calls, candidates and reversed-string fallbacks."""
+        metrics.enable()
+        brands = ['Proton', 'Perodua', 'Honda']
+        fuzzy_match("notorP", brands)
+        counters = metrics.snapshot()['counters']
+        self.assertEqual(counters['fuzzy.calls'], 1)
+        self.assertEqual(counters['fuzzy.reversed_fallback'], 1)
+        self.assertEqual(counters['fuzzy.candidates'], 2 * len(brands))
+
+        metrics.reset()
+        fuzzy_match("Protn", FuzzyIndex(brands))
+        counters = metrics.snapshot()['counters']
+        self.assertEqual(counters['fuzzy.calls'], 1)
+        self.assertNotIn('fuzzy.reversed_fallback', counters)
+        self.assertLessEqual(counters['fuzzy.candidates'], len(brands))
+
+if __name__ == "__main__":
+    unittest.main()
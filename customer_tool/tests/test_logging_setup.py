@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+import logging
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from utils.logging_setup import RecordSampler
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+class TestRecordSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = ListHandler()
+        self.logger = logging.getLogger('tests.sampled')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.summary_handler = ListHandler()
+        logging.getLogger('utils.logging_setup').addHandler(self.summary_handler)
+        logging.getLogger('utils.logging_setup').setLevel(logging.INFO)
+
+    def tearDown(self):
+        for log_filter in list(self.logger.filters):
+            self.logger.removeFilter(log_filter)
+        self.logger.removeHandler(self.handler)
+        logging.getLogger('utils.logging_setup').removeHandler(self.summary_handler)
+
+    def test_keeps_one_in_n(self):
+        """Test one INFO record in `every` passes and warnings always pass."""
+        sampler = RecordSampler('tests.sampled', 10, summary_interval=3600)
+        self.logger.addFilter(sampler)
+        for i in range(25):
+            self.logger.info("row %d", i)
+        self.logger.warning("bad row")
+        self.assertEqual(self.handler.messages, ["row 0", "row 10", "row 20", "bad row"])
+
+        sampler.summarize()
+        self.assertTrue(self.summary_handler.messages[-1].startswith('tests.sampled: '))
+        self.assertIn("26 records", self.summary_handler.messages[-1])
+        self.assertIn("4 logged, 22 sampled out", self.summary_handler.messages[-1])
+
+    def test_periodic_summary(self):
+        """Test a summary is logged once the interval has passed."""
+        self.logger.addFilter(RecordSampler('tests.sampled', 5, summary_interval=0))
+        self.logger.info("row")
+        self.assertEqual(len(self.summary_handler.messages), 1)
+        self.assertIn("1 records", self.summary_handler.messages[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import time
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from utils.result_cache import ResultCache
+from utils.catalog import VehicleCatalog
+from core.validator import validate_vehicle, validation_cache, normalize_input
+from processing.dataset_updater import apply_updates
+
+class TestResultCache(unittest.TestCase):
+    
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = ResultCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 1)
+    
+    def test_ttl_expiry(self):
+        """Test entries expire after the time-to-live."""
+        cache = ResultCache(ttl=0.01)
+        cache.put('a', 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['expirations'], 1)
+    
+    def test_generation_change_clears(self):
+        """Test a new generation token drops all entries."""
+        cache = ResultCache()
+        cache.check_generation(1)
+        cache.put('a', 1)
+        cache.check_generation(1)
+        self.assertEqual(cache.get('a'), 1)
+        cache.check_generation(2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+class TestValidatorCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.catalog = VehicleCatalog([
+            {'brand': 'Toyota', 'model': 'Vios', 'year_start': 2010, 'year_end': 2025},
+        ])
+        validation_cache.clear()
+        validation_cache.reset_stats()
+    
+    def test_normalized_inputs_share_entry(self):
+        """Test lowercased, whitespace-normalized inputs hit the same entry."""
+        first = validate_vehicle("ABC 1234", "Toyot", "Vios", 2021, catalog=self.catalog)
+        second = validate_vehicle("XYZ 1", "  TOYOT ", "vios", 2021, catalog=self.catalog)
+        self.assertEqual(validation_cache.stats()['hits'], 1)
+        self.assertEqual(first["suggested_brand"], second["suggested_brand"])
+        # Typo flags still compare against the raw input
+        self.assertNotIn("typo_model", first["errors"])
+        self.assertIn("typo_model", second["errors"])
+    
+    def test_normalized_like_catalog_keys(self):
+        """Test inputs are lowercased the way the catalog keys are, not casefolded."""
+        self.assertEqual(normalize_input("  STRAßE   Auto "), "straße auto")
+        self.assertEqual(normalize_input(" VIOS "), "Vios".lower())
+    
+    def test_catalog_update_invalidates(self):
+        """Test apply_updates invalidates cached matches."""
+        result = validate_vehicle("ABC 1234", "Toyota", "Vios", 2005, catalog=self.catalog)
+        self.assertIn("invalid_year", result["errors"])
+        
+        apply_updates(self.catalog, {'year_range_updates': [
+            {'brand': 'Toyota', 'model': 'Vios', 'suggested_range': (2000, 2025)}
+        ]})
+        result = validate_vehicle("ABC 1234", "Toyota", "Vios", 2005, catalog=self.catalog)
+        self.assertNotIn("invalid_year", result["errors"])
+        self.assertEqual(validation_cache.stats()['invalidations'], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from processing.batch_processor import validate_batch, save_results_to_json, save_results_to_binary, export_results
+from processing.data_corrector import correct_row
+from utils.data_loader import iter_results
+from utils.error_codes import ErrorCode, error_mask, error_names, result_mask
+
+ENTRIES = [
+    {"plate": "ABC 1234", "brand": "Toyot", "model": "Vios", "year": "2021"},
+    {"plate": "INVALID", "brand": "Honda", "model": "Civicy", "year": "2001"},
+    {"plate": "XUP 4254", "brand": "notorP", "model": "X70", "year": "2099"},
+    {"plate": "OUG9690", "brand": "Perodua", "model": "Axia", "year": ""},
+    {"plate": "RYL 5036", "brand": "Nissan", "model": "Almera", "year": "abc"},
+    {"plate": "WXY 1", "brand": "Unknown", "model": "Thing", "year": "2020"},
+    {"brand": "Proton", "model": "Saga"},
+] * 20
+
+class TestErrorCodes(unittest.TestCase):
+
+    def test_mask_round_trip(self):
+        """Test every validator result's mask decodes to its errors list."""
+        for entry in validate_batch(ENTRIES):
+            result = entry["result"]
+            self.assertEqual(error_mask(result["errors"]), result["error_mask"])
+            self.assertEqual(error_names(result["error_mask"]), result["errors"])
+
+    def test_unknown_error_rejected(self):
+        """Test an unknown error name raises ValueError."""
+        with self.assertRaises(ValueError):
+            error_mask(["typo_colour"])
+
+    def test_results_without_mask(self):
+        """Test results saved before error masks existed are still corrected."""
+        result = validate_batch(ENTRIES[:1])[0]["result"]
+        legacy = {key: value for key, value in result.items() if key != "error_mask"}
+        self.assertEqual(result_mask(legacy), ErrorCode.TYPO_BRAND)
+        row = {"user_input_brand": "Toyot", "user_input_model": "Vios", "user_input_year": "2021", "error_type": ""}
+        self.assertEqual(correct_row(row, legacy), correct_row(row, result))
+        self.assertEqual(correct_row(row, result)["user_input_brand"], "Toyota")
+
+class TestResultsFile(unittest.TestCase):
+
+    def test_binary_round_trip(self):
+        """Test results read back from a binary file equal the validator's results."""
+        expected = validate_batch(ENTRIES)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'results.bin')
+            total, with_errors = save_results_to_binary(iter(expected), output_path)
+            self.assertEqual(total, len(ENTRIES))
+            self.assertEqual(with_errors, sum(1 for r in expected if r["result"]["errors"]))
+            self.assertEqual(list(iter_results(output_path)), expected)
+            self.assertFalse(os.path.exists(output_path + '.tmp'))
+
+    def test_unusual_inputs_round_trip(self):
+        """Test non-string, non-ASCII, very long and missing inputs read back unchanged."""
+        expected = validate_batch([
+            {"plate": "ABC 1234", "brand": "Toyota", "model": "Vios", "year": 2021},
+            {"plate": "ABC 1234" * 40, "brand": "Peroduá", "model": "Myvi"},
+            {"brand": "Honda", "model": "City", "year": "2019"},
+        ])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'results.bin')
+            save_results_to_binary(expected, output_path)
+            self.assertEqual(list(iter_results(output_path)), expected)
+
+    def test_smaller_than_json(self):
+        """Test a binary results file is a fraction of the size of the JSON file."""
+        results = validate_batch(ENTRIES)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, 'results.json')
+            binary_path = os.path.join(tmp_dir, 'results.bin')
+            save_results_to_json(results, json_path)
+            save_results_to_binary(results, binary_path)
+            self.assertLess(os.path.getsize(binary_path) * 10, os.path.getsize(json_path))
+
+    def test_export_to_json(self):
+        """Test exporting a binary file gives the JSON the validator's results serialize to."""
+        results = validate_batch(ENTRIES)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            binary_path = os.path.join(tmp_dir, 'results.bin')
+            json_path = os.path.join(tmp_dir, 'results.json')
+            save_results_to_binary(results, binary_path)
+            self.assertEqual(export_results(binary_path, json_path)[0], len(results))
+            with open(json_path, encoding='utf-8') as file:
+                self.assertEqual(json.load(file), json.loads(json.dumps(results)))
+
+    def test_not_a_results_file(self):
+        """Test reading a file that is not a binary results file raises ValueError."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'results.bin')
+            with open(path, 'wb') as file:
+                file.write(b'[]' * 20)
+            with self.assertRaises(ValueError):
+                list(iter_results(path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import os
+import sys
+import json
+import asyncio
+import tempfile
+
+# Add src directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.append(src_dir)
+
+from service.validation_service import ValidationService, HttpError, load_vehicle_registry
+from service.request_batcher import RequestBatcher
+from core.validator import validate_car, apply_match, new_result
+
+REGISTRY = {
+    'ABC1234': {
+        'plate': 'ABC 1234',
+        'ownerLast4': '5678',
+        'personal': {'fullName': 'Test Owner'},
+        'car': {'brand': 'Toyota', 'model': 'Vios', 'year': 2019}
+    }
+}
+
+class TestValidationService(unittest.TestCase):
+
+    def setUp(self):
+        self.service = ValidationService(registry=REGISTRY)
+
+    def tearDown(self):
+        self.service.executor.shutdown()
+
+    def call(self, method, target, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        return asyncio.run(self.service.dispatch(method, target, body))[1]
+
+    def test_verify_plate(self):
+        """Test plates are classified as invalid, existing or new."""
+        self.assertEqual(self.call('POST', '/api/verify-plate', {'plate': 'abc 1234'})['status'], 'existing')
+        self.assertEqual(self.call('POST', '/api/verify-plate', {'plate': 'XYZ 999'})['status'], 'new')
+        self.assertEqual(self.call('POST', '/api/verify-plate', {'plate': '!!'})['status'], 'invalid')
+
+    def test_validate_car(self):
+        """Test car validation reports corrections and year ranges."""
+        self.assertTrue(self.call('POST', '/api/validate-car', {'brand': 'Toyota', 'model': 'Vios', 'year': 2019})['ok'])
+
+        response = self.call('POST', '/api/validate-car', {'brand': 'Toyta', 'model': 'Vios', 'year': 2019})
+        self.assertFalse(response['ok'])
+        self.assertEqual(response['corrected'], {'brand': 'Toyota', 'model': 'Vios'})
+
+        response = self.call('POST', '/api/validate-car', {'brand': 'Toyota', 'model': 'Vios', 'year': 1900})
+        self.assertIn('invalid_year', response['errors'])
+
+    def test_brands_and_models(self):
+        """Test brand and model listings come from the catalog."""
+        self.assertIn('Toyota', self.call('GET', '/api/brands'))
+        self.assertIn('Vios', self.call('GET', '/api/models?brand=toyota'))
+
+    def test_confirm_ownership(self):
+        """Test ownership is confirmed only with the right last four digits."""
+        self.assertTrue(self.call('POST', '/api/confirm-ownership', {'plate': 'ABC1234', 'last4': '5678'})['ok'])
+        self.assertFalse(self.call('POST', '/api/confirm-ownership', {'plate': 'ABC1234', 'last4': '0000'})['ok'])
+
+    def test_empty_registry(self):
+        """Test with no registry file every valid plate is new and no ownership is confirmed."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            registry = load_vehicle_registry(os.path.join(tmp_dir, 'vehicle_registry.json'))
+        self.assertEqual(registry, {})
+        self.service.registry = registry
+        self.assertEqual(self.call('POST', '/api/verify-plate', {'plate': 'ABC 1234'})['status'], 'new')
+        self.assertEqual(self.call('POST', '/api/confirm-ownership', {'plate': 'ABC1234', 'last4': '5678'}),
+                         {'ok': False, 'message': 'Record not found.'})
+
+    def test_shipped_registry(self):
+        """Test the shipped registry holds the onboarding frontend's mock vehicles."""
+        registry = load_vehicle_registry()
+        self.assertEqual(sorted(registry), ['BJK1234', 'JWD3000'])
+        self.assertEqual(registry['JWD3000']['ownerLast4'], '4321')
+
+    def test_routing_errors(self):
+        """Test unknown paths, wrong methods and bad bodies raise HTTP errors."""
+        with self.assertRaises(HttpError) as error:
+            self.call('GET', '/api/unknown')
+        self.assertEqual(error.exception.status, 404)
+        with self.assertRaises(HttpError) as error:
+            self.call('GET', '/api/verify-plate')
+        self.assertEqual(error.exception.status, 405)
+        with self.assertRaises(HttpError) as error:
+            asyncio.run(self.service.dispatch('POST', '/api/verify-plate', b'not json'))
+        self.assertEqual(error.exception.status, 400)
+
+    def test_keep_alive_round_trip(self):
+        """Test several requests are served over one connection."""
+        async def scenario():
+            ready = asyncio.get_running_loop().create_future()
+            server = asyncio.create_task(self.service.serve('127.0.0.1', 0, ready=ready))
+            reader, writer = await asyncio.open_connection('127.0.0.1', await ready)
+
+            statuses = []
+            for _ in range(3):
+                writer.write(b"GET /api/health HTTP/1.1\r\nHost: test\r\n\r\n")
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+                body = json.loads(await reader.readexactly(length))
+                statuses.append((head.split(b' ')[1], body['status']))
+
+            writer.close()
+            server.cancel()
+            return statuses
+
+        self.assertEqual(asyncio.run(scenario()), [(b'200', 'healthy')] * 3)
+
+class TestRequestBatcher(unittest.TestCase):
+
+    def test_coalesces_and_deduplicates(self):
+        """Test concurrent lookups share one batch and identical queries are matched once."""
+        queries = [('Toyta', 'Vios'), ('toyta', ' vios'), ('Honda', 'Civc'), ('Toyta', 'Vios')]
+
+        async def scenario():
+            batcher = RequestBatcher(executor=None, window_ms=50, max_size=64)
+            matches = await asyncio.gather(*(batcher.lookup(brand, model) for brand, model in queries))
+            return batcher.stats(), matches
+
+        stats, matches = asyncio.run(scenario())
+        self.assertEqual(stats['batches'], 1)
+        self.assertEqual(stats['deduplicated'], 2)
+        for (brand, model), match in zip(queries, matches):
+            self.assertEqual(apply_match(new_result(None, brand, model, 2019), match),
+                             validate_car(brand, model, 2019))
+
+    def test_max_size_flushes_early(self):
+        """Test a full batch is flushed without waiting for the window."""
+        async def scenario():
+            batcher = RequestBatcher(executor=None, window_ms=10000, max_size=2)
+            await asyncio.wait_for(asyncio.gather(batcher.lookup('Toyota', 'Vios'),
+                                                  batcher.lookup('Honda', 'City')), 5)
+            return batcher.stats()
+
+        self.assertEqual(asyncio.run(scenario())['batches'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
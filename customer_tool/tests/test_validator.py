@@ -45,7 +45,8 @@ class TestVehicleValidator(unittest.TestCase):
         self.assertIn("plate_format_error", result["errors"])
 
 def main():
-    unittest.main()
+    # Ignore the caller's command line (e.g. main.py --mode test)
+    unittest.main(module=__name__, argv=sys.argv[:1])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,227 @@
+import os
+import sys
+import csv
+import json
+import glob
+import logging
+from datetime import datetime
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+logger = logging.getLogger(__name__)
+
+# The car dataset CSV is a base; changes made since it was written live in an
+# append-only journal next to it (car_dataset.journal), one JSON record per
+# line, each holding the changes of one update run:
+#
+#   {"seq": 7, "time": "2025-01-31T10:00:00", "changes": [
+#       {"op": "add", "brand": "Proton", "model": "S70", "years": [2023, 2025]},
+#       {"op": "set_years", "brand": "Proton", "model": "Saga", "years": [1985, 2025], "previous": [1985, 2024]}]}
+#
+# Readers replay the journal over the base. Compaction writes a new base and
+# moves the journal aside as an archived segment (car_dataset.journal.000007,
+# named after its last seq). Every change records what it replaced, so the
+# archived segments plus the live journal are enough to roll the catalog back
+# to any earlier point without keeping full copies of it. Replaying a change
+# twice has no further effect, so a crash between writing a new base and
+# archiving the journal is harmless.
+CAR_FIELDS = ['brand', 'model', 'year_start', 'year_end']
+
+def journal_path_for(car_data_path):
+    """Return the journal path that goes with a car dataset CSV."""
+    return os.path.splitext(car_data_path)[0] + '.journal'
+
+def read_records(journal_path):
+    """
+    Yield the records of a journal file in order.
+
+    A final line cut short by a crash mid-append is skipped, so a partly
+    written update run is never half-applied.
+    """
+    try:
+        file = open(journal_path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable record at {journal_path}:{number}")
+                continue
+            yield record
+
+def apply_change(catalog, change):
+    """
+    Apply one journal change to a catalog.
+
+    Returns:
+        bool: True if the catalog changed
+    """
+    op = change['op']
+    if op == 'add':
+        return catalog.add(change['brand'], change['model'], *change['years'])
+    if op == 'set_years':
+        start, end = change['years']
+        previous = catalog.set_year_range(change['brand'], change['model'], start, end)
+        return previous is not None and tuple(previous) != (start, end)
+    if op == 'remove':
+        return catalog.remove(change['brand'], change['model']) is not None
+    raise ValueError(f"Unknown catalog change: {op}")
+
+def invert_change(change):
+    """Return the change that undoes `change`."""
+    op = change['op']
+    brand, model = change['brand'], change['model']
+    if op == 'add':
+        return {'op': 'remove', 'brand': brand, 'model': model, 'previous': change['years']}
+    if op == 'remove':
+        return {'op': 'add', 'brand': brand, 'model': model, 'years': change['previous']}
+    if op == 'set_years':
+        return {'op': 'set_years', 'brand': brand, 'model': model,
+                'years': change['previous'], 'previous': change['years']}
+    raise ValueError(f"Unknown catalog change: {op}")
+
+def write_catalog_csv(catalog, car_data_path):
+    """Write a catalog as a car dataset CSV through a temporary file and an atomic rename."""
+    temp_path = f"{car_data_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CAR_FIELDS)
+        writer.writeheader()
+        writer.writerows(catalog.to_rows())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, car_data_path)
+
+class CatalogJournal:
+    """Append-only change journal for a car dataset CSV."""
+
+    def __init__(self, car_data_path):
+        self.car_data_path = car_data_path
+        self.path = journal_path_for(car_data_path)
+
+    def segments(self):
+        """Return archived journal segments, oldest first."""
+        return sorted(glob.glob(glob.escape(self.path) + '.*[0-9]'))
+
+    def records(self):
+        """Return the records of the live journal, which readers replay over the base."""
+        return list(read_records(self.path))
+
+    def history(self):
+        """Yield every record, archived segments first, in seq order."""
+        for segment in self.segments():
+            yield from read_records(segment)
+        yield from read_records(self.path)
+
+    def pending_changes(self):
+        """Return how many changes the live journal holds on top of the base."""
+        return sum(len(record['changes']) for record in read_records(self.path))
+
+    def _last_seq(self):
+        last = None
+        for record in read_records(self.path):
+            last = record['seq']
+        if last is None:
+            segments = self.segments()
+            last = int(segments[-1].rsplit('.', 1)[1]) if segments else 0
+        return last
+
+    def append(self, changes, **fields):
+        """
+        Append one record holding `changes` and flush it to disk.
+
+        The record is written with a single write call; extra keyword
+        arguments are stored on the record.
+
+        Returns:
+            dict: The record, or None when there were no changes
+        """
+        if not changes:
+            return None
+        record = dict(fields, seq=self._last_seq() + 1, time=datetime.now().isoformat(), changes=changes)
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with open(self.path, 'ab') as file:
+            # Start on a fresh line if an earlier append was cut short
+            if file.tell() and not self._ends_with_newline():
+                line = '\n' + line
+            file.write(line.encode('utf-8'))
+            file.flush()
+            os.fsync(file.fileno())
+        return record
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b'\n'
+
+    def replay(self, catalog):
+        """
+        Apply the live journal to a catalog loaded from the base.
+
+        Returns:
+            int: Number of changes applied
+        """
+        applied = 0
+        for record in read_records(self.path):
+            for change in record['changes']:
+                applied += apply_change(catalog, change)
+        return applied
+
+    def compact(self, catalog):
+        """
+        Fold the live journal into a new base.
+
+        `catalog` must be the base with the journal replayed (as read_catalog
+        returns it). The new base replaces the CSV atomically, then the
+        journal is archived as a segment, which keeps it available for
+        revert_to.
+
+        Returns:
+            str: Path of the archived segment, or None if the journal was empty
+        """
+        records = self.records()
+        if not records:
+            return None
+        write_catalog_csv(catalog, self.car_data_path)
+        segment_path = f"{self.path}.{records[-1]['seq']:06d}"
+        os.replace(self.path, segment_path)
+        logger.info(f"Compacted {sum(len(r['changes']) for r in records)} journaled changes into {self.car_data_path}")
+        return segment_path
+
+    def revert_to(self, catalog, as_of):
+        """
+        Roll a catalog back to its state at a point in time.
+
+        Every change recorded after `as_of` is undone, newest first, on the
+        catalog and journaled as one new record, so the revert can itself be
+        reverted.
+
+        Args:
+            catalog (VehicleCatalog): The current catalog (base plus journal)
+            as_of (datetime): Point in time to restore
+
+        Returns:
+            dict: The journal record of the undo changes, or None if nothing changed after as_of
+        """
+        later = [record for record in self.history() if datetime.fromisoformat(record['time']) > as_of]
+        undo = [invert_change(change) for record in reversed(later) for change in reversed(record['changes'])]
+        for change in undo:
+            apply_change(catalog, change)
+        return self.append(undo, reverted_to=as_of.isoformat())
+
+if __name__ == "__main__":
+    # Show the journal of the configured car dataset
+    from config.settings import CAR_DATA_PATH
+
+    journal = CatalogJournal(CAR_DATA_PATH)
+    print(f"Archived segments: {len(journal.segments())}")
+    for record in journal.history():
+        print(f"#{record['seq']} {record['time']}: {len(record['changes'])} changes")
@@ -0,0 +1,161 @@
+import os
+import sys
+import logging
+import threading
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from utils.catalog import VehicleCatalog
+from utils.catalog_snapshot import read_catalog
+from utils.catalog_journal import journal_path_for
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the car dataset's mtime and size
+try:
+    from config.settings import CATALOG_POLL_INTERVAL
+except ImportError:
+    CATALOG_POLL_INTERVAL = 2.0
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+def file_signature(path):
+    """Return (mtime_ns, size) for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def catalog_signature(path):
+    """Return file signatures of a car dataset and its change journal."""
+    return file_signature(path), file_signature(journal_path_for(path))
+
+class CatalogProvider:
+    """
+    Hands out the current VehicleCatalog snapshot for a car dataset file.
+
+    Snapshots are frozen and never change. When the mtime or size of the
+    file or its change journal changes, a new snapshot is built off to the side and swapped in with a
+    single reference assignment, so a caller that took a snapshot keeps
+    validating against it while new callers see the update. With start(),
+    a daemon thread does the polling; current() itself never touches the
+    file system once the first snapshot is loaded.
+    """
+
+    def __init__(self, path, loader=None, poll_interval=CATALOG_POLL_INTERVAL):
+        """
+        Initialize the provider.
+
+        Args:
+            path (str): Path to the car dataset CSV
+            loader (callable): Builds a VehicleCatalog from a path; defaults to read_catalog,
+                which prefers a current binary snapshot over the CSV
+            poll_interval (float): Seconds between file checks while watching
+        """
+        self.path = path
+        self.loader = loader or read_catalog
+        self.poll_interval = poll_interval
+        self._snapshot = None
+        self._signature = None
+        self._build_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.reloads = 0
+
+    def current(self):
+        """Return the current catalog snapshot, loading the first one if needed."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    def refresh(self, force=False):
+        """
+        Rebuild the snapshot if the file changed since it was built.
+
+        A failed rebuild keeps the previous snapshot (or an empty catalog if
+        there is none yet).
+
+        Returns:
+            bool: True if a new snapshot was swapped in
+        """
+        with self._build_lock:
+            signature = catalog_signature(self.path)
+            if not force and self._snapshot is not None and signature == self._signature:
+                return False
+
+            try:
+                snapshot = self.loader(self.path).freeze()
+            except Exception as e:
+                logger.error(f"Error loading car data from {self.path}: {e}")
+                if self._snapshot is not None:
+                    return False
+                snapshot = VehicleCatalog().freeze()
+
+            if self._snapshot is not None:
+                self.reloads += 1
+                logger.info(f"Car catalog reloaded from {self.path}: {len(snapshot)} models")
+            self._signature = signature
+            self._snapshot = snapshot
+            return True
+
+    def start(self):
+        """Start watching the file from a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self.current()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name='catalog-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop watching the file."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def watching(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Catalog watcher error: {e}")
+
+def get_provider(path, watch=False):
+    """
+    Return the process-wide provider for a car dataset path.
+
+    Args:
+        path (str): Path to the car dataset CSV
+        watch (bool): Start the background watcher if it is not running
+    """
+    key = os.path.abspath(path)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = _providers[key] = CatalogProvider(path)
+    if watch:
+        provider.start()
+    return provider
+
+if __name__ == "__main__":
+    # Test the provider
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    car_data_path = os.path.join(current_dir, '..', '..', 'data', 'car_dataset.csv')
+
+    provider = get_provider(car_data_path)
+    print(f"Catalog: {len(provider.current())} models, reloaded: {provider.refresh()}")
@@ -0,0 +1,142 @@
+import os
+import sys
+import mmap
+import struct
+import marshal
+import logging
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from utils.catalog import VehicleCatalog
+from utils.catalog_journal import CatalogJournal
+
+logger = logging.getLogger(__name__)
+
+# Snapshot layout: a fixed header, a marshal-encoded directory (brand list,
+# brand keys, brand fuzzy index, and the offset/length of every brand's
+# section), then one marshal-encoded section per brand (models, model keys,
+# model fuzzy index). The file is memory-mapped and a brand's section is only
+# decoded when that brand is first used, so loading costs the same whether a
+# brand has ten models or ten thousand.
+#
+# The header records the size and mtime of the CSV the snapshot was compiled
+# from; a snapshot whose source no longer matches is stale and ignored.
+# Bump SNAPSHOT_VERSION whenever the layout or VehicleCatalog.to_state() changes.
+SNAPSHOT_MAGIC = b'VCAT'
+SNAPSHOT_VERSION = 1
+# magic, format version, marshal version, source mtime_ns, source size, directory length
+_HEADER = struct.Struct('<4sHHqqq')
+
+def snapshot_path_for(car_data_path):
+    """Return the snapshot path that goes with a car dataset CSV."""
+    return os.path.splitext(car_data_path)[0] + '.catalog'
+
+def _source_signature(car_data_path):
+    stat = os.stat(car_data_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def compile_snapshot(car_data_path, snapshot_path=None):
+    """
+    Compile a car dataset CSV into a binary catalog snapshot.
+
+    The file is written to a temporary name and renamed into place, so a
+    concurrent reader never sees a partial snapshot.
+
+    Returns:
+        str: Path of the written snapshot
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(car_data_path)
+    mtime_ns, size = _source_signature(car_data_path)
+    catalog = VehicleCatalog.from_csv(car_data_path)
+    state = catalog.to_state()
+
+    blobs = [marshal.dumps(section) for section in state['sections'].values()]
+    # Section offsets are relative to the end of the directory
+    offsets = {}
+    position = 0
+    for brand, blob in zip(state['sections'], blobs):
+        offsets[brand] = (position, len(blob))
+        position += len(blob)
+    directory = marshal.dumps(dict(state, sections=offsets))
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, marshal.version, mtime_ns, size, len(directory))
+    temp_path = f"{snapshot_path}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(header)
+        file.write(directory)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temp_path, snapshot_path)
+
+    logger.info(f"Catalog snapshot written to {snapshot_path} ({len(catalog)} models)")
+    return snapshot_path
+
+def load_snapshot(car_data_path, snapshot_path=None, frozen=True):
+    """
+    Load the catalog snapshot for a car dataset CSV.
+
+    Returns:
+        VehicleCatalog: The catalog (frozen unless frozen=False), or None if
+        the snapshot is missing, from another format version, or stale with
+        respect to the CSV
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(car_data_path)
+    try:
+        signature = _source_signature(car_data_path)
+        with open(snapshot_path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # ValueError: an empty file cannot be mapped
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, marshal_version, mtime_ns, size, directory_length = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or marshal_version != marshal.version:
+        logger.info(f"Ignoring catalog snapshot {snapshot_path}: format version differs")
+        return None
+    if (mtime_ns, size) != signature:
+        logger.info(f"Ignoring catalog snapshot {snapshot_path}: {car_data_path} has changed since it was compiled")
+        return None
+
+    sections_start = _HEADER.size + directory_length
+    try:
+        state = marshal.loads(data[_HEADER.size:sections_start])
+    except (EOFError, ValueError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable catalog snapshot {snapshot_path}: {e}")
+        return None
+
+    def load_section(token):
+        offset, length = token
+        start = sections_start + offset
+        return marshal.loads(data[start:start + length])
+
+    # The map stays open for as long as the catalog can still unpack brands
+    return VehicleCatalog.from_state(state, load_section, frozen=frozen)
+
+def read_catalog(car_data_path):
+    """
+    Load the current catalog: the base from its snapshot when current,
+    otherwise from the CSV, with the change journal replayed on top.
+    The result is not frozen.
+    """
+    catalog = load_snapshot(car_data_path, frozen=False)
+    if catalog is not None:
+        logger.info(f"Car catalog loaded from snapshot: {len(catalog)} models")
+    else:
+        catalog = VehicleCatalog.from_csv(car_data_path)
+    applied = CatalogJournal(car_data_path).replay(catalog)
+    if applied:
+        logger.info(f"Applied {applied} journaled catalog changes")
+    return catalog
+
+if __name__ == "__main__":
+    # Compile the snapshot for the configured car dataset
+    from config.settings import CAR_DATA_PATH
+
+    print(f"Snapshot written to {compile_snapshot(CAR_DATA_PATH)}")
@@ -1,6 +1,7 @@
 import os
 import sys
 import csv
+import json
 import logging
 
 # Add the parent directory to sys.path when run directly
@@ -10,6 +11,8 @@ if __name__ == "__main__":
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
 
+from utils.results_file import iter_binary_results
+
 logger = logging.getLogger(__name__)
 
 def load_csv_data(file_path):
@@ -49,6 +52,32 @@ def load_car_data(car_data_path):
         car['year_end'] = int(car['year_end'])
     return car_data
 
+def iter_csv_rows(file_path):
+    """
+    Yield CSV rows one at a time as dictionaries.
+    Unlike load_csv_data, memory use does not grow with the file size.
+    """
+    with open(file_path, 'r', encoding='utf-8', newline='') as file:
+        yield from csv.DictReader(file)
+
+def iter_results(results_path):
+    """
+    Yield validation result entries ({"input": ..., "result": ...}) one at a time.
+    Binary results files (.bin) and NDJSON files (.ndjson/.jsonl, one object
+    per line) are read lazily; a legacy JSON array file is loaded whole and
+    then iterated.
+    """
+    if results_path.endswith('.bin'):
+        yield from iter_binary_results(results_path)
+    elif results_path.endswith(('.ndjson', '.jsonl')):
+        with open(results_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(results_path, 'r', encoding='utf-8') as file:
+            yield from json.load(file)
+
 if __name__ == "__main__":
     # Test the functions
     print("Testing data_loader functions:")
@@ -0,0 +1,68 @@
+import os
+import sys
+from enum import IntFlag
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+class ErrorCode(IntFlag):
+    """
+    Validation errors as bits of one integer mask.
+
+    Bits follow the order validate_vehicle finds the errors in (plate, then
+    brand, model and year), so error_names() gives back the same list the
+    validator builds. The values are written to binary results files; never
+    renumber them.
+    """
+    PLATE_FORMAT_ERROR = 1
+    TYPO_BRAND = 2
+    INVALID_BRAND = 4
+    TYPO_MODEL = 8
+    INVALID_MODEL = 16
+    INVALID_YEAR = 32
+
+# Plain int copies for masks built and tested per record; operators on
+# IntFlag members run Python code and are much slower than int operators
+PLATE_FORMAT_ERROR = ErrorCode.PLATE_FORMAT_ERROR.value
+TYPO_BRAND = ErrorCode.TYPO_BRAND.value
+INVALID_BRAND = ErrorCode.INVALID_BRAND.value
+TYPO_MODEL = ErrorCode.TYPO_MODEL.value
+INVALID_MODEL = ErrorCode.INVALID_MODEL.value
+INVALID_YEAR = ErrorCode.INVALID_YEAR.value
+
+# Error name used in result dicts and reports -> code
+ERROR_CODES = {code.name.lower(): code.value for code in ErrorCode}
+
+# Name lists for every possible mask, so decoding is a list lookup
+_NAMES_BY_MASK = [tuple(name for name, code in ERROR_CODES.items() if mask & code)
+                  for mask in range(1 << len(ERROR_CODES))]
+
+def error_mask(errors):
+    """
+    Return the mask for a list of error names.
+
+    Raises:
+        ValueError: If a name is not a known error
+    """
+    mask = 0
+    for name in errors:
+        try:
+            mask |= ERROR_CODES[name]
+        except KeyError:
+            raise ValueError(f"Unknown validation error: {name}") from None
+    return mask
+
+def error_names(mask):
+    """Return the error names set in a mask, in validation order."""
+    return list(_NAMES_BY_MASK[mask])
+
+def result_mask(result):
+    """Return the error mask of a validation result, computing it for results without one."""
+    mask = result.get('error_mask')
+    if mask is None:
+        mask = error_mask(result.get('errors', ()))
+    return mask
@@ -9,9 +9,12 @@ if __name__ == "__main__":
         sys.path.insert(0, parent_dir)
 
 import re
+from collections import Counter
 from functools import lru_cache
 import logging
 
+from utils.instrumentation import metrics
+
 logger = logging.getLogger(__name__)
 
 # Try to import configuration, use defaults if not available
@@ -48,16 +51,302 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     
     return previous_row[-1]
 
+def _myers_distance(pattern: str, text: str, max_distance: int) -> int:
+    """
+    Myers/Hyyrö bit-parallel edit distance. The pattern is packed into a
+    Python int bit-vector (one bit per character), so each text character
+    costs a handful of integer operations instead of a DP row.
+    
+    Ukkonen's cutoff is kept alongside: y is the last row of the current
+    column whose value dy is within max_distance. It moves down at most one
+    row per column and is walked back up with the vertical deltas, so the
+    scan stops as soon as no cell of the column is within the limit, as in
+    _banded_distance.
+    """
+    peq = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    
+    mask = (1 << len(pattern)) - 1
+    last = 1 << (len(pattern) - 1)
+    pv = mask
+    mv = 0
+    score = len(pattern)
+    remaining = len(text)
+    # In the first column (0..m), y is min(max_distance, m) and so is dy;
+    # ybit = 1 << y is the bit of row y + 1's vertical delta
+    dy = min(max_distance, len(pattern))
+    ybit = 1 << dy
+    
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        
+        # Horizontal delta at the cutoff row; row 0 always grows by one
+        hbit = ybit >> 1
+        if not hbit or ph & hbit:
+            dy += 1
+        elif mh & hbit:
+            dy -= 1
+        
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+        
+        # The last row within the limit moves down at most one row per column
+        if ybit <= last:
+            below = dy + 1 if pv & ybit else dy - 1 if mv & ybit else dy
+            if below <= max_distance:
+                ybit <<= 1
+                dy = below
+        while dy > max_distance:
+            ybit >>= 1
+            if not ybit:
+                return max_distance + 1  # no cell of the column is within the limit
+            dy -= 1 if pv & ybit else -1 if mv & ybit else 0
+        
+        # Each remaining text character can lower the score by at most one
+        remaining -= 1
+        if score - remaining > max_distance:
+            return max_distance + 1
+    
+    return score
+
+def _banded_distance(s1: str, s2: str, max_distance: int) -> int:
+    """
+    Ukkonen-banded DP for strings too long for the bit-parallel kernel.
+    Only cells within max_distance of the diagonal are computed, and the
+    scan stops once a whole band row exceeds the limit.
+    """
+    over = max_distance + 1
+    len2 = len(s2)
+    previous_row = [j if j <= max_distance else over for j in range(len2 + 1)]
+    
+    for i, c1 in enumerate(s1, 1):
+        current_row = [over] * (len2 + 1)
+        current_row[0] = i if i <= max_distance else over
+        row_min = current_row[0]
+        
+        for j in range(max(1, i - max_distance), min(len2, i + max_distance) + 1):
+            cost = min(previous_row[j] + 1,
+                       current_row[j - 1] + 1,
+                       previous_row[j - 1] + (c1 != s2[j - 1]))
+            current_row[j] = cost if cost < over else over
+            if cost < row_min:
+                row_min = cost
+        
+        if row_min > max_distance:
+            return over
+        previous_row = current_row
+    
+    return previous_row[-1]
+
+def bounded_levenshtein(s1: str, s2: str, max_distance: int = None) -> int:
+    """
+    Levenshtein distance with an optional cutoff.
+    
+    Returns the exact distance when it is <= max_distance, otherwise some
+    value > max_distance (the computation stops as soon as the limit can no
+    longer be met). Strings up to 64 characters use the bit-parallel kernel.
+    levenshtein_distance remains the reference implementation.
+    """
+    if s1 == s2:
+        return 0
+    
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+    
+    if max_distance is None:
+        max_distance = len(s2)
+    
+    if len(s2) - len(s1) > max_distance:
+        return max_distance + 1
+    
+    if not s1:
+        return len(s2)
+    
+    if len(s1) <= 64:
+        return _myers_distance(s1, s2, max_distance)
+    if max_distance >= len(s2):
+        # The band would cover the whole matrix; the plain DP is cheaper
+        return levenshtein_distance.__wrapped__(s1, s2)
+    return _banded_distance(s1, s2, max_distance)
+
+@lru_cache(maxsize=None)
+def max_edit_distance(max_len: int, threshold: float) -> int:
+    """
+    Largest edit distance that still gives a similarity >= threshold for
+    strings whose longer side has max_len characters. Returns -1 when not
+    even an exact match would qualify.
+    """
+    if max_len == 0:
+        return 0 if threshold <= 100 else -1
+    
+    # Walk up with the same float expression fuzzy_match scores with, so the
+    # bound agrees with it exactly at the boundary.
+    distance = -1
+    while distance < max_len and (1 - (distance + 1) / max_len) * 100 >= threshold:
+        distance += 1
+    return distance
+
+def _bigrams(text: str) -> Counter:
+    """Padded character bigrams of an already lowercased string."""
+    padded = f"\x02{text}\x03"
+    return Counter(padded[i:i + 2] for i in range(len(padded) - 1))
+
+class FuzzyIndex:
+    """
+    Persistent candidate index over a fixed choice list.
+    
+    Choices are bucketed by length, and each bucket keeps a bigram inverted
+    index. For a query, the similarity threshold is turned into a maximum
+    edit distance per bucket; buckets whose length difference already
+    exceeds it are skipped, and the remaining choices must share enough
+    bigrams with the query (q-gram count filter) before a Levenshtein
+    distance is computed. Results are identical to a linear scan of the
+    same choice list.
+    """
+    
+    def __init__(self, choices):
+        self.choices = list(choices)
+        self._lowered = [choice.lower() for choice in self.choices]
+        self._buckets = {}   # length -> [choice ids]
+        self._postings = {}  # length -> {bigram: [(choice id, count)]}
+        
+        for choice_id, choice in enumerate(self.choices):
+            length = len(choice)
+            self._buckets.setdefault(length, []).append(choice_id)
+            postings = self._postings.setdefault(length, {})
+            for gram, count in _bigrams(self._lowered[choice_id]).items():
+                postings.setdefault(gram, []).append((choice_id, count))
+    
+    def to_state(self) -> tuple:
+        """Return the index as plain containers, e.g. for a marshal snapshot."""
+        return self.choices, self._lowered, self._buckets, self._postings
+    
+    @classmethod
+    def from_state(cls, state: tuple) -> "FuzzyIndex":
+        """Rebuild an index from to_state() output without re-indexing."""
+        index = cls.__new__(cls)
+        index.choices, index._lowered, index._buckets, index._postings = state
+        return index
+    
+    def __len__(self):
+        return len(self.choices)
+    
+    def __iter__(self):
+        return iter(self.choices)
+    
+    def candidates(self, query_lower: str, threshold: float) -> list:
+        """
+        Return the ids, in choice order, of choices that may still reach
+        the threshold against query_lower.
+        """
+        query_len = len(query_lower)
+        query_grams = None
+        candidate_ids = []
+        
+        for length, bucket in self._buckets.items():
+            limit = max_edit_distance(max(query_len, length), threshold)
+            if limit < abs(query_len - length):
+                continue
+            
+            # Two strings within `limit` edits share at least this many
+            # padded bigrams; at or below zero the filter cannot prune.
+            required = max(query_len, length) + 1 - 2 * limit
+            if required <= 0:
+                candidate_ids.extend(bucket)
+                continue
+            
+            if query_grams is None:
+                query_grams = _bigrams(query_lower)
+            postings = self._postings[length]
+            shared = Counter()
+            for gram, query_count in query_grams.items():
+                for choice_id, count in postings.get(gram, ()):
+                    shared[choice_id] += min(query_count, count)
+            candidate_ids.extend(choice_id for choice_id, common in shared.items() if common >= required)
+        
+        candidate_ids.sort()
+        return candidate_ids
+    
+    def _best(self, query_lower: str, query_len: int, threshold: float) -> tuple:
+        best_match = None
+        best_score = 0
+        candidate_ids = self.candidates(query_lower, threshold)
+        if metrics.enabled:
+            metrics.count('fuzzy.candidates', len(candidate_ids))
+        
+        for choice_id in candidate_ids:
+            choice = self.choices[choice_id]
+            max_len = max(query_len, len(choice))
+            limit = max_edit_distance(max_len, threshold)
+            distance = bounded_levenshtein(query_lower, self._lowered[choice_id], limit)
+            if distance > limit:
+                continue
+            similarity = (1 - distance / max_len) * 100 if max_len > 0 else 100
+            
+            if similarity >= threshold and similarity > best_score:
+                best_match = choice
+                best_score = similarity
+                
+                # Early termination if we find a perfect match
+                if similarity == 100:
+                    break
+        
+        return best_match, best_score
+    
+    def match(self, query: str, threshold: int = None) -> tuple:
+        """
+        Match user input to the closest indexed choice, trying the reversed
+        input when the plain one has no match.
+        """
+        if threshold is None:
+            threshold = FUZZY_MATCH_THRESHOLD
+        
+        if not query or not self.choices:
+            return None, 0
+        
+        if metrics.enabled:
+            metrics.count('fuzzy.calls')
+        best_match, best_score = self._best(query.lower(), len(query), threshold)
+        
+        if best_match is None:
+            if metrics.enabled:
+                metrics.count('fuzzy.reversed_fallback')
+            best_match, best_score = self._best(query[::-1].lower(), len(query), threshold)
+        
+        return best_match, best_score
+
 def fuzzy_match(query: str, choices: list, threshold: int = None) -> tuple:
     """
     Match user input to closest valid choice using Levenshtein distance.
+    
+    choices may be a plain list, which is scanned linearly, or a FuzzyIndex
+    built once over the choice set, which only scores viable candidates.
     """
+    if isinstance(choices, FuzzyIndex):
+        return choices.match(query, threshold)
+    
     if threshold is None:
         threshold = FUZZY_MATCH_THRESHOLD
         
     if not query or not choices:
         return None, 0
     
+    if metrics.enabled:
+        metrics.count('fuzzy.calls')
+        metrics.count('fuzzy.candidates', len(choices))
+    
     query_lower = query.lower()
     best_match = None
     best_score = 0
@@ -65,8 +354,11 @@ def fuzzy_match(query: str, choices: list, threshold: int = None) -> tuple:
     # Try normal matching first
     for choice in choices:
         choice_lower = choice.lower()
-        distance = levenshtein_distance(query_lower, choice_lower)
         max_len = max(len(query), len(choice))
+        limit = max_edit_distance(max_len, threshold)
+        distance = bounded_levenshtein(query_lower, choice_lower, limit)
+        if distance > limit:
+            continue
         similarity = (1 - distance / max_len) * 100 if max_len > 0 else 100
         
         if similarity >= threshold and similarity > best_score:
@@ -79,12 +371,18 @@ def fuzzy_match(query: str, choices: list, threshold: int = None) -> tuple:
     
     # If no good match found, try reversed string
     if best_match is None:
+        if metrics.enabled:
+            metrics.count('fuzzy.reversed_fallback')
+            metrics.count('fuzzy.candidates', len(choices))
         reversed_query = query[::-1].lower()
         
         for choice in choices:
             choice_lower = choice.lower()
-            distance = levenshtein_distance(reversed_query, choice_lower)
             max_len = max(len(reversed_query), len(choice))
+            limit = max_edit_distance(max_len, threshold)
+            distance = bounded_levenshtein(reversed_query, choice_lower, limit)
+            if distance > limit:
+                continue
             similarity = (1 - distance / max_len) * 100 if max_len > 0 else 100
             
             if similarity >= threshold and similarity > best_score:
@@ -100,4 +398,5 @@ def fuzzy_match(query: str, choices: list, threshold: int = None) -> tuple:
 if __name__ == "__main__":
     # Test the function
     print("Testing fuzzy_match function:")
-    print(fuzzy_match("Toyota", ["Toyota", "Honda", "Proton"]))
\ No newline at end of file
+    print(fuzzy_match("Toyota", ["Toyota", "Honda", "Proton"]))
+    print(fuzzy_match("notorP", FuzzyIndex(["Toyota", "Honda", "Proton"])))
\ No newline at end of file
@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing.util import Finalize, register_after_fork
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from config.settings import (LOG_LEVEL, LOG_FILE, LOG_ASYNC, LOG_SAMPLE_EVERY,
+                             LOG_SUMMARY_INTERVAL, LOG_SAMPLED_LOGGERS)
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+logger = logging.getLogger(__name__)
+
+# The background writer, when async logging is configured
+_listener = None
+_samplers = []
+
+class RecordSampler(logging.Filter):
+    """
+    Keep one in `every` INFO/DEBUG records of a per-record logger.
+
+    Warnings and errors always pass. Every `summary_interval` seconds (checked
+    as records arrive) a summary line reports how many records were seen and
+    how many were dropped.
+    """
+
+    def __init__(self, name, every, summary_interval=LOG_SUMMARY_INTERVAL):
+        super().__init__()
+        self.logger_name = name
+        self.every = max(1, every)
+        self.summary_interval = summary_interval
+        self._lock = threading.Lock()
+        self._reset_window(time.monotonic())
+
+    def _reset_window(self, now):
+        self.seen = 0
+        self.kept = 0
+        self.window_start = now
+
+    def filter(self, record):
+        now = time.monotonic()
+        with self._lock:
+            self.seen += 1
+            keep = record.levelno >= logging.WARNING or (self.seen - 1) % self.every == 0
+            if keep:
+                self.kept += 1
+            due = now - self.window_start >= self.summary_interval
+        if due:
+            self.summarize(now)
+        return keep
+
+    def summarize(self, now=None):
+        """Log the summary for the current window and start a new one."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            seen, kept, elapsed = self.seen, self.kept, now - self.window_start
+            self._reset_window(now)
+        if seen:
+            logger.info("%s: %d records in %.1fs, %d logged, %d sampled out",
+                        self.logger_name, seen, elapsed, kept, seen - kept)
+
+def _build_handlers(log_file):
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(log_file, delay=True), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+def _start_listener(handlers):
+    """Route root records through a queue to a thread that runs the real handlers."""
+    global _listener
+    records = queue.SimpleQueue()
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return QueueHandler(records)
+
+def _restart_after_fork(root):
+    # The writer thread does not survive fork; a worker process gets its own
+    # queue and listener over the same handlers. Workers leave through
+    # os._exit, so the final drain is registered as a multiprocessing finalizer.
+    if _listener is None and not _samplers:
+        return
+    for handler in root.handlers:
+        if isinstance(handler, QueueHandler) and _listener is not None:
+            root.removeHandler(handler)
+            root.addHandler(_start_listener(_listener.handlers))
+            break
+    for sampler in _samplers:
+        sampler._lock = threading.Lock()
+        sampler._reset_window(time.monotonic())
+    Finalize(None, shutdown_logging, exitpriority=0)
+
+register_after_fork(logging.getLogger(), _restart_after_fork)
+
+def shutdown_logging():
+    """Write the final sampling summaries and drain the background writer."""
+    global _listener
+    for sampler in _samplers:
+        sampler.summarize()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def configure_logging(level=LOG_LEVEL, log_file=LOG_FILE, async_writer=LOG_ASYNC,
+                      sample_every=LOG_SAMPLE_EVERY, summary_interval=LOG_SUMMARY_INTERVAL):
+    """
+    Configure root logging for a command-line entry point.
+
+    Library modules only create loggers; entry points call this once. The
+    log file is opened on the first record rather than at setup time.
+    Calling it again is a no-op, like logging.basicConfig.
+
+    With async_writer, the caller only formats the message and enqueues it;
+    a background thread does the file and console writes. With
+    sample_every > 1, the loggers in LOG_SAMPLED_LOGGERS keep one record in
+    sample_every plus a periodic summary line.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    root.setLevel(getattr(logging, level, logging.INFO))
+
+    handlers = _build_handlers(log_file)
+    if async_writer:
+        root.addHandler(_start_listener(handlers))
+    else:
+        for handler in handlers:
+            root.addHandler(handler)
+
+    if sample_every > 1:
+        for name in LOG_SAMPLED_LOGGERS:
+            sampler = RecordSampler(name, sample_every, summary_interval)
+            logging.getLogger(name).addFilter(sampler)
+            _samplers.append(sampler)
+    if async_writer or sample_every > 1:
+        atexit.register(shutdown_logging)
@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """
+    Bounded LRU cache with an optional time-to-live, safe to share between threads.
+    
+    The cache is tied to a "generation" token describing the data the cached
+    values were computed from; whenever a different token is seen, every
+    entry is dropped.
+    """
+    
+    def __init__(self, maxsize=10000, ttl=None):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize (int): Maximum number of entries; 0 disables caching
+            ttl (float): Seconds an entry stays valid, or None for no expiry
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._generation = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def check_generation(self, generation):
+        """Drop all entries if they were computed from a different generation."""
+        if generation == self._generation:
+            return
+        with self._lock:
+            if generation != self._generation:
+                if self._entries:
+                    self.invalidations += 1
+                    logger.info(f"Result cache invalidated ({len(self._entries)} entries dropped)")
+                self._entries.clear()
+                self._generation = generation
+    
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            value, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop all entries without touching the counters."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """Return the cache counters as a dictionary."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations
+        }
+    
+    def reset_stats(self):
+        """Zero the counters."""
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
@@ -0,0 +1,184 @@
+import os
+import sys
+import struct
+import marshal
+import logging
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from utils.error_codes import result_mask, error_names
+
+logger = logging.getLogger(__name__)
+
+# Results file layout: a fixed header, one record per validation result,
+# then a marshal-encoded value table. The table only holds values that
+# repeat across rows: the result's input year and its suggestion (suggested
+# brand and model with the valid year range), so it grows with the car
+# catalog rather than with the number of rows and is read whole.
+#
+# A record is a fixed part followed by the input's plate, brand, model and
+# year written inline as UTF-8, in that order; these are mostly distinct per
+# row. The fixed part holds the two table indexes, the error mask and one
+# length byte per input field. A length of TABLE_VALUE means the value is in
+# the table (a value that is not a string, or a string too long for a length
+# byte) and a four-byte index is written inline instead; MISSING means the
+# input has no such key.
+#
+# Records follow batch_processor.validate_entry entries: the result's plate,
+# input_brand and input_model are the input's values.
+# Bump RESULTS_VERSION whenever the layout changes.
+RESULTS_MAGIC = b'VRES'
+RESULTS_VERSION = 2
+# magic, format version, marshal version, record count, value table offset
+_HEADER = struct.Struct('<4sHHqq')
+# suggestion index, input_year index, error mask, input field lengths
+_RECORD = struct.Struct('<IIB4B')
+_INDEX = struct.Struct('<I')
+INPUT_FIELDS = ('plate', 'brand', 'model', 'year')
+TABLE_VALUE = 0xFE
+MISSING = 0xFF
+_MAX_RECORD_SIZE = _RECORD.size + len(INPUT_FIELDS) * (TABLE_VALUE - 1)
+# Bytes read at a time
+_READ_SIZE = 1 << 16
+
+def write_results(results, output_path):
+    """
+    Stream validation results to a binary results file.
+
+    The file is written to a temporary name and renamed into place, so a
+    reader never sees a partial file.
+
+    Args:
+        results (iterable): Validation results ({"input": ..., "result": ...}), consumed lazily
+        output_path (str): Path to the results file
+
+    Returns:
+        tuple: (total_entries, entries_with_errors)
+    """
+    # (type, value) -> index; the type keeps 1, 1.0 and True apart
+    indexes = {}
+    values = []
+
+    def index_of(value):
+        key = (value.__class__, value)
+        index = indexes.get(key)
+        if index is None:
+            index = indexes[key] = len(values)
+            values.append(value)
+        return index
+
+    total_entries = 0
+    errors_count = 0
+    pack = _RECORD.pack
+    pack_index = _INDEX.pack
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(_HEADER.pack(RESULTS_MAGIC, RESULTS_VERSION, marshal.version, 0, 0))
+        for entry in results:
+            entry_input, result = entry['input'], entry['result']
+            lengths = []
+            inline = []
+            for field in INPUT_FIELDS:
+                if field not in entry_input:
+                    lengths.append(MISSING)
+                    continue
+                value = entry_input[field]
+                if value.__class__ is str:
+                    data = value.encode('utf-8')
+                    if len(data) < TABLE_VALUE:
+                        lengths.append(len(data))
+                        inline.append(data)
+                        continue
+                lengths.append(TABLE_VALUE)
+                inline.append(pack_index(index_of(value)))
+
+            year_range = result['valid_year_range']
+            if year_range.__class__ is list:
+                year_range = tuple(year_range)  # a year range read back from JSON
+            mask = result_mask(result)
+            file.write(pack(index_of((result['suggested_brand'], result['suggested_model'], year_range)),
+                            index_of(result['input_year']),
+                            mask, *lengths))
+            file.write(b''.join(inline))
+            total_entries += 1
+            if mask:
+                errors_count += 1
+
+        table_offset = file.tell()
+        file.write(marshal.dumps(values))
+        file.seek(0)
+        file.write(_HEADER.pack(RESULTS_MAGIC, RESULTS_VERSION, marshal.version, total_entries, table_offset))
+    os.replace(temp_path, output_path)
+
+    logger.info(f"Wrote {total_entries} results to {output_path} ({len(values)} table values)")
+    return total_entries, errors_count
+
+def _read_header(file, results_path):
+    header = file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{results_path} is not a results file")
+    magic, version, marshal_version, count, table_offset = _HEADER.unpack(header)
+    if magic != RESULTS_MAGIC:
+        raise ValueError(f"{results_path} is not a results file")
+    if version != RESULTS_VERSION or marshal_version != marshal.version:
+        raise ValueError(f"{results_path} was written in another results format version")
+    return count, table_offset
+
+def iter_binary_results(results_path):
+    """
+    Yield validation results from a binary results file one at a time.
+
+    Results come back in the shape validate_entry produced them, with
+    valid_year_range as a tuple.
+
+    Raises:
+        ValueError: If the file is not a results file of this format version
+    """
+    unpack = _RECORD.unpack_from
+    unpack_index = _INDEX.unpack_from
+    record_size = _RECORD.size
+    with open(results_path, 'rb') as file:
+        count, table_offset = _read_header(file, results_path)
+        file.seek(table_offset)
+        values = marshal.loads(file.read())
+
+        # Records are parsed out of blocks; a block is refilled when the
+        # longest possible record might not fit in what is left of it
+        file.seek(_HEADER.size)
+        block = b''
+        position = 0
+        for _ in range(count):
+            if len(block) - position < _MAX_RECORD_SIZE:
+                block = block[position:] + file.read(_READ_SIZE)
+                position = 0
+            suggestion, input_year, mask, *lengths = unpack(block, position)
+            position += record_size
+            entry_input = {}
+            for field, length in zip(INPUT_FIELDS, lengths):
+                if length < TABLE_VALUE:
+                    entry_input[field] = block[position:position + length].decode('utf-8')
+                    position += length
+                elif length == TABLE_VALUE:
+                    entry_input[field] = values[unpack_index(block, position)[0]]
+                    position += _INDEX.size
+
+            suggested_brand, suggested_model, year_range = values[suggestion]
+            yield {
+                "input": entry_input,
+                "result": {
+                    "plate": entry_input.get('plate', ""),
+                    "input_brand": entry_input.get('brand', ""),
+                    "input_model": entry_input.get('model', ""),
+                    "input_year": values[input_year],
+                    "suggested_brand": suggested_brand,
+                    "suggested_model": suggested_model,
+                    "valid_year_range": year_range,
+                    "errors": error_names(mask),
+                    "error_mask": mask
+                }
+            }
@@ -9,51 +9,92 @@ if __name__ == "__main__":
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+from processing.batch_processor import entry_from_row, validate_batch, iter_validate, save_results_to_json, save_results_to_binary
+from processing.data_corrector import load_validation_data, save_validation_data, correct_validation_data
+from utils.error_codes import result_mask
+from config.settings import BATCH_WORKERS, BATCH_CHUNK_SIZE
+
 logger = logging.getLogger(__name__)
 
-def main():
-    # Add src directory to path
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    src_dir = os.path.join(current_dir, '..')
-    sys.path.append(src_dir)
-    
-    # Import required modules
-    from processing.batch_processor import validate_batch_from_csv, save_results_to_json
-    from processing.data_corrector import load_validation_data, save_validation_data, correct_validation_data
-    import json
-    
-    # Paths
-    data_dir = os.path.join(src_dir, '..', 'data')
-    original_data_path = os.path.join(data_dir, 'validation_dataset.csv')
-    corrected_data_path = os.path.join(data_dir, 'validation_dataset_corrected.csv')
-    original_results_path = os.path.join(data_dir, 'original_validation_results.json')
-    corrected_results_path = os.path.join(data_dir, 'corrected_validation_results.json')
-    
+def revalidate_changed(original_entries, corrected_entries, original_results,
+                       workers=BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Validate corrected entries, re-running validation only where the input changed.
+
+    Validation depends only on an entry's plate, brand, model and year, so
+    an entry the corrector left alone keeps its original result.
+
+    Args:
+        original_entries (list): Entries the original results were produced from
+        corrected_entries (list): Entries after correction, in the same order
+        original_results (list): validate_batch output for original_entries
+        workers (int): Number of worker processes for the changed entries
+        chunk_size (int): Entries sent to a worker at a time
+
+    Returns:
+        tuple: (results for corrected_entries, number of entries re-validated)
+    """
+    changed = [i for i, (before, after) in enumerate(zip(original_entries, corrected_entries)) if before != after]
+    results = list(original_results)
+    revalidated = iter_validate((corrected_entries[i] for i in changed), workers=workers, chunk_size=chunk_size)
+    for i, entry in zip(changed, revalidated):
+        results[i] = entry
+    return results, len(changed)
+
+def run_workflow(original_data_path, corrected_data_path=None, workers=BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Validate a dataset, correct it and validate the corrected rows.
+
+    Rows, entries and results stay in memory between steps. The corrected
+    CSV is still written when a path is given, but it is not read back.
+
+    Returns:
+        tuple: (validation_data, corrected_data, original_results, corrected_results)
+    """
     # Step 1: Validate original dataset
     logger.info("Step 1: Validating original dataset")
-    original_results = validate_batch_from_csv(original_data_path)
-    save_results_to_json(original_results, original_results_path)
+    validation_data = load_validation_data(original_data_path)
+    original_entries = [entry_from_row(row) for row in validation_data]
+    original_results = validate_batch(original_entries, workers=workers, chunk_size=chunk_size)
     
     # Step 2: Correct the validation dataset
     logger.info("Step 2: Correcting validation dataset")
-    validation_data = load_validation_data(original_data_path)
     correction_results = [entry['result'] for entry in original_results]
     corrected_data = correct_validation_data(validation_data, correction_results)
-    save_validation_data(corrected_data, corrected_data_path)
+    if corrected_data_path:
+        save_validation_data(corrected_data, corrected_data_path)
     
-    # Step 3: Validate corrected dataset
+    # Step 3: Validate the rows the correction changed
     logger.info("Step 3: Validating corrected dataset")
-    corrected_results = validate_batch_from_csv(corrected_data_path)
-    save_results_to_json(corrected_results, corrected_results_path)
+    corrected_entries = [entry_from_row(row) for row in corrected_data]
+    corrected_results, revalidated = revalidate_changed(original_entries, corrected_entries, original_results,
+                                                        workers=workers, chunk_size=chunk_size)
+    logger.info("Re-validated %d of %d rows changed by correction", revalidated, len(corrected_entries))
+    
+    return validation_data, corrected_data, original_results, corrected_results
+
+def main(workers=BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE, binary=False):
+    # Paths
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(current_dir, '..', '..', 'data')
+    original_data_path = os.path.join(data_dir, 'validation_dataset.csv')
+    corrected_data_path = os.path.join(data_dir, 'validation_dataset_corrected.csv')
+    extension = '.bin' if binary else '.json'
+    original_results_path = os.path.join(data_dir, 'original_validation_results' + extension)
+    corrected_results_path = os.path.join(data_dir, 'corrected_validation_results' + extension)
+    
+    validation_data, corrected_data, original_results, corrected_results = run_workflow(
+        original_data_path, corrected_data_path, workers=workers, chunk_size=chunk_size)
+    save_results = save_results_to_binary if binary else save_results_to_json
+    save_results(original_results, original_results_path)
+    save_results(corrected_results, corrected_results_path)
     
     # Step 4: Compare results
     logger.info("Step 4: Comparing results")
     
-    # Count errors in original
-    original_errors = sum(len(entry['result']['errors']) for entry in original_results)
-    corrected_errors = sum(len(entry['result']['errors']) for entry in corrected_results)
+    # Count errors in original (one set bit per error)
+    original_errors = sum(bin(result_mask(entry['result'])).count('1') for entry in original_results)
+    corrected_errors = sum(bin(result_mask(entry['result'])).count('1') for entry in corrected_results)
     
     print("\n=== Complete Workflow Results ===")
     print(f"Original dataset errors: {original_errors}")
@@ -77,4 +118,6 @@ def main():
             print(f"  Remaining errors: {corrected_result['errors']}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    from utils.logging_setup import configure_logging
+    configure_logging()
+    main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import csv
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+# Add the src directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+
+from core.grant_validator import GRANT_FIELDS, GrantRecord
+
+VEHICLES = [('Toyota', 'Vios'), ('Toyota', 'Camry'), ('Honda', 'Civic'), ('Honda', 'City'),
+            ('Perodua', 'Myvi'), ('Perodua', 'Axia'), ('Proton', 'Saga'), ('Proton', 'X70')]
+
+def write_grants(path, rows, seed=0):
+    """Write a random vehicle grants CSV shaped like data/vehicle_grants.csv."""
+    rng = random.Random(seed)
+    employees = [f"EMP{i:03d}" for i in range(20)]
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(GRANT_FIELDS)
+        for i in range(rows):
+            brand, model = rng.choice(VEHICLES)
+            day = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            writer.writerow([
+                f"GRANT{i:08d}", f"W{chr(65 + i % 26)}{chr(65 + i // 26 % 26)} {i % 9999 + 1}", brand, model,
+                str(rng.randint(2005, 2025)), f"Owner {i}", f"{rng.randint(10 ** 11, 10 ** 12 - 1)}", day,
+                'active', rng.choice(employees), f"{day}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00", '', '',
+            ])
+
+def measure(grants_path, make_row):
+    """Return the bytes held by the loaded rows, as traced by tracemalloc."""
+    tracemalloc.start()
+    with open(grants_path, 'r', encoding='utf-8') as file:
+        rows = [make_row(row) for row in csv.DictReader(file)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return current
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory held by loaded grants, as row dicts and as GrantRecords')
+    parser.add_argument('--rows', type=int, default=200000, help='Grants to generate')
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        grants_path = os.path.join(temp_dir, 'vehicle_grants.csv')
+        write_grants(grants_path, args.rows)
+
+        print(f"{'rows as':<12} {'MiB':>8} {'bytes/row':>10}")
+        baseline = None
+        for name, make_row in (('dict', dict), ('GrantRecord', GrantRecord)):
+            held = measure(grants_path, make_row)
+            baseline = baseline or held
+            print(f"{name:<12} {held / 2 ** 20:>8.1f} {held / args.rows:>10.0f}  ({held / baseline:.2f}x)")
+    finally:
+        shutil.rmtree(temp_dir)
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,8 @@ DEFAULT_SETTINGS = {
     'EMPLOYEE_CREDENTIALS_PATH': os.path.join(current_dir, 'data', 'employee_credentials.csv'),
     'CUSTOMER_DATA_PATH': os.path.join(current_dir, 'data', 'customer_data.csv'),
     'VEHICLE_GRANTS_PATH': os.path.join(current_dir, 'data', 'vehicle_grants.csv'),
-    'CAR_DATA_PATH': os.path.join(current_dir, 'data', 'car_dataset.csv')
+    'CAR_DATA_PATH': os.path.join(current_dir, 'data', 'car_dataset.csv'),
+    'SEARCH_PAGE_SIZE': 20
 }
 
 # Import settings with error handling
@@ -43,6 +44,7 @@ try:
     CUSTOMER_DATA_PATH = getattr(settings_module, 'CUSTOMER_DATA_PATH', DEFAULT_SETTINGS['CUSTOMER_DATA_PATH'])
     VEHICLE_GRANTS_PATH = getattr(settings_module, 'VEHICLE_GRANTS_PATH', DEFAULT_SETTINGS['VEHICLE_GRANTS_PATH'])
     CAR_DATA_PATH = getattr(settings_module, 'CAR_DATA_PATH', DEFAULT_SETTINGS['CAR_DATA_PATH'])
+    SEARCH_PAGE_SIZE = getattr(settings_module, 'SEARCH_PAGE_SIZE', DEFAULT_SETTINGS['SEARCH_PAGE_SIZE'])
     
 except Exception as e:
     print(f"Warning: Could not import settings: {e}")
@@ -54,6 +56,7 @@ except Exception as e:
     CUSTOMER_DATA_PATH = DEFAULT_SETTINGS['CUSTOMER_DATA_PATH']
     VEHICLE_GRANTS_PATH = DEFAULT_SETTINGS['VEHICLE_GRANTS_PATH']
     CAR_DATA_PATH = DEFAULT_SETTINGS['CAR_DATA_PATH']
+    SEARCH_PAGE_SIZE = DEFAULT_SETTINGS['SEARCH_PAGE_SIZE']
 
 # Import modules with error handling
 def safe_import(module_name, module_path):
@@ -99,6 +102,13 @@ def setup_logging():
     logger.info("Logging initialized")
     return logger
 
+def is_missing_or_empty(path):
+    """Return True if a file does not exist or is empty, with a single stat call."""
+    try:
+        return os.stat(path).st_size == 0
+    except OSError:
+        return True
+
 def init_data_files():
     """Initialize data files if they don't exist."""
     # Create data directory if it doesn't exist
@@ -111,7 +121,7 @@ def init_data_files():
         add_employee('validator2', 'Validator Two', 'validator123', 'validator')
     
     # Initialize customer data file with headers and sample data
-    if not os.path.exists(CUSTOMER_DATA_PATH) or os.path.getsize(CUSTOMER_DATA_PATH) == 0:
+    if is_missing_or_empty(CUSTOMER_DATA_PATH):
         with open(CUSTOMER_DATA_PATH, 'w', encoding='utf-8', newline='') as file:
             writer = csv.writer(file)
             writer.writerow([
@@ -138,7 +148,7 @@ def init_data_files():
             ])
     
     # Initialize vehicle grants file with headers and sample data
-    if not os.path.exists(VEHICLE_GRANTS_PATH) or os.path.getsize(VEHICLE_GRANTS_PATH) == 0:
+    if is_missing_or_empty(VEHICLE_GRANTS_PATH):
         with open(VEHICLE_GRANTS_PATH, 'w', encoding='utf-8', newline='') as file:
             writer = csv.writer(file)
             writer.writerow([
@@ -185,26 +195,101 @@ def init_data_files():
             writer.writerow(['Proton', 'Persona'])
             writer.writerow(['Proton', 'Iriz'])
 
-def display_car_models():
+class Session:
+    """
+    Data the CLI keeps loaded between menu actions.
+    
+    The grant validator, customer manager and car model list are loaded on
+    first use and kept for the rest of the session. Before each use, a file
+    that changed on disk since it was loaded is reloaded; customers live in
+    their database, which is always current. The car catalog is the
+    process-wide one from the catalog provider, which the grant validator
+    and its fuzzy matching share. The session's validator starts the
+    provider's watcher, which reloads it in the background when the car
+    dataset changes.
+    
+    Missing data files are created with init_data_files the first time one
+    of them fails to open, so a normal start does not check every file.
+    """
+    
+    def __init__(self):
+        self._grant_validator = None
+        self._customer_manager = None
+        self._car_models = None
+        self._car_models_signature = None
+        self._data_files_initialized = False
+    
+    def _init_data_files(self):
+        """Create missing data files, at most once per session."""
+        if not self._data_files_initialized:
+            self._data_files_initialized = True
+            init_data_files()
+    
+    def grant_validator(self):
+        """Return the session's grant validator, reloading grants changed outside it."""
+        if self._grant_validator is None:
+            self._grant_validator = GrantValidator(watch_catalog=True)
+            if self._grant_validator.grants_signature is None:
+                # The grants file could not be opened; create it and load it
+                self._init_data_files()
+                self._grant_validator.load_grant_data()
+        else:
+            self._grant_validator.reload_if_changed()
+        return self._grant_validator
+    
+    def customer_manager(self):
+        """Return the session's customer manager."""
+        if self._customer_manager is None:
+            self._customer_manager = CustomerManager()
+            if self._customer_manager.count() == 0:
+                # No customers and no customer CSV to import them from
+                self._init_data_files()
+                if os.path.exists(self._customer_manager.data_file):
+                    self._customer_manager.import_csv(self._customer_manager.data_file)
+        return self._customer_manager
+    
+    def car_models(self):
+        """Return (brand, model) pairs from car_models_list.csv, reloaded when the file changes."""
+        car_models_path = os.path.join(DATA_DIR, 'car_models_list.csv')
+        try:
+            stat = os.stat(car_models_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        
+        if self._car_models is None or signature != self._car_models_signature:
+            if signature is None:
+                # The list could not be opened; create it with the other data files
+                self._init_data_files()
+                stat = os.stat(car_models_path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            with open(car_models_path, 'r', encoding='utf-8') as file:
+                self._car_models = [(row['brand'], row['model']) for row in csv.DictReader(file)]
+            self._car_models_signature = signature
+        return self._car_models
+    
+    def close(self):
+        """Release the customer database connection."""
+        if self._customer_manager is not None:
+            self._customer_manager.close()
+            self._customer_manager = None
+
+def display_car_models(session):
     """Display the list of available car models."""
-    car_models_path = os.path.join(DATA_DIR, 'car_models_list.csv')
-    
     print("\n=== Available Car Models ===")
     try:
-        with open(car_models_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                print(f"{row['brand']} {row['model']}")
+        for brand, model in session.car_models():
+            print(f"{brand} {model}")
     except Exception as e:
         print(f"Error loading car models: {e}")
 
-def validate_vehicle_grant():
+def validate_vehicle_grant(session):
     """Validate a vehicle grant interactively."""
     if not GrantValidator:
         print("Error: Grant validator not available.")
         return
     
-    validator = GrantValidator()
+    validator = session.grant_validator()
     
     print("\n=== Vehicle Grant Validation ===")
     
@@ -261,13 +346,13 @@ def validate_vehicle_grant():
         else:
             print("\nFailed to save grant.")
 
-def search_vehicle_grants():
+def search_vehicle_grants(session):
     """Search for vehicle grants interactively."""
     if not GrantValidator:
         print("Error: Grant validator not available.")
         return
     
-    validator = GrantValidator()
+    validator = session.grant_validator()
     
     print("\n=== Search Vehicle Grants ===")
     print("Search by:")
@@ -287,27 +372,37 @@ def search_vehicle_grants():
     
     search_term = input(f"Enter {search_field.replace('_', ' ')}: ")
     
-    grants = validator.search_grants(search_term, search_field)
-    
-    print(f"\nFound {len(grants)} grants:")
-    
-    for grant in grants:
-        print("\n---")
-        print(f"Grant ID: {grant.get('grant_id')}")
-        print(f"Plate: {grant.get('plate_number')}")
-        print(f"Vehicle: {grant.get('brand')} {grant.get('model')} ({grant.get('year')})")
-        print(f"Owner: {grant.get('owner_name')} ({grant.get('owner_id')})")
-        print(f"Date: {grant.get('grant_date')}")
-        print(f"Status: {grant.get('status')}")
+    # Fetch a page at a time; one extra result tells whether another page follows
+    offset = 0
+    while True:
+        grants = validator.search_grants(search_term, search_field, limit=SEARCH_PAGE_SIZE + 1, offset=offset)
+        has_more = len(grants) > SEARCH_PAGE_SIZE
+        grants = grants[:SEARCH_PAGE_SIZE]
+        
+        if offset == 0:
+            print(f"\nFound {'more than ' if has_more else ''}{len(grants)} grants:")
+        
+        for grant in grants:
+            print("\n---")
+            print(f"Grant ID: {grant.get('grant_id')}")
+            print(f"Plate: {grant.get('plate_number')}")
+            print(f"Vehicle: {grant.get('brand')} {grant.get('model')} ({grant.get('year')})")
+            print(f"Owner: {grant.get('owner_name')} ({grant.get('owner_id')})")
+            print(f"Date: {grant.get('grant_date')}")
+            print(f"Status: {grant.get('status')}")
+        
+        if not has_more or input("\nShow more results? (y/n): ").lower() != 'y':
+            break
+        offset += SEARCH_PAGE_SIZE
 
-def generate_report():
+def generate_report(session):
     """Generate a simple report interactively."""
     if not GrantValidator or not CustomerManager:
         print("Error: Required modules not available.")
         return
     
-    grant_validator = GrantValidator()
-    customer_manager = CustomerManager()
+    grant_validator = session.grant_validator()
+    customer_manager = session.customer_manager()
     
     print("\n=== Generate Report ===")
     print("1. Vehicle Grants Summary")
@@ -316,44 +411,44 @@ def generate_report():
     choice = input("Enter your choice (1-2): ")
     
     if choice == '1':
-        # Vehicle grants summary
-        grants = grant_validator.grant_data
+        # Vehicle grants summary, from the validator's running counters
+        counters = grant_validator.report_counters
         
         print("\n=== Vehicle Grants Summary ===")
-        print(f"Total grants: {len(grants)}")
-        
-        # Count by brand
-        brand_counts = {}
-        for grant in grants:
-            brand = grant.get('brand', 'Unknown')
-            brand_counts[brand] = brand_counts.get(brand, 0) + 1
+        print(f"Total grants: {counters.total}")
         
         print("\nGrants by Brand:")
-        for brand, count in sorted(brand_counts.items()):
+        for brand, count in sorted(counters.counts('brand').items()):
             print(f"- {brand}: {count}")
         
-        # Count by status
-        status_counts = {}
-        for grant in grants:
-            status = grant.get('status', 'Unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
+        print("\nGrants by Model:")
+        for (brand, model), count in sorted(counters.counts('model').items()):
+            print(f"- {brand} {model}: {count}")
+        
+        print("\nGrants by Year:")
+        for year, count in sorted(counters.counts('year').items()):
+            print(f"- {year}: {count}")
         
         print("\nGrants by Status:")
-        for status, count in sorted(status_counts.items()):
+        for status, count in sorted(counters.counts('status').items()):
             print(f"- {status}: {count}")
+        
+        # Most recent days only; the counters keep every day
+        added = counters.counts('added_by_day')
+        recent_days = sorted({day for day, _ in added}, reverse=True)[:7]
+        print("\nGrants Added per Day (last 7 days with additions):")
+        for day in recent_days:
+            for (added_day, employee_id), count in sorted(added.items()):
+                if added_day == day:
+                    print(f"- {day or 'Unknown'} {employee_id or 'Unknown'}: {count}")
     
     elif choice == '2':
-        # Customer summary
-        customers = customer_manager.customers
-        
+        # Customer summary, counted by the database
         print("\n=== Customer Summary ===")
-        print(f"Total customers: {len(customers)}")
+        print(f"Total customers: {customer_manager.count()}")
         
         # Count by vehicle brand
-        brand_counts = {}
-        for customer in customers:
-            brand = customer.get('vehicle_brand', 'Unknown')
-            brand_counts[brand] = brand_counts.get(brand, 0) + 1
+        brand_counts = customer_manager.count_by('vehicle_brand')
         
         print("\nCustomers by Vehicle Brand:")
         for brand, count in sorted(brand_counts.items()):
@@ -365,10 +460,25 @@ def generate_report():
 def main():
     """Main entry point for the application."""
     parser = argparse.ArgumentParser(description='Employee-Facing Vehicle Data Validation Tool')
-    parser.add_argument('--mode', choices=['init', 'cli'], 
+    parser.add_argument('--mode', choices=['init', 'compile', 'cli', 'grants-batch', 'verify-reports'], 
                        default='cli', help='Mode of operation')
+    parser.add_argument('--input', help='grants-batch: CSV or NDJSON (.ndjson/.jsonl) file of grants')
+    parser.add_argument('--output', help='grants-batch: NDJSON file for per-row results '
+                                         '(default: <input>.results.ndjson)')
+    parser.add_argument('--employee-id', default='batch',
+                       help='grants-batch: employee recorded as adding the imported grants')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='grants-batch: worker processes for validation (1 = in-process)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                       help='grants-batch: grants sent to a worker at a time')
+    parser.add_argument('--validate-only', action='store_true',
+                       help='grants-batch: write results without importing valid grants')
+    parser.add_argument('--repair', action='store_true',
+                       help='verify-reports: rebuild report counters that drifted from a full recount')
     
     args = parser.parse_args()
+    if args.mode == 'grants-batch' and not args.input:
+        parser.error('--mode grants-batch requires --input')
     
     # Set up logging
     logger = setup_logging()
@@ -377,9 +487,46 @@ def main():
         logger.info("Initializing data files...")
         init_data_files()
         logger.info("Data files initialized successfully")
+    elif args.mode == 'compile':
+        from utils.catalog_snapshot import compile_snapshot
+        print(f"Catalog snapshot written to {compile_snapshot(CAR_DATA_PATH)}")
+    elif args.mode == 'grants-batch':
+        from core.grant_batch import run_grant_batch
+        
+        output_path = args.output or f"{os.path.splitext(args.input)[0]}.results.ndjson"
+        summary = run_grant_batch(args.input, output_path, args.employee_id, workers=args.workers,
+                                  chunk_size=args.chunk_size, import_valid=not args.validate_only)
+        
+        print("\n=== Grant Batch Summary ===")
+        print(f"Grants processed: {summary['total']}")
+        print(f"Valid: {summary['valid']}")
+        print(f"Invalid: {summary['invalid']}")
+        print(f"Imported: {summary['imported']}")
+        print(f"Results saved to {output_path}")
+    elif args.mode == 'verify-reports':
+        # Recount every grant and customer and compare with the running report counters
+        session = Session()
+        drifted = False
+        for name, store in (('grant', session.grant_validator()), ('customer', session.customer_manager())):
+            drift = store.verify_report_counters(repair=args.repair)
+            drifted = drifted or bool(drift)
+            if not drift:
+                print(f"{name.capitalize()} report counters match a full recount")
+                continue
+            print(f"{name.capitalize()} report counters drifted{' (repaired)' if args.repair else ''}:")
+            for dimension, groups in sorted(drift.items()):
+                if dimension == 'total':
+                    print(f"- total: counted {groups[0]}, recounted {groups[1]}")
+                    continue
+                for group, (counted, recounted) in sorted(groups.items(), key=lambda item: str(item[0])):
+                    print(f"- {dimension} {group}: counted {counted}, recounted {recounted}")
+        session.close()
+        if drifted and not args.repair:
+            sys.exit(1)
     elif args.mode == 'cli':
         logger.info("Starting employee tool...")
-        init_data_files()
+        # Data files are created on first use if missing; see Session
+        session = Session()
         
         # Main menu loop
         while True:
@@ -393,14 +540,15 @@ def main():
             choice = input("Enter your choice (1-5): ")
             
             if choice == '1':
-                display_car_models()
+                display_car_models(session)
             elif choice == '2':
-                validate_vehicle_grant()
+                validate_vehicle_grant(session)
             elif choice == '3':
-                search_vehicle_grants()
+                search_vehicle_grants(session)
             elif choice == '4':
-                generate_report()
+                generate_report(session)
             elif choice == '5':
+                session.close()
                 print("Goodbye!")
                 break
             else:
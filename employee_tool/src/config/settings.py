@@ -10,6 +10,8 @@ DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
 # File paths
 EMPLOYEE_CREDENTIALS_PATH = os.path.join(DATA_DIR, 'employee_credentials.csv')
 CUSTOMER_DATA_PATH = os.path.join(DATA_DIR, 'customer_data.csv')
+# SQLite database the customer manager works on; filled from CUSTOMER_DATA_PATH on first use
+CUSTOMER_DB_PATH = os.path.join(DATA_DIR, 'customer_data.db')
 VEHICLE_GRANTS_PATH = os.path.join(DATA_DIR, 'vehicle_grants.csv')
 VALIDATION_RESULTS_PATH = os.path.join(DATA_DIR, 'validation_results.csv')
 
@@ -31,6 +33,17 @@ for path in possible_car_paths:
 if CAR_DATA_PATH is None:
     CAR_DATA_PATH = possible_car_paths[0]
 
+# Long-running sessions poll the car dataset this often (seconds) and reload it on change
+CATALOG_POLL_INTERVAL = 2.0
+
+# Interactive searches show this many results per page
+SEARCH_PAGE_SIZE = 20
+
+# Bulk grant validation (--mode grants-batch): worker processes (1 validates
+# in-process) and grants sent to a worker at a time
+BATCH_WORKERS = 1
+BATCH_CHUNK_SIZE = 256
+
 # Validation thresholds
 FUZZY_MATCH_THRESHOLD = 80
 MAX_LEVENSHTEIN_DISTANCE = 3
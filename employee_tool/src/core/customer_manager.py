@@ -1,77 +1,291 @@
 # src/core/customer_manager.py
 import os
 import csv
+import json
+import sqlite3
 import logging
 from datetime import datetime
+from itertools import islice
+
+from utils.records import Record
+from utils.search_index import TrigramIndex
 
 logger = logging.getLogger(__name__)
 
+# Columns of the customers table, in customer_data.csv order. Fields outside
+# this list are kept in a JSON 'extra' column so no input data is dropped.
+CUSTOMER_FIELDS = ['customer_id', 'name', 'email', 'phone', 'address', 'vehicle_plate',
+                   'vehicle_brand', 'vehicle_model', 'vehicle_year', 'created_at', 'updated_at']
+
+# Vehicle columns compare case-insensitively (ASCII), like the old .lower()
+# comparisons, so the equality lookups below can use the indexes
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id TEXT PRIMARY KEY,
+    name TEXT,
+    email TEXT,
+    phone TEXT,
+    address TEXT,
+    vehicle_plate TEXT COLLATE NOCASE,
+    vehicle_brand TEXT COLLATE NOCASE,
+    vehicle_model TEXT COLLATE NOCASE,
+    vehicle_year TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_customers_plate ON customers (vehicle_plate);
+CREATE INDEX IF NOT EXISTS idx_customers_vehicle ON customers (vehicle_brand, vehicle_model);
+CREATE TABLE IF NOT EXISTS customer_counts (
+    dimension TEXT,
+    value TEXT,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (dimension, value)
+);
+"""
+
+IMPORT_BATCH_SIZE = 10000
+
+class CustomerRecord(Record):
+    """One customer, in slots; see Record."""
+    
+    __slots__ = tuple(CUSTOMER_FIELDS)
+    FIELDS = tuple(CUSTOMER_FIELDS)
+    INTERNED = frozenset(['vehicle_brand', 'vehicle_model', 'vehicle_year'])
+
+# Fields whose per-value customer counts are kept in customer_counts, in the
+# same transaction as each change, so reports do not scan the customers
+CUSTOMER_REPORT_FIELDS = ('vehicle_brand', 'vehicle_model', 'vehicle_year')
+
+# Fields search_customers answers from the in-memory trigram index
+CUSTOMER_SEARCH_FIELDS = ('name', 'vehicle_plate', 'vehicle_brand', 'vehicle_model')
+
 class CustomerManager:
-    """Manage customer data for the employee tool."""
+    """
+    Manage customer data for the employee tool.
     
-    def __init__(self, data_file=None):
+    Customers live in a SQLite database (WAL mode) indexed by customer ID,
+    plate and brand/model, so lookups do not scan every customer and adding
+    or updating a customer writes only that row. On first use an empty
+    database is filled from the customer CSV.
+    """
+    
+    def __init__(self, data_file=None, db_path=None):
         """
         Initialize the customer manager.
         
         Args:
-            data_file (str): Path to the customer data CSV file
+            data_file (str): Path to the customer data CSV file, imported into an empty database
+            db_path (str): Path to the customer database
         """
-        from config.settings import CUSTOMER_DATA_PATH
+        if data_file is None or db_path is None:
+            from config.settings import CUSTOMER_DATA_PATH, CUSTOMER_DB_PATH
+            data_file = data_file or CUSTOMER_DATA_PATH
+            db_path = db_path or CUSTOMER_DB_PATH
         
-        self.data_file = data_file or CUSTOMER_DATA_PATH
-        self.customers = []
+        self.data_file = data_file
+        self.db_path = db_path
+        self.connection = None
+        self.search_index = None
         self.load_customers()
     
     def load_customers(self):
-        """Load customer data from CSV file."""
-        if not os.path.exists(self.data_file):
-            logger.warning(f"Customer data file not found: {self.data_file}")
-            return
+        """Open the customer database, importing the CSV file if the database is empty."""
+        if self.connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(self.db_path)
+            self.connection.row_factory = sqlite3.Row
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            # Python's str.lower, for search_customers to match the old behaviour on any text
+            self.connection.create_function('py_lower', 1, lambda value: (value or '').lower(), deterministic=True)
+            self.connection.executescript(SCHEMA)
+            # Databases created before the counters existed get them on first open
+            if self.connection.execute("SELECT 1 FROM customer_counts WHERE dimension = 'total'").fetchone() is None:
+                self.rebuild_report_counters()
         
+        if self.count() == 0 and os.path.exists(self.data_file):
+            self.import_csv(self.data_file)
+        logger.info(f"Customer database ready with {self.count()} customer records")
+    
+    def import_csv(self, csv_path):
+        """
+        Import customers from a CSV file into the database.
+        
+        Rows are streamed in batches inside one transaction. A customer ID
+        that is already present keeps its existing row.
+        
+        Args:
+            csv_path (str): Path to a customer CSV file
+        
+        Returns:
+            int: Number of customers imported
+        """
+        imported = 0
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                self.customers = list(reader)
-            
-            logger.info(f"Loaded {len(self.customers)} customer records")
+            with open(csv_path, 'r', encoding='utf-8', newline='') as file, self.connection:
+                batch = []
+                for row in csv.DictReader(file):
+                    batch.append(self._to_params(row))
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        imported += self._insert_many(batch)
+                        batch = []
+                imported += self._insert_many(batch)
+            logger.info(f"Imported {imported} customer records from {csv_path}")
+            self.rebuild_report_counters()
+            # Rebuilt on the next search
+            self.search_index = None
         except Exception as e:
-            logger.error(f"Error loading customer data: {e}")
-            self.customers = []
+            logger.error(f"Error importing customer data: {e}")
+        return imported
+    
+    def _insert_many(self, params):
+        before = self.connection.total_changes
+        self.connection.executemany(
+            f"INSERT OR IGNORE INTO customers ({', '.join(CUSTOMER_FIELDS)}, extra) "
+            f"VALUES ({', '.join('?' * (len(CUSTOMER_FIELDS) + 1))})", params)
+        return self.connection.total_changes - before
+    
+    @staticmethod
+    def _to_params(customer):
+        extra = {key: value for key, value in customer.items() if key not in CUSTOMER_FIELDS}
+        return [customer.get(field) for field in CUSTOMER_FIELDS] + [json.dumps(extra) if extra else None]
+    
+    @staticmethod
+    def _to_customer(row):
+        customer = CustomerRecord({field: row[field] if row[field] is not None else '' for field in CUSTOMER_FIELDS})
+        if row['extra']:
+            customer.update(json.loads(row['extra']))
+        return customer
     
     def save_customers(self):
-        """Save customer data to CSV file."""
-        if not self.customers:
-            logger.warning("No customer data to save")
-            return
-        
+        """Export all customers to the CSV data file (the database is the primary copy)."""
         try:
-            # Ensure directory exists
             os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
             
-            with open(self.data_file, 'w', encoding='utf-8', newline='') as file:
-                if self.customers:
-                    writer = csv.DictWriter(file, fieldnames=self.customers[0].keys())
-                    writer.writeheader()
-                    writer.writerows(self.customers)
+            temp_path = f"{self.data_file}.tmp"
+            with open(temp_path, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=CUSTOMER_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                for customer in self.iter_customers():
+                    writer.writerow(customer)
+            os.replace(temp_path, self.data_file)
             
-            logger.info(f"Saved {len(self.customers)} customer records")
+            logger.info(f"Exported {self.count()} customer records to {self.data_file}")
         except Exception as e:
             logger.error(f"Error saving customer data: {e}")
     
+    def close(self):
+        """Close the database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+    
+    def count(self):
+        """Return the number of customers, from the report counters."""
+        return self.connection.execute(
+            "SELECT count FROM customer_counts WHERE dimension = 'total'").fetchone()[0]
+    
+    def count_by(self, field):
+        """
+        Count customers per value of a field.
+        
+        CUSTOMER_REPORT_FIELDS are read from the report counters; other
+        fields are counted from the customers table.
+        
+        Args:
+            field (str): One of CUSTOMER_FIELDS
+        
+        Returns:
+            dict: Field value -> number of customers
+        """
+        if field in CUSTOMER_REPORT_FIELDS:
+            rows = self.connection.execute("SELECT value, count FROM customer_counts WHERE dimension = ?", (field,))
+            return {value: count for value, count in rows}
+        return self._recount(field)
+    
+    def _recount(self, field):
+        if field not in CUSTOMER_FIELDS:
+            raise ValueError(f"Unknown customer field: {field}")
+        # Missing values count as '', as in the report counters
+        rows = self.connection.execute(
+            f"SELECT coalesce({field}, '') COLLATE BINARY AS value, COUNT(*) FROM customers GROUP BY value")
+        return {value: count for value, count in rows}
+    
+    def _count_customer(self, customer, weight):
+        # Called inside the transaction that adds or changes the customer
+        keys = [('total', '')] + [(field, customer.get(field) if customer.get(field) is not None else '')
+                                  for field in CUSTOMER_REPORT_FIELDS]
+        self.connection.executemany(
+            "INSERT INTO customer_counts (dimension, value, count) VALUES (?, ?, ?) "
+            "ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count",
+            [(dimension, value, weight) for dimension, value in keys])
+        self.connection.execute("DELETE FROM customer_counts WHERE count = 0 AND dimension != 'total'")
+    
+    def rebuild_report_counters(self):
+        """Recount the report counters from the customers table."""
+        with self.connection:
+            self.connection.execute("DELETE FROM customer_counts")
+            self.connection.execute(
+                "INSERT INTO customer_counts (dimension, value, count) SELECT 'total', '', COUNT(*) FROM customers")
+            for field in CUSTOMER_REPORT_FIELDS:
+                self.connection.execute(
+                    f"INSERT INTO customer_counts (dimension, value, count) "
+                    f"SELECT ?, coalesce({field}, '') COLLATE BINARY AS value, COUNT(*) FROM customers GROUP BY value",
+                    (field,))
+    
+    def verify_report_counters(self, repair=False):
+        """
+        Recount the customers and compare with the report counters.
+        
+        Args:
+            repair (bool): Rebuild the counters if they drifted
+        
+        Returns:
+            dict: Dimension -> {value: (counted, recounted)} for every value that
+                  differs; 'total' holds the totals if they differ; empty if none
+        """
+        drift = {}
+        recounted_total = self.connection.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+        if self.count() != recounted_total:
+            drift['total'] = (self.count(), recounted_total)
+        for field in CUSTOMER_REPORT_FIELDS:
+            counted, recounted = self.count_by(field), self._recount(field)
+            values = {value: (counted.get(value, 0), recounted.get(value, 0))
+                      for value in counted.keys() | recounted.keys()
+                      if counted.get(value, 0) != recounted.get(value, 0)}
+            if values:
+                drift[field] = values
+        
+        if drift and repair:
+            self.rebuild_report_counters()
+            logger.warning(f"Repaired drifted customer report counters: {sorted(drift)}")
+        return drift
+    
+    def iter_customers(self):
+        """Yield every customer, one row at a time."""
+        for row in self.connection.execute("SELECT * FROM customers ORDER BY rowid"):
+            yield self._to_customer(row)
+    
+    @property
+    def customers(self):
+        """All customers as a list; prefer iter_customers, count or count_by on large databases."""
+        return list(self.iter_customers())
+    
     def get_customer(self, customer_id):
         """
         Get customer by ID.
         
         Args:
             customer_id (str): Customer ID
-            
+        
         Returns:
             dict: Customer data or None if not found
         """
-        for customer in self.customers:
-            if customer.get('customer_id') == customer_id:
-                return customer
-        return None
+        row = self.connection.execute("SELECT * FROM customers WHERE customer_id = ?", (customer_id,)).fetchone()
+        return self._to_customer(row) if row else None
     
     def add_customer(self, customer_data):
         """
@@ -79,22 +293,28 @@ class CustomerManager:
         
         Args:
             customer_data (dict): Customer data
-            
+        
         Returns:
             bool: Success status
         """
-        # Check if customer already exists
         customer_id = customer_data.get('customer_id')
-        if self.get_customer(customer_id):
-            logger.warning(f"Customer {customer_id} already exists")
-            return False
         
         # Add created_at timestamp if not present
         if 'created_at' not in customer_data:
             customer_data['created_at'] = datetime.now().isoformat()
         
-        self.customers.append(customer_data)
-        self.save_customers()
+        with self.connection:
+            added = self._insert_many([self._to_params(customer_data)])
+            if added:
+                self._count_customer(customer_data, 1)
+        
+        # Check if customer already exists
+        if not added:
+            logger.warning(f"Customer {customer_id} already exists")
+            return False
+        
+        if self.search_index is not None:
+            self.search_index.add(customer_id, customer_data)
         
         logger.info(f"Added new customer {customer_id}")
         return True
@@ -106,44 +326,83 @@ class CustomerManager:
         Args:
             customer_id (str): Customer ID
             updated_data (dict): Updated customer data
-            
+        
         Returns:
             bool: Success status
         """
-        for i, customer in enumerate(self.customers):
-            if customer.get('customer_id') == customer_id:
-                # Update customer data
-                self.customers[i].update(updated_data)
-                
-                # Add updated_at timestamp
-                self.customers[i]['updated_at'] = datetime.now().isoformat()
-                
-                self.save_customers()
-                
-                logger.info(f"Updated customer {customer_id}")
-                return True
+        with self.connection:
+            row = self.connection.execute("SELECT * FROM customers WHERE customer_id = ?", (customer_id,)).fetchone()
+            if row is None:
+                logger.warning(f"Customer {customer_id} not found for update")
+                return False
+            
+            # Update customer data
+            customer = self._to_customer(row)
+            customer.update(updated_data)
+            
+            # Add updated_at timestamp
+            customer['updated_at'] = datetime.now().isoformat()
+            
+            assignments = ', '.join(f"{field} = ?" for field in CUSTOMER_FIELDS + ['extra'])
+            try:
+                self.connection.execute(f"UPDATE customers SET {assignments} WHERE customer_id = ?",
+                                        self._to_params(customer) + [customer_id])
+            except sqlite3.IntegrityError:
+                logger.warning(f"Cannot update customer {customer_id}: ID {customer['customer_id']} already exists")
+                return False
+            self._count_customer(self._to_customer(row), -1)
+            self._count_customer(customer, 1)
+        
+        if self.search_index is not None:
+            if customer['customer_id'] != customer_id:
+                self.search_index.remove(customer_id)
+            self.search_index.add(customer['customer_id'], customer)
         
-        logger.warning(f"Customer {customer_id} not found for update")
-        return False
+        logger.info(f"Updated customer {customer_id}")
+        return True
+    
+    def build_search_index(self):
+        """Index the searchable fields of every customer for search_customers."""
+        self.search_index = TrigramIndex(CUSTOMER_SEARCH_FIELDS)
+        columns = ', '.join(('customer_id',) + CUSTOMER_SEARCH_FIELDS)
+        for row in self.connection.execute(f"SELECT {columns} FROM customers ORDER BY rowid"):
+            self.search_index.add(row['customer_id'], dict(row))
+        logger.info(f"Indexed {len(self.search_index)} customers for search")
     
-    def search_customers(self, search_term, search_field='name'):
+    def search_customers(self, search_term, search_field='name', limit=None, offset=0):
         """
         Search customers by a field.
         
+        Name, plate, brand and model searches use the trigram index, which is
+        built on the first search and kept up to date by add_customer and
+        update_customer; other fields are scanned.
+        
         Args:
             search_term (str): Search term
             search_field (str): Field to search in
-            
+            limit (int): Maximum number of customers to return, or None for all
+            offset (int): Number of matches to skip, for paging
+        
         Returns:
             list: Matching customers
         """
-        results = []
         search_term = search_term.lower()
         
-        for customer in self.customers:
-            field_value = customer.get(search_field, '').lower()
-            if search_term in field_value:
-                results.append(customer)
+        if search_field in CUSTOMER_SEARCH_FIELDS:
+            if self.search_index is None:
+                self.build_search_index()
+            customer_ids = self.search_index.search(search_field, search_term, limit, offset)
+            results = [self.get_customer(customer_id) for customer_id in customer_ids]
+        elif search_field in CUSTOMER_FIELDS:
+            rows = self.connection.execute(
+                f"SELECT * FROM customers WHERE instr(py_lower({search_field}), ?) > 0 "
+                f"ORDER BY rowid LIMIT ? OFFSET ?", (search_term, -1 if limit is None else limit, offset))
+            results = [self._to_customer(row) for row in rows]
+        else:
+            # Fields outside the schema are only in the JSON column
+            matches = (customer for customer in self.iter_customers()
+                       if search_term in str(customer.get(search_field, '')).lower())
+            results = list(islice(matches, offset, None if limit is None else offset + limit))
         
         logger.info(f"Found {len(results)} customers matching '{search_term}' in {search_field}")
         return results
@@ -156,26 +415,21 @@ class CustomerManager:
             plate_number (str): Vehicle plate number
             brand (str): Vehicle brand
             model (str): Vehicle model
-            
+        
         Returns:
             list: Matching customers
         """
-        results = []
+        conditions = []
+        params = []
+        for field, value in (('vehicle_plate', plate_number), ('vehicle_brand', brand), ('vehicle_model', model)):
+            if value:
+                conditions.append(f"{field} = ?")
+                params.append(value)
         
-        for customer in self.customers:
-            match = True
-            
-            if plate_number and customer.get('vehicle_plate', '').lower() != plate_number.lower():
-                match = False
-            
-            if brand and customer.get('vehicle_brand', '').lower() != brand.lower():
-                match = False
-            
-            if model and customer.get('vehicle_model', '').lower() != model.lower():
-                match = False
-            
-            if match:
-                results.append(customer)
+        query = "SELECT * FROM customers"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        results = [self._to_customer(row) for row in self.connection.execute(query + " ORDER BY rowid", params)]
         
         logger.info(f"Found {len(results)} customers matching vehicle criteria")
         return results
\ No newline at end of file
@@ -0,0 +1,158 @@
+# src/core/grant_batch.py
+import os
+import csv
+import json
+import logging
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+from core.grant_validator import GrantValidator, normalize_plate
+
+logger = logging.getLogger(__name__)
+
+# Validator of the current worker process, set up once by _init_worker
+_worker_validator = None
+
+def iter_grants(input_path):
+    """
+    Yield grants from a CSV or NDJSON file one at a time.
+    
+    Files ending in .ndjson or .jsonl hold one JSON object per line; any
+    other file is read as CSV with a header row. NDJSON values are
+    converted to strings, so numbers reach the validator as they would from
+    a CSV file. An NDJSON null and a field missing from a short CSV row
+    both become an empty string, which the validator reports like any
+    other blank field.
+    
+    Args:
+        input_path (str): Path to the grants file
+    """
+    with open(input_path, 'r', encoding='utf-8', newline='') as file:
+        if input_path.endswith(('.ndjson', '.jsonl')):
+            for line in file:
+                if line.strip():
+                    yield {field: str(value) if value is not None else ''
+                           for field, value in json.loads(line).items()}
+        else:
+            yield from csv.DictReader(file, restval='')
+
+def _init_worker(car_data_path, grants_data_path):
+    """
+    Load the catalog and existing grants once per worker process.
+    
+    Workers only check IDs and plates, so they never build the search index
+    or start the catalog watcher. They never save report counters either;
+    the parent updates them once when it appends the valid grants.
+    """
+    global _worker_validator
+    _worker_validator = GrantValidator(car_data_path, grants_data_path, save_counters=False)
+
+def _validate_chunk(chunk):
+    """Validate a list of grants inside a worker process."""
+    return [_worker_validator.validate_grant(grant) for grant in chunk]
+
+def iter_validate_grants(grants, validator, workers=1, chunk_size=256):
+    """
+    Lazily validate grants against the existing grants and the car catalog.
+    
+    With several workers, each worker loads its own validator for the same
+    files and at most two chunks per worker are in flight at a time.
+    
+    Args:
+        grants (iterable): Grant data dictionaries
+        validator (GrantValidator): Validator used when workers is 1
+        workers (int): Number of worker processes; 1 validates in-process
+        chunk_size (int): Grants sent to a worker at a time
+    
+    Yields:
+        tuple: (grant, validation result), in input order
+    """
+    if workers <= 1:
+        for grant in grants:
+            yield grant, validator.validate_grant(grant)
+        return
+    
+    logger.info(f"Validating grants across {workers} worker processes (chunk size {chunk_size})")
+    grants = iter(grants)
+    chunk_size = max(1, chunk_size)
+    
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(validator.car_data_path, validator.grants_data_path)) as executor:
+        pending = deque()
+        for chunk in iter(lambda: list(islice(grants, chunk_size)), []):
+            pending.append((chunk, executor.submit(_validate_chunk, chunk)))
+            # Futures are drained in submission order, matching the serial path
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
+
+def run_grant_batch(input_path, output_path, employee_id, validator=None, workers=None, chunk_size=None,
+                    import_valid=True):
+    """
+    Validate a file of grants and import the valid ones.
+    
+    One result per input row is streamed to `output_path` as NDJSON. Valid
+    grants are collected and appended to the grants file in one write at
+    the end, so a failed run leaves the grants file untouched. A plate that
+    appears more than once in the batch gets the same duplicate warning as
+    a plate already in the grants file.
+    
+    Args:
+        input_path (str): CSV or NDJSON file of grants
+        output_path (str): NDJSON file for the per-row results
+        employee_id (str): Employee recorded as adding the imported grants
+        validator (GrantValidator): Validator to use; one is created if not given
+        workers (int): Number of worker processes; 1 validates in-process
+        chunk_size (int): Grants sent to a worker at a time
+        import_valid (bool): Append valid grants to the grants file
+    
+    Returns:
+        dict: Counts of total, valid, invalid and imported grants
+    """
+    if workers is None or chunk_size is None:
+        from config.settings import BATCH_WORKERS, BATCH_CHUNK_SIZE
+        workers = workers or BATCH_WORKERS
+        chunk_size = chunk_size or BATCH_CHUNK_SIZE
+    
+    validator = validator or GrantValidator()
+    
+    summary = {'total': 0, 'valid': 0, 'invalid': 0, 'imported': 0}
+    valid_grants = []
+    batch_plates = set()
+    
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    with open(output_path, 'w', encoding='utf-8') as file:
+        results = iter_validate_grants(iter_grants(input_path), validator, workers=workers, chunk_size=chunk_size)
+        for row_number, (grant, result) in enumerate(results, 1):
+            plate = normalize_plate(grant.get('plate_number'))
+            if plate in batch_plates:
+                message = f"A grant with plate number {grant.get('plate_number')} already exists"
+                if message not in result['warnings']:
+                    result['warnings'].append(message)
+            batch_plates.add(plate)
+            
+            summary['total'] += 1
+            if result['is_valid']:
+                summary['valid'] += 1
+                valid_grants.append(grant)
+            else:
+                summary['invalid'] += 1
+            
+            file.write(json.dumps({'row': row_number, 'grant_id': grant.get('grant_id', ''), 'result': result},
+                                  separators=(',', ':')))
+            file.write('\n')
+    
+    if import_valid:
+        summary['imported'] = validator.append_grants(valid_grants, employee_id)
+    
+    logger.info(f"Grant batch {input_path}: {summary['total']} grants, {summary['valid']} valid, "
+                f"{summary['imported']} imported by employee {employee_id}")
+    return summary
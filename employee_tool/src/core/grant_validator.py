@@ -1,54 +1,119 @@
 # src/core/grant_validator.py
 import os
+import io
 import csv
 import logging
 from datetime import datetime
+from itertools import islice
+from time import perf_counter
+
+from utils.catalog_provider import file_signature, get_provider
+from utils.fuzzy_matcher import fuzzy_match
+from utils.instrumentation import metrics
+from utils.records import Record
+from utils.report_counters import ReportCounters
+from utils.search_index import TrigramIndex
 
 logger = logging.getLogger(__name__)
 
+# Fields search_grants answers from the in-memory trigram index
+GRANT_SEARCH_FIELDS = ('plate_number', 'brand', 'model', 'owner_name')
+
+GRANT_FIELDS = ['grant_id', 'plate_number', 'brand', 'model', 'year', 'owner_name', 'owner_id',
+                'grant_date', 'status', 'added_by', 'added_at', 'updated_by', 'updated_at']
+
+class GrantRecord(Record):
+    """One vehicle grant, in slots; see Record."""
+    
+    __slots__ = tuple(GRANT_FIELDS)
+    FIELDS = tuple(GRANT_FIELDS)
+    INTERNED = frozenset(['brand', 'model', 'year', 'status', 'added_by', 'updated_by', 'grant_date'])
+
+def _report_group(grant, field):
+    # Short CSV rows leave fields as None
+    value = grant.get(field)
+    return 'Unknown' if value is None else value
+
+# Groups generate_report counts grants by; kept up to date as grants change
+GRANT_REPORT_DIMENSIONS = {
+    'brand': lambda grant: _report_group(grant, 'brand'),
+    'model': lambda grant: (_report_group(grant, 'brand'), _report_group(grant, 'model')),
+    'year': lambda grant: _report_group(grant, 'year'),
+    'status': lambda grant: _report_group(grant, 'status'),
+    'added_by_day': lambda grant: ((grant.get('added_at') or '')[:10], grant.get('added_by') or ''),
+}
+
+def normalize_plate(plate_number):
+    """Return the key plates are compared by: upper case with spaces removed."""
+    return ''.join((plate_number or '').split()).upper()
+
 class GrantValidator:
-    """Validate vehicle grant information."""
+    """
+    Validate vehicle grant information.
+    
+    Grants are held in grant_data, in file order, with hash indexes from
+    grant ID and normalized plate to their positions, so duplicate checks,
+    lookups and adds do not depend on how many grants there are.
+    """
     
-    def __init__(self, car_data_path=None, grants_data_path=None):
+    def __init__(self, car_data_path=None, grants_data_path=None, watch_catalog=False, save_counters=True):
         """
         Initialize the grant validator.
         
         Args:
             car_data_path (str): Path to car data CSV file
             grants_data_path (str): Path to vehicle grants CSV file
+            watch_catalog (bool): Start the background catalog watcher; meant
+                                  for long-lived processes such as the CLI session
+            save_counters (bool): Write report counters to the counters file;
+                                  batch workers turn this off so only the
+                                  process that appends grants writes it
         """
-        from config.settings import CAR_DATA_PATH, VEHICLE_GRANTS_PATH
+        if car_data_path is None or grants_data_path is None:
+            from config.settings import CAR_DATA_PATH, VEHICLE_GRANTS_PATH
+            car_data_path = car_data_path or CAR_DATA_PATH
+            grants_data_path = grants_data_path or VEHICLE_GRANTS_PATH
         
-        self.car_data_path = car_data_path or CAR_DATA_PATH
-        self.grants_data_path = grants_data_path or VEHICLE_GRANTS_PATH
+        self.car_data_path = car_data_path
+        self.grants_data_path = grants_data_path
+        self.watch_catalog = watch_catalog
+        self.save_counters = save_counters
         
-        self.car_data = []
+        self.catalog_provider = None
         self.grant_data = []
+        self.grant_fields = list(GRANT_FIELDS)
+        # (mtime_ns, size) of the grants file as last loaded or written by us
+        self.grants_signature = None
+        # Report counters are saved next to the grants file
+        self.counters_path = os.path.splitext(self.grants_data_path)[0] + '.counts.json'
+        self.report_counters = ReportCounters(GRANT_REPORT_DIMENSIONS)
+        self._build_indexes()
         
         self.load_car_data()
         self.load_grant_data()
     
     def load_car_data(self):
-        """Load car data from CSV file."""
+        """
+        Attach to the shared catalog for the car data file.
+        
+        The catalog is loaded once per process, so constructing a validator
+        does no file I/O after the first one. With watch_catalog, it is also
+        reloaded in the background when the file changes.
+        """
         if not os.path.exists(self.car_data_path):
             logger.warning(f"Car data file not found: {self.car_data_path}")
-            return
         
-        try:
-            with open(self.car_data_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    row['year_start'] = int(row['year_start'])
-                    row['year_end'] = int(row['year_end'])
-                    self.car_data.append(row)
-            
-            logger.info(f"Loaded {len(self.car_data)} car records")
-        except Exception as e:
-            logger.error(f"Error loading car data: {e}")
-            self.car_data = []
+        self.catalog_provider = get_provider(self.car_data_path, watch=self.watch_catalog)
+        logger.info(f"Using car catalog with {len(self.catalog)} records")
+    
+    @property
+    def catalog(self):
+        """The current car catalog snapshot."""
+        return self.catalog_provider.current()
     
     def load_grant_data(self):
         """Load vehicle grant data from CSV file."""
+        self.grants_signature = file_signature(self.grants_data_path)
         if not os.path.exists(self.grants_data_path):
             logger.warning(f"Vehicle grants file not found: {self.grants_data_path}")
             return
@@ -56,12 +121,109 @@ class GrantValidator:
         try:
             with open(self.grants_data_path, 'r', encoding='utf-8') as file:
                 reader = csv.DictReader(file)
-                self.grant_data = list(reader)
+                self.grant_data = [GrantRecord(row) for row in reader]
+                self.grant_fields = list(reader.fieldnames or GRANT_FIELDS)
+            self._build_indexes()
+            
+            # Saved counters are used if they were written for this version of the file
+            counters = ReportCounters.load(GRANT_REPORT_DIMENSIONS, self.counters_path, self.grants_signature)
+            if counters is None:
+                counters = ReportCounters.from_records(GRANT_REPORT_DIMENSIONS, self.grant_data)
+                self._save_report_counters(counters)
+            self.report_counters = counters
             
             logger.info(f"Loaded {len(self.grant_data)} vehicle grant records")
         except Exception as e:
             logger.error(f"Error loading vehicle grant data: {e}")
             self.grant_data = []
+            self._build_indexes()
+            self.report_counters = ReportCounters(GRANT_REPORT_DIMENSIONS)
+    
+    def _save_report_counters(self, counters):
+        if not self.save_counters:
+            return
+        try:
+            counters.save(self.counters_path, self.grants_signature)
+        except OSError as e:
+            logger.warning(f"Could not save grant report counters: {e}")
+    
+    def verify_report_counters(self, repair=False):
+        """
+        Recount every grant and compare with the running report counters.
+        
+        Args:
+            repair (bool): Replace the running counters with the recount if they drifted
+        
+        Returns:
+            dict: Differences as returned by ReportCounters.diff (running, recounted); empty if none
+        """
+        recount = ReportCounters.from_records(GRANT_REPORT_DIMENSIONS, self.grant_data)
+        drift = self.report_counters.diff(recount)
+        if drift and repair:
+            self.report_counters = recount
+            self._save_report_counters(recount)
+            logger.warning(f"Repaired drifted grant report counters: {sorted(drift)}")
+        return drift
+    
+    def reload_if_changed(self):
+        """
+        Reload the grants if the file changed since it was last loaded or written here.
+        
+        Returns:
+            bool: True if the grants were reloaded
+        """
+        if file_signature(self.grants_data_path) == self.grants_signature:
+            return False
+        logger.info(f"Vehicle grants file changed, reloading {self.grants_data_path}")
+        self.grant_data = []
+        self._build_indexes()
+        self.report_counters = ReportCounters(GRANT_REPORT_DIMENSIONS)
+        self.load_grant_data()
+        return True
+    
+    def _build_indexes(self):
+        # All indexes refer to grants by their position in grant_data
+        self._positions_by_id = {}
+        self._positions_by_plate = {}
+        # Built by the first search_grants call; batch workers never search
+        self.search_index = None
+        for position in range(len(self.grant_data)):
+            self._index_grant(position)
+    
+    def _index_grant(self, position):
+        grant = self.grant_data[position]
+        # The first grant with an ID wins, as with the old linear lookup
+        self._positions_by_id.setdefault(grant.get('grant_id'), position)
+        self._positions_by_plate.setdefault(normalize_plate(grant.get('plate_number')), set()).add(position)
+        if self.search_index is not None:
+            self.search_index.add(position, grant)
+    
+    def _unindex_grant(self, position):
+        grant = self.grant_data[position]
+        if self._positions_by_id.get(grant.get('grant_id')) == position:
+            del self._positions_by_id[grant.get('grant_id')]
+        plate = normalize_plate(grant.get('plate_number'))
+        positions = self._positions_by_plate[plate]
+        positions.discard(position)
+        if not positions:
+            del self._positions_by_plate[plate]
+        if self.search_index is not None:
+            self.search_index.remove(position)
+    
+    def find_duplicate_plate(self, plate_number, grant_id=None):
+        """
+        Find a grant for the same plate under another grant ID.
+        
+        Plates match ignoring case and spaces.
+        
+        Returns:
+            dict: The first such grant, or None
+        """
+        for position in sorted(self._positions_by_plate.get(normalize_plate(plate_number), ())):
+            grant = self.grant_data[position]
+            if grant.get('grant_id', '') != (grant_id or ''):
+                return grant
+        return None
     
     def validate_grant(self, grant_data):
         """
@@ -73,6 +235,11 @@ class GrantValidator:
         Returns:
             dict: Validation result
         """
+        # Stage timings are only taken while instrumentation is enabled
+        timed = metrics.enabled
+        if timed:
+            started = mark = perf_counter()
+        
         result = {
             'is_valid': True,
             'errors': [],
@@ -85,6 +252,8 @@ class GrantValidator:
         if not self._validate_plate_format(plate_number):
             result['is_valid'] = False
             result['errors'].append('Invalid plate number format')
+        if timed:
+            mark = metrics.lap('grant.plate', mark)
         
         # Validate vehicle details
         brand = grant_data.get('brand', '')
@@ -97,44 +266,49 @@ class GrantValidator:
             year_int = None
             result['errors'].append('Invalid year format')
             result['is_valid'] = False
-        
-        # Check if brand and model exist in our database
-        vehicle_exists = False
-        for car in self.car_data:
-            if car['brand'].lower() == brand.lower() and car['model'].lower() == model.lower():
-                vehicle_exists = True
-                
-                # Check if year is within valid range
-                if year_int and not (car['year_start'] <= year_int <= car['year_end']):
-                    result['warnings'].append(f'Year {year} is outside the valid range for {brand} {model} ({car["year_start"]}-{car["year_end"]})')
-                    result['suggestions']['valid_year_range'] = f"{car['year_start']}-{car['year_end']}"
-                break
-        
-        if not vehicle_exists:
+        if timed:
+            mark = metrics.lap('grant.year_parse', mark)
+        
+        # Check if brand and model exist in our database; one snapshot is
+        # used for the whole validation even if the catalog reloads meanwhile
+        catalog = self.catalog
+        matched_brand = catalog.lookup_brand(brand)
+        matched_model = catalog.lookup_model(matched_brand, model) if matched_brand else None
+        if timed:
+            mark = metrics.lap('grant.catalog_lookup', mark)
+        
+        if matched_model:
+            # Check if year is within valid range
+            year_start, year_end = catalog.year_range(matched_brand, matched_model)
+            if year_int and not (year_start <= year_int <= year_end):
+                result['warnings'].append(f'Year {year} is outside the valid range for {brand} {model} ({year_start}-{year_end})')
+                result['suggestions']['valid_year_range'] = f"{year_start}-{year_end}"
+            if timed:
+                mark = metrics.lap('grant.year_check', mark)
+        else:
             result['warnings'].append(f'Vehicle {brand} {model} not found in database')
             
             # Try to find similar brands/models
-            from utils.fuzzy_matcher import fuzzy_match
-            
-            brands = list(set(car['brand'] for car in self.car_data))
-            matched_brand, brand_score = fuzzy_match(brand, brands)
+            matched_brand, brand_score = fuzzy_match(brand, catalog.brand_index())
+            if timed:
+                mark = metrics.lap('grant.brand_match', mark)
             
             if matched_brand and brand_score > 70:
                 result['suggestions']['brand'] = matched_brand
                 
                 # Try to match model within the suggested brand
-                models = list(set(car['model'] for car in self.car_data if car['brand'] == matched_brand))
-                matched_model, model_score = fuzzy_match(model, models)
+                matched_model, model_score = fuzzy_match(model, catalog.model_index(matched_brand))
+                if timed:
+                    mark = metrics.lap('grant.model_match', mark)
                 
                 if matched_model and model_score > 70:
                     result['suggestions']['model'] = matched_model
         
         # Check for duplicate grants
-        for grant in self.grant_data:
-            if (grant.get('plate_number', '').lower() == plate_number.lower() and 
-                grant.get('grant_id', '') != grant_data.get('grant_id', '')):
-                result['warnings'].append(f'A grant with plate number {plate_number} already exists')
-                break
+        if self.find_duplicate_plate(plate_number, grant_data.get('grant_id')):
+            result['warnings'].append(f'A grant with plate number {plate_number} already exists')
+        if timed:
+            mark = metrics.lap('grant.duplicate_scan', mark)
         
         # Validate owner information
         owner_name = grant_data.get('owner_name', '')
@@ -155,6 +329,9 @@ class GrantValidator:
             except ValueError:
                 result['errors'].append('Invalid grant date format (use YYYY-MM-DD)')
                 result['is_valid'] = False
+        if timed:
+            metrics.lap('grant.owner_checks', mark)
+            metrics.record('grant.total', perf_counter() - started)
         
         return result
     
@@ -191,28 +368,8 @@ class GrantValidator:
         if not validation_result['is_valid']:
             return False, validation_result
         
-        # Add additional fields
-        grant_data['added_by'] = employee_id
-        grant_data['added_at'] = datetime.now().isoformat()
-        grant_data['status'] = 'active'
-        
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(self.grants_data_path), exist_ok=True)
-        
-        # Check if file exists to determine if we need to write headers
-        file_exists = os.path.exists(self.grants_data_path)
-        
         try:
-            with open(self.grants_data_path, 'a', encoding='utf-8', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=grant_data.keys())
-                
-                if not file_exists:
-                    writer.writeheader()
-                
-                writer.writerow(grant_data)
-            
-            # Reload grant data
-            self.load_grant_data()
+            self.append_grants([grant_data], employee_id)
             
             logger.info(f"Added new vehicle grant {grant_data.get('grant_id')} by employee {employee_id}")
             return True, validation_result
@@ -220,6 +377,58 @@ class GrantValidator:
             logger.error(f"Error adding vehicle grant: {e}")
             return False, {'is_valid': False, 'errors': [str(e)]}
     
+    def append_grants(self, grants, employee_id):
+        """
+        Append already validated grants to the grants file with one write.
+        
+        The audit fields are set on each grant, the rows are formatted in
+        memory and written in a single buffered write, and the grants are
+        indexed without reloading the file.
+        
+        Args:
+            grants (list): Grant data dictionaries
+            employee_id (str): ID of employee adding the grants
+        
+        Returns:
+            int: Number of grants appended
+        """
+        if not grants:
+            return 0
+        
+        added_at = datetime.now().isoformat()
+        for grant in grants:
+            # Add additional fields
+            grant['added_by'] = employee_id
+            grant['added_at'] = added_at
+            grant['status'] = 'active'
+        
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(self.grants_data_path), exist_ok=True)
+        
+        # Check if file exists to determine if we need to write headers
+        file_exists = os.path.exists(self.grants_data_path)
+        
+        # Write in the file's column order so the rows line up with its header
+        if not file_exists:
+            self.grant_fields = list(GRANT_FIELDS) + [key for key in grants[0] if key not in GRANT_FIELDS]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.grant_fields, extrasaction='ignore')
+        if not file_exists:
+            writer.writeheader()
+        writer.writerows(grants)
+        
+        with open(self.grants_data_path, 'a', encoding='utf-8', newline='') as file:
+            file.write(buffer.getvalue())
+        
+        # Keep the loaded grants and their indexes in step with the file
+        for grant in grants:
+            self.grant_data.append(GrantRecord({field: grant.get(field, '') for field in self.grant_fields}))
+            self._index_grant(len(self.grant_data) - 1)
+            self.report_counters.add(self.grant_data[-1])
+        self.grants_signature = file_signature(self.grants_data_path)
+        self._save_report_counters(self.report_counters)
+        return len(grants)
+    
     def update_grant(self, grant_id, updated_data, employee_id):
         """
         Update an existing vehicle grant.
@@ -233,13 +442,9 @@ class GrantValidator:
             tuple: (success, validation_result)
         """
         # Find the grant
-        grant_index = -1
-        for i, grant in enumerate(self.grant_data):
-            if grant.get('grant_id') == grant_id:
-                grant_index = i
-                break
+        grant_index = self._positions_by_id.get(grant_id)
         
-        if grant_index == -1:
+        if grant_index is None:
             logger.warning(f"Grant {grant_id} not found for update")
             return False, {'is_valid': False, 'errors': ['Grant not found']}
         
@@ -258,15 +463,22 @@ class GrantValidator:
         updated_grant['updated_at'] = datetime.now().isoformat()
         
         # Update the grant in our list
+        self._unindex_grant(grant_index)
+        self.report_counters.remove(self.grant_data[grant_index])
         self.grant_data[grant_index] = updated_grant
+        self._index_grant(grant_index)
+        self.report_counters.add(updated_grant)
         
         # Save all grants back to file
         try:
-            with open(self.grants_data_path, 'w', encoding='utf-8', newline='') as file:
-                if self.grant_data:
-                    writer = csv.DictWriter(file, fieldnames=self.grant_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(self.grant_data)
+            temp_path = f"{self.grants_data_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=self.grant_fields, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(self.grant_data)
+            os.replace(temp_path, self.grants_data_path)
+            self.grants_signature = file_signature(self.grants_data_path)
+            self._save_report_counters(self.report_counters)
             
             logger.info(f"Updated vehicle grant {grant_id} by employee {employee_id}")
             return True, validation_result
@@ -284,29 +496,44 @@ class GrantValidator:
         Returns:
             dict: Grant data or None if not found
         """
-        for grant in self.grant_data:
-            if grant.get('grant_id') == grant_id:
-                return grant
-        return None
+        position = self._positions_by_id.get(grant_id)
+        return self.grant_data[position] if position is not None else None
     
-    def search_grants(self, search_term, search_field='plate_number'):
+    def build_search_index(self):
+        """Index the searchable fields of every grant for search_grants."""
+        self.search_index = TrigramIndex(GRANT_SEARCH_FIELDS)
+        for position, grant in enumerate(self.grant_data):
+            self.search_index.add(position, grant)
+        logger.info(f"Indexed {len(self.search_index)} grants for search")
+    
+    def search_grants(self, search_term, search_field='plate_number', limit=None, offset=0):
         """
         Search vehicle grants by a field.
         
+        Plate, brand, model and owner name searches use the trigram index,
+        which is built on the first search and kept up to date as grants
+        are added and updated; other fields are scanned.
+        
         Args:
             search_term (str): Search term
             search_field (str): Field to search in
+            limit (int): Maximum number of grants to return, or None for all
+            offset (int): Number of matches to skip, for paging
             
         Returns:
             list: Matching grants
         """
-        results = []
         search_term = search_term.lower()
         
-        for grant in self.grant_data:
-            field_value = grant.get(search_field, '').lower()
-            if search_term in field_value:
-                results.append(grant)
+        if search_field in GRANT_SEARCH_FIELDS:
+            if self.search_index is None:
+                self.build_search_index()
+            positions = self.search_index.search(search_field, search_term, limit, offset)
+            results = [self.grant_data[i] for i in positions]
+        else:
+            matches = (grant for grant in self.grant_data
+                       if search_term in (grant.get(search_field) or '').lower())
+            results = list(islice(matches, offset, None if limit is None else offset + limit))
         
         logger.info(f"Found {len(results)} grants matching '{search_term}' in {search_field}")
-        return results
\ No newline at end of file
+        return results
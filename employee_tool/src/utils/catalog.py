@@ -0,0 +1,279 @@
+import os
+import sys
+import logging
+import threading
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+from utils.data_loader import load_car_data
+from utils.fuzzy_matcher import FuzzyIndex
+
+logger = logging.getLogger(__name__)
+
+# Model index handed out for brands the catalog does not have
+_EMPTY_INDEX = FuzzyIndex(())
+
+class VehicleCatalog:
+    """
+    Indexed view over the car dataset.
+
+    Rows are folded into brand -> model -> (year_start, year_end) dictionaries
+    once, with lowercased lookup keys precomputed, so validation never has to
+    scan the raw rows. When the dataset lists the same brand/model twice the
+    first row wins, matching the old linear-scan behaviour.
+
+    A catalog restored from a snapshot (from_state) may hold brands whose
+    models are still packed; each brand is unpacked on first use.
+    """
+
+    def __init__(self, car_data=None):
+        """
+        Build the catalog indexes.
+
+        Args:
+            car_data (list): Rows as returned by load_car_data
+        """
+        self._years = {}        # brand -> {model: (year_start, year_end)}, None while packed
+        self._brand_keys = {}   # brand.lower() -> brand
+        self._model_keys = {}   # brand -> {model.lower(): model}
+        self._brand_index = None
+        self._model_indexes = {}
+        self._sections = {}     # brand -> packed section token, see from_state
+        self._load_section = None
+        self._section_lock = threading.Lock()
+        self._size = 0
+        self.version = 0        # bumped on every change, for dependent caches
+        self.frozen = False
+
+        for car in car_data or []:
+            self.add(car['brand'], car['model'], car['year_start'], car['year_end'])
+
+    @classmethod
+    def from_csv(cls, car_data_path):
+        """Load the car dataset from CSV and index it."""
+        catalog = cls(load_car_data(car_data_path))
+        logger.info(f"Car catalog built: {len(catalog.brands())} brands, {len(catalog)} models")
+        return catalog
+
+    @classmethod
+    def from_state(cls, state, load_section, frozen=True):
+        """
+        Rebuild a catalog from to_state() output.
+
+        Args:
+            state (dict): Brand-level state; state['sections'] maps each brand
+                to a token for its packed models
+            load_section (callable): Turns a token back into the brand's
+                to_state() section (models, model keys, model index state)
+            frozen (bool): Return the catalog read-only; pass False to apply
+                further changes before freezing it
+        """
+        catalog = cls()
+        catalog._years = dict.fromkeys(state['brands'])
+        catalog._brand_keys = state['brand_keys']
+        catalog._brand_index = FuzzyIndex.from_state(state['brand_index'])
+        catalog._sections = dict(state['sections'])
+        catalog._load_section = load_section
+        catalog._size = state['size']
+        catalog.frozen = frozen
+        return catalog
+
+    def to_state(self):
+        """
+        Return the catalog and its fuzzy indexes as plain dicts, lists and
+        tuples, suitable for marshal. Per-brand data is split out into
+        state['sections'] so it can be stored and unpacked separately.
+        """
+        sections = {}
+        for brand in self._years:
+            models = self._models(brand)
+            sections[brand] = (models, self._model_keys[brand], self.model_index(brand).to_state())
+        return {
+            'brands': list(self._years),
+            'brand_keys': self._brand_keys,
+            'brand_index': self.brand_index().to_state(),
+            'size': self._size,
+            'sections': sections,
+        }
+
+    def _models(self, brand):
+        """Return the {model: year range} dict of an exact brand, unpacking it if needed."""
+        models = self._years.get(brand)
+        if models is None and brand in self._sections:
+            with self._section_lock:
+                token = self._sections.get(brand)
+                if token is not None:
+                    models, model_keys, index_state = self._load_section(token)
+                    self._model_keys[brand] = model_keys
+                    self._model_indexes[brand] = FuzzyIndex.from_state(index_state)
+                    # Published last: a non-None entry means the brand is complete
+                    self._years[brand] = models
+                    del self._sections[brand]
+            models = self._years.get(brand)
+        return models
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        brand, model = key
+        return model in (self._models(brand) or ())
+
+    def brands(self):
+        """Return all brands in dataset order."""
+        return list(self._years)
+
+    def models(self, brand):
+        """Return the models of an exact brand name, in dataset order."""
+        return list(self._models(brand) or ())
+
+    def brand_index(self):
+        """Return the fuzzy-match candidate index over all brands."""
+        if self._brand_index is None:
+            self._brand_index = FuzzyIndex(self._years)
+        return self._brand_index
+
+    def model_index(self, brand):
+        """Return the fuzzy-match candidate index over the models of an exact brand."""
+        models = self._models(brand)
+        if models is None:
+            # Unknown brands share one empty index and leave the catalog unchanged
+            return _EMPTY_INDEX
+        index = self._model_indexes.get(brand)
+        if index is None:
+            index = self._model_indexes[brand] = FuzzyIndex(models)
+        return index
+
+    def freeze(self):
+        """
+        Build every fuzzy index up front and make the catalog read-only.
+
+        Frozen catalogs are the snapshots CatalogProvider hands out; nothing
+        in them changes after this call (brands still packed in a snapshot
+        are unpacked on demand), so threads can share them freely.
+        """
+        self.brand_index()
+        for brand in self._years:
+            if brand not in self._sections:
+                self.model_index(brand)
+        self.frozen = True
+        return self
+
+    def year_range(self, brand, model):
+        """Return (year_start, year_end) for an exact brand/model, or None."""
+        return (self._models(brand) or {}).get(model)
+
+    def lookup_brand(self, brand):
+        """Return the canonical spelling of a brand, ignoring case, or None."""
+        if not brand:
+            return None
+        return self._brand_keys.get(brand.lower())
+
+    def lookup_model(self, brand, model):
+        """Return the canonical spelling of a model of an exact brand, ignoring case, or None."""
+        if not model or self._models(brand) is None:
+            return None
+        return self._model_keys.get(brand, {}).get(model.lower())
+
+    def add(self, brand, model, year_start, year_end):
+        """
+        Add a brand/model entry.
+
+        Returns:
+            bool: False if the brand/model was already present
+        """
+        if self.frozen:
+            raise RuntimeError("Catalog snapshot is read-only")
+        models = self._models(brand)
+        if models is None:
+            models = self._years[brand] = {}
+        if model in models:
+            return False
+
+        models[model] = (year_start, year_end)
+        if len(models) == 1:
+            self._brand_index = None
+        self._model_indexes.pop(brand, None)
+        self._brand_keys.setdefault(brand.lower(), brand)
+        self._model_keys.setdefault(brand, {}).setdefault(model.lower(), model)
+        self._size += 1
+        self.version += 1
+        return True
+
+    def set_year_range(self, brand, model, year_start, year_end):
+        """
+        Replace the year range of an existing brand/model.
+
+        Returns:
+            tuple: The previous range, or None if the entry does not exist
+        """
+        if self.frozen:
+            raise RuntimeError("Catalog snapshot is read-only")
+        models = self._models(brand)
+        if not models or model not in models:
+            return None
+
+        old_range = models[model]
+        models[model] = (year_start, year_end)
+        self.version += 1
+        return old_range
+
+    def remove(self, brand, model):
+        """
+        Remove a brand/model entry; a brand left without models is removed too.
+
+        Returns:
+            tuple: The removed entry's year range, or None if it does not exist
+        """
+        if self.frozen:
+            raise RuntimeError("Catalog snapshot is read-only")
+        models = self._models(brand)
+        if not models or model not in models:
+            return None
+
+        old_range = models.pop(model)
+        model_keys = self._model_keys.get(brand, {})
+        if model_keys.get(model.lower()) == model:
+            # Fall back to another model with the same lowercase spelling, if any
+            del model_keys[model.lower()]
+            for other in models:
+                if other.lower() == model.lower():
+                    model_keys[other.lower()] = other
+                    break
+        self._model_indexes.pop(brand, None)
+        if not models:
+            del self._years[brand]
+            self._model_keys.pop(brand, None)
+            if self._brand_keys.get(brand.lower()) == brand:
+                # Fall back to another brand with the same lowercase spelling, if any
+                del self._brand_keys[brand.lower()]
+                for other in self._years:
+                    if other.lower() == brand.lower():
+                        self._brand_keys[other.lower()] = other
+                        break
+            self._brand_index = None
+        self._size -= 1
+        self.version += 1
+        return old_range
+
+    def to_rows(self):
+        """Return the catalog as car dataset rows, in dataset order."""
+        return [
+            {'brand': brand, 'model': model, 'year_start': start, 'year_end': end}
+            for brand in self._years
+            for model, (start, end) in self._models(brand).items()
+        ]
+
+if __name__ == "__main__":
+    # Test the catalog
+    from config.settings import CAR_DATA_PATH
+
+    catalog = VehicleCatalog.from_csv(CAR_DATA_PATH)
+    print(f"Brands: {catalog.brands()}")
+    for brand in catalog.brands():
+        print(f"{brand}: {catalog.models(brand)}")
@@ -0,0 +1,132 @@
+import os
+import sys
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+# Add the parent directory to sys.path when run directly
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(current_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+# Histogram bucket upper bounds in microseconds; the last bucket is open-ended
+BUCKET_BOUNDS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 50000, 100000)
+
+class Histogram:
+    """Fixed-bucket latency histogram with count, total, min and max."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds):
+        self.buckets[bisect_left(BUCKET_BOUNDS_US, seconds * 1e6)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Return the bucket upper bound (us) below which `fraction` of samples fall."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_US, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return round(self.max * 1e6, 1)
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_us': round(self.total / self.count * 1e6, 2) if self.count else None,
+            'min_us': round(self.min * 1e6, 2) if self.min is not None else None,
+            'max_us': round(self.max * 1e6, 2) if self.max is not None else None,
+            'p50_us': self.percentile(0.5),
+            'p99_us': self.percentile(0.99),
+            'buckets': {
+                (f"<={bound}" if i < len(BUCKET_BOUNDS_US) else f">{BUCKET_BOUNDS_US[-1]}"): count
+                for i, (bound, count) in enumerate(zip(BUCKET_BOUNDS_US + (None,), self.buckets))
+                if count
+            },
+        }
+
+class Instrumentation:
+    """
+    Optional per-stage timing and counters for the validation hot paths.
+
+    Instrumented code checks `enabled` before reading the clock, so while
+    disabled (the default) a stage costs one attribute lookup. Stages are
+    recorded into histograms by name; counters are plain integers.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def record(self, stage, seconds):
+        """Add one duration for a stage."""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.add(seconds)
+
+    def lap(self, stage, since):
+        """Record the time since `since` (a perf_counter value) for a stage and return the current time."""
+        now = perf_counter()
+        self.record(stage, now - since)
+        return now
+
+    def count(self, name, amount=1):
+        """Increase a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """Return all stage histograms and counters as a dictionary."""
+        with self._lock:
+            return {
+                'stages': {stage: histogram.snapshot() for stage, histogram in self._histograms.items()},
+                'counters': dict(self._counters),
+            }
+
+    def reset(self):
+        """Drop all recorded stages and counters."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+def format_report(snapshot):
+    """Render a snapshot as a plain-text stage breakdown."""
+    lines = [f"{'stage':<24} {'count':>9} {'total_ms':>10} {'mean_us':>9} {'p50_us':>8} {'p99_us':>8} {'max_us':>9}"]
+    for stage, stats in sorted(snapshot['stages'].items()):
+        lines.append(f"{stage:<24} {stats['count']:>9} {stats['total_ms']:>10.2f} {stats['mean_us']:>9.2f} "
+                     f"{stats['p50_us']:>8} {stats['p99_us']:>8} {stats['max_us']:>9.2f}")
+    if snapshot['counters']:
+        lines.append("")
+        lines.append(f"{'counter':<24} {'value':>9}")
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"{name:<24} {value:>9}")
+    return '\n'.join(lines)
+
+# Process-wide instance used by the validators and the fuzzy matcher
+metrics = Instrumentation()
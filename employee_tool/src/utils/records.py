@@ -0,0 +1,104 @@
+import sys
+from collections.abc import Mapping, MutableMapping
+
+class Record(MutableMapping):
+    """
+    Row with a fixed set of fields stored in __slots__, usable as a dict.
+
+    A csv.DictReader row is a dict that repeats every key for every row;
+    a record keeps the values in slots declared once per class, which
+    takes a fraction of the memory over millions of rows. Values of INTERNED fields
+    (brands, statuses, employee IDs and other low-cardinality strings) are
+    interned, so equal values share one string object.
+
+    Records behave like the row dicts they replace: they support item
+    access, get, keys/items/values, update, `in`, len, iteration in field
+    order and == against dicts. A field that was never set is missing, as
+    an absent key would be. Keys outside FIELDS go to a small per-record
+    dict, so no input column is lost.
+
+    Subclasses set __slots__ = FIELDS.
+    """
+
+    __slots__ = ('_extra',)
+    FIELDS = ()
+    INTERNED = frozenset()
+    _field_set = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def __init__(self, data=(), **fields):
+        self._extra = None
+        if fields:
+            data = dict(data, **fields)
+        # __setitem__ inlined: records are built once per loaded row
+        field_set, interned, intern = self._field_set, self.INTERNED, sys.intern
+        for key, value in (data.items() if isinstance(data, Mapping) else data):
+            if key in field_set:
+                if key in interned and type(value) is str:
+                    value = intern(value)
+                setattr(self, key, value)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = value
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            if key in self.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._field_set:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for field in self.FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        # Mapping.get goes through a raised KeyError for missing keys
+        if key in self._field_set:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def copy(self):
+        return type(self)(self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
@@ -0,0 +1,121 @@
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ReportCounters:
+    """
+    Running record counts per group, for reports that should not rescan records.
+
+    Each dimension maps a record to the group it is counted under. Stores
+    call add() and remove() as records come and go (an update is a remove
+    of the old record and an add of the new one), so a report reads
+    counts() in time proportional to the number of groups.
+    """
+
+    def __init__(self, dimensions):
+        """
+        Args:
+            dimensions (dict): Dimension name -> function(record) returning its group
+        """
+        self.dimensions = dimensions
+        self.total = 0
+        self._counts = {name: {} for name in dimensions}
+
+    @classmethod
+    def from_records(cls, dimensions, records):
+        """Count a full set of records."""
+        counters = cls(dimensions)
+        for record in records:
+            counters.add(record)
+        return counters
+
+    def add(self, record, weight=1):
+        """Count a record in its group of every dimension."""
+        self.total += weight
+        for name, group_of in self.dimensions.items():
+            counts = self._counts[name]
+            group = group_of(record)
+            count = counts.get(group, 0) + weight
+            if count:
+                counts[group] = count
+            else:
+                del counts[group]
+
+    def remove(self, record):
+        """Stop counting a record that was added before."""
+        self.add(record, -1)
+
+    def counts(self, name):
+        """Return a copy of the group -> count table of a dimension."""
+        return dict(self._counts[name])
+
+    def diff(self, other):
+        """
+        Compare with another set of counters over the same dimensions.
+
+        Returns:
+            dict: Dimension -> {group: (count here, count in other)} for every group
+                  that differs; 'total' holds the record totals if they differ
+        """
+        drift = {}
+        if self.total != other.total:
+            drift['total'] = (self.total, other.total)
+        for name in self.dimensions:
+            mine, theirs = self._counts[name], other._counts[name]
+            groups = {group: (mine.get(group, 0), theirs.get(group, 0))
+                      for group in mine.keys() | theirs.keys() if mine.get(group, 0) != theirs.get(group, 0)}
+            if groups:
+                drift[name] = groups
+        return drift
+
+    def save(self, path, signature):
+        """
+        Write the counters as JSON through a temporary file and a rename.
+
+        Args:
+            path (str): Counters file
+            signature: Signature of the data file the counters describe
+        """
+        # Groups may be tuples, so each table is stored as [group, count] pairs
+        state = {
+            'signature': signature,
+            'total': self.total,
+            'counts': {name: list(counts.items()) for name, counts in self._counts.items()},
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, dimensions, path, signature):
+        """
+        Read counters saved by save().
+
+        Returns:
+            ReportCounters: The counters, or None if the file is missing,
+            unreadable, for other dimensions or for another version of the data
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(f"Ignoring unreadable report counters in {path}")
+            return None
+
+        saved_signature = state.get('signature')
+        if (tuple(saved_signature) if saved_signature else None) != signature:
+            return None
+        if set(state.get('counts', {})) != set(dimensions):
+            return None
+
+        counters = cls(dimensions)
+        counters.total = state['total']
+        for name, pairs in state['counts'].items():
+            counters._counts[name] = {tuple(group) if isinstance(group, list) else group: count
+                                      for group, count in pairs}
+        return counters
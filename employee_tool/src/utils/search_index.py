@@ -0,0 +1,127 @@
+from itertools import islice
+
+class TrigramIndex:
+    """
+    Inverted n-gram index for case-insensitive substring search.
+
+    Each indexed field maps every n-gram of its lowercased values to the
+    records containing it. A search intersects the posting sets of the
+    term's n-grams and checks only those candidates with `term in value`,
+    instead of lowercasing every value of every record per query. Records
+    are added, updated and removed one at a time, and results come back in
+    the order records were first added.
+    """
+
+    def __init__(self, fields, n=3):
+        """
+        Args:
+            fields (iterable): Record fields to index
+            n (int): N-gram length
+        """
+        self.fields = tuple(fields)
+        self.n = n
+        # field -> n-gram -> set of document numbers
+        self._postings = {field: {} for field in self.fields}
+        # field -> document number -> lowercased value, in document order
+        self._values = {field: {} for field in self.fields}
+        self._docs = {}
+        self._keys = {}
+        self._next_doc = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, key):
+        return key in self._docs
+
+    def _grams(self, value):
+        n = self.n
+        return {value[i:i + n] for i in range(len(value) - n + 1)}
+
+    def add(self, key, record):
+        """
+        Index a record under `key`, replacing what was indexed for it before.
+
+        An updated record keeps its position in the result order.
+        """
+        doc = self._docs.get(key)
+        if doc is None:
+            doc = self._next_doc
+            self._next_doc += 1
+            self._docs[key] = doc
+            self._keys[doc] = key
+
+        for field in self.fields:
+            value = record.get(field)
+            value = str(value).lower() if value is not None else ''
+            values = self._values[field]
+            previous = values.get(doc)
+            if previous == value:
+                continue
+            postings = self._postings[field]
+            new_grams = self._grams(value)
+            if previous is not None:
+                old_grams = self._grams(previous)
+                for gram in old_grams - new_grams:
+                    self._discard(postings, gram, doc)
+                new_grams -= old_grams
+            for gram in new_grams:
+                docs = postings.get(gram)
+                if docs is None:
+                    postings[gram] = {doc}
+                else:
+                    docs.add(doc)
+            values[doc] = value
+
+    def remove(self, key):
+        """Drop a record from the index; unknown keys are ignored."""
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        del self._keys[doc]
+        for field in self.fields:
+            value = self._values[field].pop(doc)
+            postings = self._postings[field]
+            for gram in self._grams(value):
+                self._discard(postings, gram, doc)
+
+    @staticmethod
+    def _discard(postings, gram, doc):
+        docs = postings[gram]
+        docs.discard(doc)
+        if not docs:
+            del postings[gram]
+
+    def search(self, field, term, limit=None, offset=0):
+        """
+        Find records whose `field` contains `term`, ignoring case.
+
+        Args:
+            field (str): An indexed field
+            term (str): Substring to look for
+            limit (int): Maximum number of keys to return, or None for all
+            offset (int): Number of matches to skip, for paging
+
+        Returns:
+            list: Keys of matching records, in the order they were added
+        """
+        term = term.lower()
+        values = self._values[field]
+
+        if len(term) < self.n:
+            # Too short to have an n-gram; check the stored lowercased values
+            candidates = values
+        else:
+            postings = self._postings[field]
+            posting_sets = []
+            for gram in self._grams(term):
+                docs = postings.get(gram)
+                if not docs:
+                    return []
+                posting_sets.append(docs)
+            posting_sets.sort(key=len)
+            candidates = sorted(posting_sets[0].intersection(*posting_sets[1:]))
+
+        matches = (self._keys[doc] for doc in candidates if term in values[doc])
+        stop = offset + limit if limit is not None else None
+        return list(islice(matches, offset, stop))
@@ -0,0 +1,441 @@
+import unittest
+import os
+import sys
+import csv
+import json
+import shutil
+import tempfile
+import importlib
+
+# The employee tool's src packages share names with the customer tool's
+# (config, core, utils), so they are imported with those names set aside
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, '..', 'src'))
+SHARED_PACKAGES = ('config', 'core', 'utils')
+
+def import_employee_modules(*names):
+    def shared(module_name):
+        return module_name.split('.')[0] in SHARED_PACKAGES
+    
+    saved = {name: module for name, module in sys.modules.items() if shared(name)}
+    for name in saved:
+        del sys.modules[name]
+    sys.path.insert(0, src_dir)
+    try:
+        return [importlib.import_module(name) for name in names]
+    finally:
+        sys.path.remove(src_dir)
+        for name in [name for name in sys.modules if shared(name)]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+customer_manager, grant_validator, grant_batch, search_index, records = import_employee_modules(
+    'core.customer_manager', 'core.grant_validator', 'core.grant_batch', 'utils.search_index', 'utils.records')
+
+CUSTOMERS = [
+    {'customer_id': 'CUST001', 'name': 'John Doe', 'email': 'john@example.com', 'phone': '1234567890',
+     'address': '123 Main St', 'vehicle_plate': 'ABC 1234', 'vehicle_brand': 'Toyota', 'vehicle_model': 'Vios',
+     'vehicle_year': '2021', 'created_at': '2025-09-06T19:16:36', 'updated_at': ''},
+    {'customer_id': 'CUST002', 'name': 'Jane Smith', 'email': 'jane@example.com', 'phone': '0987654321',
+     'address': '456 Oak Ave', 'vehicle_plate': 'XYZ 5678', 'vehicle_brand': 'Honda', 'vehicle_model': 'Civic',
+     'vehicle_year': '2020', 'created_at': '2025-09-06T19:16:36', 'updated_at': ''},
+    {'customer_id': 'CUST003', 'name': 'Robert Johnson', 'email': 'robert@example.com', 'phone': '5551234567',
+     'address': '789 Pine Rd', 'vehicle_plate': 'DEF 9012', 'vehicle_brand': 'Toyota', 'vehicle_model': 'Camry',
+     'vehicle_year': '2022', 'created_at': '2025-09-06T19:16:36', 'updated_at': ''},
+]
+
+class TestCustomerManager(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'customer_data.csv')
+        self.db_path = os.path.join(self.temp_dir, 'customer_data.db')
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=customer_manager.CUSTOMER_FIELDS)
+            writer.writeheader()
+            writer.writerows(CUSTOMERS)
+        self.manager = customer_manager.CustomerManager(self.csv_path, self.db_path)
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_import_and_lookup(self):
+        """Test the CSV is imported once and customers come back as they were."""
+        self.assertEqual(self.manager.count(), 3)
+        self.assertEqual(self.manager.get_customer('CUST002'), CUSTOMERS[1])
+        self.assertIsNone(self.manager.get_customer('CUST999'))
+        self.assertEqual(self.manager.customers, CUSTOMERS)
+
+        # Reopening uses the database rather than importing again
+        self.manager.close()
+        self.manager = customer_manager.CustomerManager(self.csv_path, self.db_path)
+        self.assertEqual(self.manager.count(), 3)
+
+    def test_vehicle_lookups(self):
+        """Test plate and brand/model lookups ignore case like before."""
+        self.assertEqual(self.manager.get_customers_by_vehicle(plate_number='abc 1234'), [CUSTOMERS[0]])
+        self.assertEqual(self.manager.get_customers_by_vehicle(brand='TOYOTA'), [CUSTOMERS[0], CUSTOMERS[2]])
+        self.assertEqual(self.manager.get_customers_by_vehicle(brand='toyota', model='camry'), [CUSTOMERS[2]])
+        self.assertEqual(len(self.manager.get_customers_by_vehicle()), 3)
+        self.assertEqual(self.manager.count_by('vehicle_brand'), {'Toyota': 2, 'Honda': 1})
+
+    def test_add_and_update(self):
+        """Test adding and updating single customers, including fields outside the schema."""
+        new_customer = dict(CUSTOMERS[0], customer_id='CUST004', name='Aina Ali', loyalty_tier='gold')
+        del new_customer['created_at']
+        self.assertTrue(self.manager.add_customer(new_customer))
+        self.assertFalse(self.manager.add_customer(dict(CUSTOMERS[0])))
+
+        stored = self.manager.get_customer('CUST004')
+        self.assertEqual(stored['loyalty_tier'], 'gold')
+        self.assertTrue(stored['created_at'])
+
+        self.assertTrue(self.manager.update_customer('CUST004', {'phone': '0123456789'}))
+        self.assertFalse(self.manager.update_customer('CUST999', {'phone': '0123456789'}))
+        self.assertFalse(self.manager.update_customer('CUST004', {'customer_id': 'CUST001'}))
+        updated = self.manager.get_customer('CUST004')
+        self.assertEqual(updated['phone'], '0123456789')
+        self.assertEqual(updated['loyalty_tier'], 'gold')
+        self.assertTrue(updated['updated_at'])
+
+    def test_report_counters(self):
+        """Test the report counters follow adds and updates and catch drift on a recount."""
+        self.assertEqual(self.manager.count_by('vehicle_brand'), {'Toyota': 2, 'Honda': 1})
+        self.manager.add_customer(dict(CUSTOMERS[0], customer_id='CUST004', vehicle_brand='Proton'))
+        self.manager.update_customer('CUST002', {'vehicle_brand': 'Toyota', 'vehicle_year': None})
+        self.assertEqual(self.manager.count(), 4)
+        self.assertEqual(self.manager.count_by('vehicle_brand'), {'Toyota': 3, 'Proton': 1})
+        self.assertEqual(self.manager.count_by('vehicle_year'), {'2021': 2, '2022': 1, '': 1})
+        self.assertEqual(self.manager.verify_report_counters(), {})
+        
+        # A change made behind the manager's back
+        with self.manager.connection:
+            self.manager.connection.execute("DELETE FROM customers WHERE customer_id = 'CUST004'")
+        drift = self.manager.verify_report_counters(repair=True)
+        self.assertEqual(drift['total'], (4, 3))
+        self.assertEqual(drift['vehicle_brand'], {'Proton': (1, 0)})
+        self.assertEqual(self.manager.count_by('vehicle_brand'), {'Toyota': 3})
+        self.assertEqual(self.manager.verify_report_counters(), {})
+    
+    def test_search(self):
+        """Test substring search on indexed and scanned fields."""
+        self.assertEqual(self.manager.search_customers('SMITH'), [CUSTOMERS[1]])
+        self.assertEqual(self.manager.search_customers('n'), CUSTOMERS)
+        self.assertEqual(self.manager.search_customers('toy', 'vehicle_brand'), [CUSTOMERS[0], CUSTOMERS[2]])
+        self.assertEqual(len(self.manager.search_customers('example.com', 'email')), 3)
+        self.assertEqual(self.manager.search_customers('x', 'unknown_field'), [])
+        
+        # Paging
+        self.assertEqual(self.manager.search_customers('n', limit=2), CUSTOMERS[:2])
+        self.assertEqual(self.manager.search_customers('n', limit=2, offset=2), CUSTOMERS[2:])
+        self.assertEqual(self.manager.search_customers('example', 'email', limit=1, offset=1), [CUSTOMERS[1]])
+    
+    def test_search_after_changes(self):
+        """Test the search index follows added and updated customers."""
+        self.assertEqual(self.manager.search_customers('aina'), [])
+        self.manager.add_customer(dict(CUSTOMERS[0], customer_id='CUST004', name='Aina Ali'))
+        self.assertEqual([c['customer_id'] for c in self.manager.search_customers('aina')], ['CUST004'])
+        
+        self.manager.update_customer('CUST002', {'name': 'Jane Tan'})
+        self.assertEqual(self.manager.search_customers('smith'), [])
+        self.assertEqual([c['customer_id'] for c in self.manager.search_customers('tan')], ['CUST002'])
+        
+        self.manager.update_customer('CUST004', {'customer_id': 'CUST005'})
+        self.assertEqual([c['customer_id'] for c in self.manager.search_customers('aina')], ['CUST005'])
+
+GRANTS = [
+    {'grant_id': 'GRANT001', 'plate_number': 'ABC 1234', 'brand': 'Toyota', 'model': 'Vios', 'year': '2021',
+     'owner_name': 'John Doe', 'owner_id': 'CUST001', 'grant_date': '2021-05-15', 'status': 'active',
+     'added_by': 'admin', 'added_at': '2025-09-06T19:16:36', 'updated_by': '', 'updated_at': ''},
+    {'grant_id': 'GRANT002', 'plate_number': 'XYZ 5678', 'brand': 'Honda', 'model': 'Civic', 'year': '2020',
+     'owner_name': 'Jane Smith', 'owner_id': 'CUST002', 'grant_date': '2020-08-20', 'status': 'active',
+     'added_by': 'admin', 'added_at': '2025-09-06T19:16:36', 'updated_by': '', 'updated_at': ''},
+]
+
+class TestGrantValidator(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.car_path = os.path.join(self.temp_dir, 'car_dataset.csv')
+        self.grants_path = os.path.join(self.temp_dir, 'vehicle_grants.csv')
+        with open(self.car_path, 'w', encoding='utf-8', newline='') as file:
+            file.write("brand,model,year_start,year_end\nToyota,Vios,2003,2025\nHonda,Civic,1972,2025\n")
+        with open(self.grants_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=grant_validator.GRANT_FIELDS)
+            writer.writeheader()
+            writer.writerows(GRANTS)
+        self.validator = grant_validator.GrantValidator(self.car_path, self.grants_path)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def new_grant(self, **fields):
+        grant = {'grant_id': 'GRANT003', 'plate_number': 'WXY 9999', 'brand': 'Honda', 'model': 'Civic',
+                 'year': '2022', 'owner_name': 'Aina Ali', 'owner_id': 'CUST004', 'grant_date': '2022-01-10'}
+        grant.update(fields)
+        return grant
+    
+    def test_lookups(self):
+        """Test grant ID and plate lookups, with plates compared ignoring case and spaces."""
+        self.assertEqual(self.validator.get_grant('GRANT002'), GRANTS[1])
+        self.assertIsNone(self.validator.get_grant('GRANT999'))
+        self.assertEqual(self.validator.find_duplicate_plate('abc1234'), GRANTS[0])
+        self.assertIsNone(self.validator.find_duplicate_plate('ABC 1234', 'GRANT001'))
+        self.assertIsNone(self.validator.find_duplicate_plate('ABC 12345'))
+        
+        result = self.validator.validate_grant(self.new_grant(plate_number='xyz5678'))
+        self.assertTrue(result['is_valid'])
+        self.assertIn('A grant with plate number xyz5678 already exists', result['warnings'])
+    
+    def test_catalog_not_watched_by_default(self):
+        """Test only a validator asked to watch the catalog starts the watcher thread."""
+        provider = self.validator.catalog_provider
+        self.assertFalse(provider.watching)
+        try:
+            grant_validator.GrantValidator(self.car_path, self.grants_path, watch_catalog=True)
+            self.assertTrue(provider.watching)
+        finally:
+            provider.stop()
+    
+    def test_search_index_built_on_first_search(self):
+        """Test the trigram index is only built by a search and then kept up to date."""
+        self.assertIsNone(self.validator.search_index)
+        self.validator.add_grant(self.new_grant(), 'EMP001')
+        self.assertIsNone(self.validator.search_index)
+        self.assertEqual(self.validator.search_grants('wxy', 'plate_number'), [self.validator.get_grant('GRANT003')])
+        self.assertEqual(len(self.validator.search_index), 3)
+        
+        self.validator.update_grant('GRANT003', {'owner_name': 'Siti Noor'}, 'EMP002')
+        self.assertEqual(self.validator.search_grants('siti', 'owner_name'), [self.validator.get_grant('GRANT003')])
+        self.assertEqual(self.validator.search_grants('aina', 'owner_name'), [])
+    
+    def test_worker_validator_saves_no_counters(self):
+        """Test a batch worker's validator counts grants without writing the counters file."""
+        os.remove(self.validator.counters_path)
+        grant_batch._init_worker(self.car_path, self.grants_path)
+        self.assertEqual(grant_batch._worker_validator.report_counters.total, 2)
+        self.assertFalse(os.path.exists(self.validator.counters_path))
+        
+        self.validator.append_grants([self.new_grant()], 'EMP009')
+        self.assertTrue(os.path.exists(self.validator.counters_path))
+    
+    def test_add_grant(self):
+        """Test an added grant is indexed and written in the file's column order."""
+        success, _ = self.validator.add_grant(self.new_grant(), 'EMP001')
+        self.assertTrue(success)
+        self.assertEqual(self.validator.get_grant('GRANT003')['added_by'], 'EMP001')
+        self.assertIsNotNone(self.validator.find_duplicate_plate('WXY 9999'))
+        self.assertEqual(self.validator.search_grants('aina', 'owner_name'), [self.validator.get_grant('GRANT003')])
+        
+        reloaded = grant_validator.GrantValidator(self.car_path, self.grants_path)
+        self.assertEqual(reloaded.grant_data, self.validator.grant_data)
+    
+    def test_update_grant(self):
+        """Test an update moves the grant to its new plate in the indexes and the file."""
+        success, _ = self.validator.update_grant('GRANT001', {'plate_number': 'DEF 1111'}, 'EMP001')
+        self.assertTrue(success)
+        self.assertIsNone(self.validator.find_duplicate_plate('ABC 1234'))
+        self.assertEqual(self.validator.find_duplicate_plate('DEF1111')['grant_id'], 'GRANT001')
+        self.assertEqual(self.validator.search_grants('abc', 'plate_number'), [])
+        
+        success, _ = self.validator.update_grant('GRANT999', {'plate_number': 'DEF 2222'}, 'EMP001')
+        self.assertFalse(success)
+        
+        reloaded = grant_validator.GrantValidator(self.car_path, self.grants_path)
+        self.assertEqual(reloaded.get_grant('GRANT001')['plate_number'], 'DEF 1111')
+        self.assertEqual(reloaded.get_grant('GRANT001')['updated_by'], 'EMP001')
+
+    def test_reload_if_changed(self):
+        """Test only outside changes to the grants file trigger a reload."""
+        self.assertFalse(self.validator.reload_if_changed())
+        self.validator.add_grant(self.new_grant(), 'EMP001')
+        self.assertFalse(self.validator.reload_if_changed())
+        
+        other = grant_validator.GrantValidator(self.car_path, self.grants_path)
+        other.add_grant(self.new_grant(grant_id='GRANT004', plate_number='JKL 4321'), 'EMP002')
+        self.assertTrue(self.validator.reload_if_changed())
+        self.assertEqual(self.validator.get_grant('GRANT004')['added_by'], 'EMP002')
+        self.assertEqual(self.validator.find_duplicate_plate('jkl4321')['grant_id'], 'GRANT004')
+
+    def test_report_counters(self):
+        """Test grant report counters follow changes, persist with the grants and catch drift."""
+        counters = self.validator.report_counters
+        self.assertEqual(counters.counts('brand'), {'Toyota': 1, 'Honda': 1})
+        self.validator.add_grant(self.new_grant(), 'EMP001')
+        self.validator.update_grant('GRANT001', {'brand': 'Honda', 'model': 'City'}, 'EMP002')
+        
+        counters = self.validator.report_counters
+        self.assertEqual(counters.total, 3)
+        self.assertEqual(counters.counts('brand'), {'Honda': 3})
+        self.assertEqual(counters.counts('model'), {('Honda', 'City'): 1, ('Honda', 'Civic'): 2})
+        self.assertEqual(counters.counts('status'), {'active': 3})
+        added_today = (self.validator.get_grant('GRANT003')['added_at'][:10], 'EMP001')
+        self.assertEqual(counters.counts('added_by_day')[added_today], 1)
+        self.assertEqual(self.validator.verify_report_counters(), {})
+        
+        # Saved counters are used while they match the grants file
+        with open(self.validator.counters_path, encoding='utf-8') as file:
+            state = json.load(file)
+        state['total'] = 99
+        with open(self.validator.counters_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        reloaded = grant_validator.GrantValidator(self.car_path, self.grants_path)
+        self.assertEqual(reloaded.report_counters.counts('model'), counters.counts('model'))
+        self.assertEqual(reloaded.report_counters.total, 99)
+        self.assertEqual(reloaded.verify_report_counters(repair=True), {'total': (99, 3)})
+        self.assertEqual(reloaded.verify_report_counters(), {})
+        
+        # and rebuilt once the file changes elsewhere
+        with open(self.grants_path, 'a', encoding='utf-8', newline='') as file:
+            file.write('GRANT009,JKL 9,Perodua,Myvi,2019,Siti,CUST009,2019-03-03,active,admin,,,\n')
+        self.assertTrue(self.validator.reload_if_changed())
+        self.assertEqual(self.validator.report_counters.counts('brand'), {'Honda': 3, 'Perodua': 1})
+    
+    def test_grant_batch(self):
+        """Test a batch writes one result per row and imports the valid grants together."""
+        batch_path = os.path.join(self.temp_dir, 'batch.csv')
+        output_path = os.path.join(self.temp_dir, 'batch.results.ndjson')
+        rows = [self.new_grant(grant_id='B1', plate_number='JKL 1'),
+                self.new_grant(grant_id='B2', plate_number='not a plate'),
+                self.new_grant(grant_id='B3', plate_number='jkl1'),
+                self.new_grant(grant_id='B4', plate_number='XYZ 5678')]
+        with open(batch_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+        
+        summary = grant_batch.run_grant_batch(batch_path, output_path, 'EMP009', validator=self.validator,
+                                              workers=1, chunk_size=2)
+        self.assertEqual(summary, {'total': 4, 'valid': 3, 'invalid': 1, 'imported': 3})
+        
+        with open(output_path, encoding='utf-8') as file:
+            results = [json.loads(line) for line in file]
+        self.assertEqual([r['grant_id'] for r in results], ['B1', 'B2', 'B3', 'B4'])
+        self.assertEqual(results[1]['result']['errors'], ['Invalid plate number format'])
+        self.assertEqual(results[0]['result']['warnings'], [])
+        self.assertIn('A grant with plate number jkl1 already exists', results[2]['result']['warnings'])
+        self.assertIn('A grant with plate number XYZ 5678 already exists', results[3]['result']['warnings'])
+        
+        self.assertEqual(self.validator.get_grant('B3')['added_by'], 'EMP009')
+        self.assertIsNone(self.validator.get_grant('B2'))
+        reloaded = grant_validator.GrantValidator(self.car_path, self.grants_path)
+        self.assertEqual(reloaded.grant_data, self.validator.grant_data)
+        self.assertFalse(self.validator.reload_if_changed())
+    
+    def test_grant_batch_ndjson(self):
+        """Test NDJSON input and validating without importing."""
+        batch_path = os.path.join(self.temp_dir, 'batch.ndjson')
+        output_path = os.path.join(self.temp_dir, 'batch.results.ndjson')
+        with open(batch_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(self.new_grant()) + '\n\n' + json.dumps(self.new_grant(year='19x')) + '\n')
+        
+        summary = grant_batch.run_grant_batch(batch_path, output_path, 'EMP009', validator=self.validator,
+                                              workers=1, chunk_size=10, import_valid=False)
+        self.assertEqual(summary, {'total': 2, 'valid': 1, 'invalid': 1, 'imported': 0})
+        self.assertEqual(len(self.validator.grant_data), 2)
+    
+    def test_grant_batch_ndjson_numbers(self):
+        """Test NDJSON numbers are validated and imported as the strings a CSV row would hold."""
+        batch_path = os.path.join(self.temp_dir, 'batch.ndjson')
+        output_path = os.path.join(self.temp_dir, 'batch.results.ndjson')
+        with open(batch_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(self.new_grant(owner_id=1234567, year=2022)) + '\n')
+        
+        summary = grant_batch.run_grant_batch(batch_path, output_path, 'EMP009', validator=self.validator,
+                                              workers=1, chunk_size=10)
+        self.assertEqual(summary, {'total': 1, 'valid': 1, 'invalid': 0, 'imported': 1})
+        self.assertEqual(self.validator.get_grant('GRANT003')['owner_id'], '1234567')
+        self.assertEqual(self.validator.get_grant('GRANT003')['year'], '2022')
+    
+    def test_grant_batch_missing_fields(self):
+        """Test NDJSON nulls and fields missing from a short CSV row are reported invalid."""
+        output_path = os.path.join(self.temp_dir, 'batch.results.ndjson')
+        ndjson_path = os.path.join(self.temp_dir, 'batch.ndjson')
+        with open(ndjson_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(self.new_grant(plate_number=None, brand=None)) + '\n')
+        csv_path = os.path.join(self.temp_dir, 'batch.csv')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as file:
+            file.write('grant_id,plate_number,brand,model,year,owner_name,owner_id,grant_date\n')
+            file.write('GRANT004\n')
+        
+        for batch_path in (ndjson_path, csv_path):
+            summary = grant_batch.run_grant_batch(batch_path, output_path, 'EMP009', validator=self.validator,
+                                                  workers=1, chunk_size=10)
+            self.assertEqual(summary, {'total': 1, 'valid': 0, 'invalid': 1, 'imported': 0})
+            with open(output_path, encoding='utf-8') as file:
+                self.assertIn('Invalid plate number format', json.loads(file.readline())['result']['errors'])
+
+class TestRecord(unittest.TestCase):
+    
+    def test_dict_compatible(self):
+        """Test a record reads, writes and compares like the row dict it replaces."""
+        row = dict(GRANTS[0], remarks='urgent')
+        grant = grant_validator.GrantRecord(row)
+        self.assertEqual(grant, row)
+        self.assertEqual(row, grant)
+        self.assertEqual(list(grant), list(row))
+        self.assertEqual(len(grant), len(row))
+        self.assertEqual(grant['brand'], 'Toyota')
+        self.assertEqual(grant.get('remarks'), 'urgent')
+        self.assertEqual(grant.get('missing', 'x'), 'x')
+        self.assertIn('status', grant)
+        
+        copy = grant.copy()
+        copy.update({'status': 'revoked'}, notes='checked')
+        self.assertEqual(copy['status'], 'revoked')
+        self.assertEqual(grant['status'], 'active')
+        self.assertEqual(dict(copy), dict(row, status='revoked', notes='checked'))
+    
+    def test_missing_fields(self):
+        """Test fields that were never set behave like absent keys."""
+        grant = grant_validator.GrantRecord(grant_id='G1', plate_number='ABC 1')
+        self.assertEqual(dict(grant), {'grant_id': 'G1', 'plate_number': 'ABC 1'})
+        self.assertNotIn('brand', grant)
+        self.assertIsNone(grant.get('brand'))
+        with self.assertRaises(KeyError):
+            grant['brand']
+        del grant['plate_number']
+        self.assertEqual(list(grant), ['grant_id'])
+        with self.assertRaises(KeyError):
+            del grant['plate_number']
+    
+    def test_interning(self):
+        """Test low-cardinality values share one string object."""
+        first = grant_validator.GrantRecord(brand=''.join(['Toy', 'ota']), owner_name=''.join(['Al', 'i']))
+        second = grant_validator.GrantRecord(brand=''.join(['To', 'yota']), owner_name=''.join(['A', 'li']))
+        self.assertIs(first['brand'], second['brand'])
+        self.assertIsNot(first['owner_name'], second['owner_name'])
+
+class TestTrigramIndex(unittest.TestCase):
+    
+    def setUp(self):
+        self.index = search_index.TrigramIndex(['name', 'plate'])
+        self.index.add(1, {'name': 'Ahmad Bin Ali', 'plate': 'WXY 1234'})
+        self.index.add(2, {'name': 'Siti Aminah', 'plate': 'ABC 123'})
+        self.index.add(3, {'name': 'Alice', 'plate': None})
+    
+    def test_search(self):
+        """Test matches agree with a plain substring test, in insertion order."""
+        for term in ['ali', 'AMI', 'a', '', 'bin ali', 'xyz', 'ali ', '123']:
+            for field in ['name', 'plate']:
+                expected = [key for key, record in [(1, ['ahmad bin ali', 'wxy 1234']),
+                                                    (2, ['siti aminah', 'abc 123']), (3, ['alice', ''])]
+                            if term.lower() in record[0 if field == 'name' else 1]]
+                self.assertEqual(self.index.search(field, term), expected, (field, term))
+        self.assertEqual(self.index.search('name', 'a', limit=2, offset=1), [2, 3])
+    
+    def test_update_and_remove(self):
+        """Test updates replace the indexed values and keep the record's position."""
+        self.index.add(1, {'name': 'Tan Ah Kow', 'plate': 'WXY 1234'})
+        self.assertEqual(self.index.search('name', 'ali'), [3])
+        self.assertEqual(self.index.search('name', 'a'), [1, 2, 3])
+        
+        self.index.remove(2)
+        self.index.remove(99)
+        self.assertNotIn(2, self.index)
+        self.assertEqual(self.index.search('plate', '123'), [1])
+        self.assertEqual(len(self.index), 2)
+
+if __name__ == "__main__":
+    unittest.main()
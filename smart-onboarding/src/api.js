@@ -1,7 +1,20 @@
-// Mock API for now - will be replaced with real backend later
-const baseUrl = '/api'; // Will be replaced with backend URL
+// Mock API by default; set VITE_USE_MOCK_API=false to call the validation service
+// (customer_tool: python main.py --mode serve) at VITE_API_BASE_URL instead
 import { VEHICLES } from './mockData';
 
+const useMockApi = import.meta.env.VITE_USE_MOCK_API !== 'false';
+const baseUrl = import.meta.env.VITE_API_BASE_URL || '/api';
+
+async function request(path, body) {
+  const res = await fetch(`${baseUrl}${path}`, body === undefined ? {} : {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body)
+  });
+  if (!res.ok) throw new Error(`Request to ${path} failed with status ${res.status}`);
+  return res.json();
+}
+
 /**
  * Mock: Verify plate format and check if it exists
  * Returns:
@@ -10,6 +23,8 @@ import { VEHICLES } from './mockData';
  *  - { status: 'error', message }
  */
 export async function verifyPlate(plate) {
+  if (!useMockApi) return request('/verify-plate', { plate });
+  
   // Simulate API delay
   await new Promise(resolve => setTimeout(resolve, 500));
   
@@ -37,6 +52,8 @@ export async function verifyPlate(plate) {
  *  - { ok: false, message, corrected?, errors? }
  */
 export async function validateCar(car) {
+  if (!useMockApi) return request('/validate-car', car);
+  
   // Simulate API delay
   await new Promise(resolve => setTimeout(resolve, 300));
   
@@ -94,6 +111,7 @@ export async function submitOnboarding(payload) {
  * Mock: Get available car brands
  */
 export async function getBrands() {
+  if (!useMockApi) return request('/brands');
   await new Promise(resolve => setTimeout(resolve, 200));
   return ['Perodua', 'Proton', 'Toyota', 'Honda', 'Nissan', 'Mazda', 'Hyundai', 'Kia'];
 }
@@ -102,6 +120,7 @@ export async function getBrands() {
  * Mock: Get models for a specific brand
  */
 export async function getModels(brand) {
+  if (!useMockApi) return request(`/models?brand=${encodeURIComponent(brand)}`);
   await new Promise(resolve => setTimeout(resolve, 200));
   
   const modelMap = {
@@ -122,6 +141,7 @@ export async function getModels(brand) {
  * Mock: Health check
  */
 export async function healthCheck() {
+  if (!useMockApi) return request('/health');
   return { status: 'healthy', mode: 'mock' };
 }
 
@@ -129,6 +149,7 @@ export async function healthCheck() {
  * Mock: confirm ownership by last 4 NRIC digits using VEHICLES dataset
  */
 export async function confirmOwnership(plateRaw, last4){
+  if (!useMockApi) return request('/confirm-ownership', { plate: plateRaw, last4 });
   await new Promise(resolve => setTimeout(resolve, 300));
   const plate = String(plateRaw || '').toUpperCase().replace(/\s+/g, '');
   const hit = VEHICLES.find(v => v.plate === plate);